@@ -0,0 +1,48 @@
+"""
+Compares sequential `NotCertifiedKibana.get_field_possible_values` calls with the concurrent
+fan-out of `AsyncNotCertifiedKibana.get_field_possible_values_many` against a local stub server.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_async_kibana
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmark.cc_bench_utils.stopwatch import time_ms
+from benchmark.perf.stub_kibana import StubKibanaServer, make_field
+from kibapi import AsyncNotCertifiedKibana, NotCertifiedKibana
+
+
+def run_sync(url: str, fields: list[dict[str, object]]) -> float:
+    with NotCertifiedKibana(base_url=url) as kibana:
+        _, elapsed = time_ms(lambda: [kibana.get_field_possible_values("default", "logs*", field) for field in fields])
+    return elapsed
+
+
+async def run_async(url: str, fields: list[dict[str, object]], max_concurrency: int) -> float:
+    async with AsyncNotCertifiedKibana(base_url=url, max_concurrency=max_concurrency) as kibana:
+        start = time.perf_counter()
+        await kibana.get_field_possible_values_many("default", "logs*", fields)
+        return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs async Kibana suggestions benchmark")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stub server latency per request")
+    parser.add_argument("--max-concurrency", type=int, default=20, help="Async client concurrency limit")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Number of fields")
+    args = parser.parse_args()
+
+    with StubKibanaServer(latency_ms=args.latency_ms) as server:
+        print(f"{'fields':>8} {'sync ms':>10} {'async ms':>10} {'speedup':>8}")
+        for size in args.sizes:
+            fields: list[dict[str, object]] = [make_field(f"field_{i}") for i in range(size)]
+            sync_ms = run_sync(server.url, fields)
+            async_ms = asyncio.run(run_async(server.url, fields, args.max_concurrency))
+            print(f"{size:>8} {sync_ms:>10.1f} {async_ms:>10.1f} {sync_ms / async_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
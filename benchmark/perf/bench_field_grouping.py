@@ -0,0 +1,88 @@
+"""
+Compares the recursive field values grouping (`recursive_field_group` + `clean_empty_nodes`
++ `flatten_dict`) with the single-pass `FieldValueTrie`, on synthetic pod names.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_field_grouping
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from kibfieldvalues import group_field_values
+from kibfieldvalues.fields import clean_empty_nodes, flatten_dict, recursive_field_group
+
+
+def make_pod_names(count: int, seed: int = 0) -> set[str]:
+    """Build distinct Kubernetes-like pod names: `<team>-<service>-<component>-<hash>-<suffix>`."""
+
+    rng = random.Random(seed)
+    teams = [f"team{i}" for i in range(40)]
+    services = ["api", "worker", "cron", "gateway", "consumer", "db"]
+    components = ["eu", "us", "ap", "canary"]
+
+    names: set[str] = set()
+    while len(names) < count:
+        parts = [rng.choice(teams), rng.choice(services)]
+        if rng.random() < 0.5:
+            parts.append(rng.choice(components))
+        parts.append(f"{rng.getrandbits(32):08x}")
+        parts.append(f"{rng.getrandbits(20):05x}")
+        names.add("-".join(parts))
+    return names
+
+
+def make_deep_names(count: int, levels: int = 8, fanout: int = 3, seed: int = 0) -> set[str]:
+    """Build distinct names with `levels` shared components of `fanout` choices each, then a unique hash."""
+
+    rng = random.Random(seed)
+    names: set[str] = set()
+    while len(names) < count:
+        parts = [f"c{level}{rng.randrange(fanout)}" for level in range(levels)]
+        parts.append(f"{rng.getrandbits(32):08x}")
+        names.add("-".join(parts))
+    return names
+
+
+def recursive_grouping(values: set[str]) -> list[str]:
+    tree: Any = clean_empty_nodes(recursive_field_group(values))
+    return flatten_dict(tree)
+
+
+def measure(label: str, func: Callable[[set[str]], list[str]], values: set[str], with_memory: bool) -> list[str]:
+    # Time and memory are measured in separate runs, tracemalloc slows allocations down a lot
+    start = time.perf_counter()
+    result = func(values)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    memory = ""
+    if with_memory:
+        tracemalloc.start()
+        func(values)
+        memory = f"{tracemalloc.get_traced_memory()[1] / 2**20:>10.1f} MiB peak"
+        tracemalloc.stop()
+
+    print(f"{label:<24} {elapsed_ms:>10.1f} ms {memory}  ({len(result)} groups)")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Field values grouping benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--no-memory", action="store_true", help="Skip the (slow) peak memory runs")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        for dataset, make_names in (("pod names", make_pod_names), ("deep names", make_deep_names)):
+            values = make_names(size)
+            print(f"{size} {dataset}")
+            expected = measure("recursive", recursive_grouping, values, not args.no_memory)
+            result = measure("trie", group_field_values, values, not args.no_memory)
+            assert result == expected, "The trie grouping differs from the recursive one"
+
+
+if __name__ == "__main__":
+    main()
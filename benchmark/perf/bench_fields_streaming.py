@@ -0,0 +1,90 @@
+"""
+Measures peak memory and parse time of a synthetic `/internal/data_views/fields` payload,
+comparing a full `json.loads` with the incremental parser of `kibapi.streaming`.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_fields_streaming
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+from benchmark.perf.stub_kibana import make_field
+from kibapi import FieldCatalog
+from kibapi.streaming import iter_fields
+
+CHUNK_SIZE = 1 << 16
+
+
+def make_payload(num_fields: int) -> bytes:
+    """Build a fields response shaped like the ones of wide ECS-style data views."""
+
+    fields: list[dict[str, Any]] = []
+    for i in range(num_fields):
+        name = f"ecs.group_{i % 97}.field_{i}"
+        fields.append(
+            {
+                **make_field(name),
+                "count": 0,
+                "scripted": False,
+                "isMapped": True,
+                "shortDotsEnable": False,
+                "metadata_field": False,
+                "format": {"id": "string", "params": {"pattern": "0,0.[000]"}},
+                "customLabel": f"Field number {i} of the synthetic data view",
+            }
+        )
+        fields.append(
+            {
+                "name": f"{name}.keyword",
+                "type": "string",
+                "esTypes": ["keyword"],
+                "searchable": True,
+                "aggregatable": True,
+                "readFromDocValues": True,
+                "subType": {"multi": {"parent": name}},
+                "count": 0,
+                "scripted": False,
+                "isMapped": True,
+            }
+        )
+    return json.dumps({"fields": fields[:num_fields], "indices": ["logs-1"]}).encode("utf-8")
+
+
+def measure(label: str, func: Callable[[], Any]) -> None:
+    # Time and memory are measured in separate runs, tracemalloc slows allocations down a lot
+    start = time.perf_counter()
+    result = func()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed_ms:>10.1f} ms {peak / 2**20:>10.1f} MiB peak  ({len(result)} fields)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming fields list parse benchmark")
+    parser.add_argument("--fields", type=int, default=50000, help="Number of fields in the payload")
+    args = parser.parse_args()
+
+    payload = make_payload(args.fields)
+    print(f"Payload: {len(payload) / 2**20:.1f} MiB, {args.fields} fields")
+
+    def chunks() -> Iterator[bytes]:
+        # Like `Response.iter_content`, only one chunk is alive at a time
+        return (payload[i : i + CHUNK_SIZE] for i in range(0, len(payload), CHUNK_SIZE))
+
+    measure("json.loads", lambda: json.loads(payload)["fields"])
+    measure("json.loads + FieldCatalog", lambda: FieldCatalog.from_fields(json.loads(payload)["fields"]))
+    measure("streaming trimmed dicts", lambda: list(iter_fields(chunks())))
+    measure("streaming FieldCatalog", lambda: FieldCatalog.from_fields(iter_fields(chunks())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Compares the wall-clock time of the sequential composite scan of `get_initial_part_of_fields`
+with the concurrent partitioned scan, for increasing field cardinalities, against an in-process
+Elasticsearch stand-in with a fixed per-search latency.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_partitioned_scan
+"""
+
+import argparse
+from typing import Any, cast
+
+from elasticsearch import Elasticsearch
+
+from benchmark.cc_bench_utils.stopwatch import time_ms
+from benchmark.perf.bench_field_grouping import make_pod_names
+from benchmark.perf.stub_elastic import StubElasticsearch
+from kibfieldvalues import get_initial_part_of_fields
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partitioned field values scan benchmark")
+    parser.add_argument("--cardinalities", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--page-size", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per search")
+    args = parser.parse_args()
+
+    print(f"{'values':>10} {'mode':<16} {'searches':>9} {'wall clock':>12}")
+    for cardinality in args.cardinalities:
+        stub = StubElasticsearch(sorted(make_pod_names(cardinality)), latency=args.latency)
+        client = cast(Elasticsearch, stub)
+
+        expected: Any = None
+        for concurrency in [1, *args.concurrency]:
+            stub.searches = 0
+            result, elapsed_ms = time_ms(
+                get_initial_part_of_fields,
+                client,
+                "kubernetes.pod.name",
+                "logs*",
+                concurrency=concurrency,
+                page_size=args.page_size,
+            )
+            expected = result if expected is None else expected
+            assert result == expected, "The partitioned scan differs from the sequential one"
+
+            mode = "sequential" if concurrency == 1 else f"{concurrency} workers"
+            print(f"{cardinality:>10} {mode:<16} {stub.searches:>9} {elapsed_ms:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares collecting every field value before grouping them with the streaming pages of
+`iter_field_value_pages` consumed by a `FieldValueTrie`, and shows the adaptive page size
+against a stand-in cluster whose response time grows with the page size.
+
+The streamed trie is faster (the single-pass grouping), but it does not lower the peak memory:
+it holds every distinct value like the collected set, plus its nodes, so its peak is slightly
+higher. Streaming only bounds the memory of the responses, one page alive at a time.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_streaming_pages
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, cast
+
+from elasticsearch import Elasticsearch
+
+from benchmark.perf.bench_field_grouping import make_pod_names
+from benchmark.perf.stub_elastic import StubElasticsearch
+from kibfieldvalues import FieldValueTrie, iter_field_value_pages
+from kibfieldvalues.fields import clean_empty_nodes, flatten_dict, recursive_field_group
+
+
+def collect_then_group(client: Elasticsearch) -> list[str]:
+    """The previous approach: every value in a set, then the recursive grouping."""
+
+    values: set[str] = set()
+    for page in iter_field_value_pages(client, "pod.keyword", "logs*", target_page_time=None):
+        values.update(page)
+    tree: Any = clean_empty_nodes(recursive_field_group(values))
+    return sorted(flatten_dict(tree))
+
+
+def stream_into_trie(client: Elasticsearch) -> list[str]:
+    trie = FieldValueTrie()
+    for page in iter_field_value_pages(client, "pod.keyword", "logs*", target_page_time=None):
+        trie.update(page)
+    return sorted(trie.flatten())
+
+
+def measure(label: str, func: Callable[[Elasticsearch], list[str]], client: Elasticsearch) -> list[str]:
+    """Times a run, then traces the peak memory of another one, tracemalloc slowing it down."""
+
+    start = time.perf_counter()
+    result = func(client)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    func(client)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<24} {elapsed_ms:>10.1f} ms {peak / 2**20:>10.1f} MiB peak  ({len(result)} groups)")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming field value pages benchmark")
+    parser.add_argument("--values", type=int, default=300_000)
+    parser.add_argument("--target", type=float, default=0.2, help="Target seconds per page")
+    args = parser.parse_args()
+
+    stub = StubElasticsearch(sorted(make_pod_names(args.values)), latency=0.0, per_bucket=0.0)
+    client = cast(Elasticsearch, stub)
+    print(f"{args.values} values")
+    expected = measure("collect then group", collect_then_group, client)
+    assert measure("streaming trie", stream_into_trie, client) == expected
+
+    # 20ms per search plus 10us per bucket: the page size converges to about 18000 buckets
+    stub.latency, stub.per_bucket = 0.02, 1e-5
+    sizes: list[int] = []
+    for page in iter_field_value_pages(client, "pod.keyword", "logs*", target_page_time=args.target):
+        sizes.append(len(page))
+    print(f"Adaptive page sizes for a {args.target}s target: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
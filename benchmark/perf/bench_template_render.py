@@ -0,0 +1,82 @@
+"""
+Measures the renders per second of the Kibana URL templates, comparing the previous renderer,
+which read and compiled the template file on every call, with the cached process-wide environment.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_template_render
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Callable
+from unittest import mock
+
+from jinja2 import Template
+
+from kibtemplate import FilterOperators, KibCatFilter, build_template, generic_template_renderer
+from kibtemplate.builders import FILTER_IS_TEMPLATE_NAME, TEMPLATES_FILE_PATH
+
+
+def uncached_renderer(templates_path: str, template_name: str, logger: Any = None, **kwargs: Any) -> str:
+    """The renderer before the cached environment: read, compile and render on every call."""
+
+    del logger
+
+    with open(os.path.join(templates_path, template_name), encoding="utf-8") as file:
+        return Template(file.read()).render(**kwargs)
+
+
+def renders_per_second(render: Callable[[], Any], duration: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        render()
+        count += 1
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Template rendering benchmark")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds spent on every measurement")
+    parser.add_argument("--filters", type=int, default=5, help="Number of filters of the built URL")
+    args = parser.parse_args()
+
+    filter_args: dict[str, Any] = {
+        "field_name": "log.level",
+        "data_view_id": "logs*",
+        "negate": False,
+        "expected_value": "ERROR",
+    }
+    filters = [KibCatFilter(f"field{i}", FilterOperators.IS, f"value{i}") for i in range(args.filters)]
+
+    def build_url() -> Any:
+        return build_template(
+            base_url="https://kibana.example.com/app/discover",
+            start_time="2025-05-09T18:02:40.258Z",
+            end_time="2025-05-10T02:05:46.064Z",
+            visible_fields=["message", "log.level"],
+            filters=filters,
+            data_view_id="logs*",
+            search_query="",
+        )
+
+    uncached = renders_per_second(
+        lambda: uncached_renderer(TEMPLATES_FILE_PATH, FILTER_IS_TEMPLATE_NAME, **filter_args), args.duration
+    )
+    cached = renders_per_second(
+        lambda: generic_template_renderer(TEMPLATES_FILE_PATH, FILTER_IS_TEMPLATE_NAME, **filter_args), args.duration
+    )
+    print(f"{'filter template':<24} {uncached:>10.0f} -> {cached:>10.0f} renders/s ({cached / uncached:.1f}x)")
+
+    with mock.patch("kibtemplate.builders.generic_template_renderer", uncached_renderer):
+        uncached_urls = renders_per_second(build_url, args.duration)
+    urls = renders_per_second(build_url, args.duration)
+    print(
+        f"{f'build_template, {args.filters} filters':<24} {uncached_urls:>10.0f} -> {urls:>10.0f} URLs/s "
+        f"({urls / uncached_urls:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
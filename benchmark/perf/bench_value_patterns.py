@@ -0,0 +1,55 @@
+"""
+Measures the pattern normalization of field values: throughput, and how much shorter the
+compact representation is than the raw values list put in the prompts.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_value_patterns
+"""
+
+import argparse
+import json
+import random
+import time
+
+from kibfieldvalues import normalize_values
+
+# Characters of the Kubernetes generated name suffixes
+K8S_ALPHABET = "bcdfghjklmnpqrstvwxz2456789"
+
+
+def make_k8s_pod_names(count: int, deployments: int = 200, seed: int = 0) -> set[str]:
+    """Build distinct Kubernetes pod names: `<deployment>-<replica set hash>-<pod suffix>`."""
+
+    rng = random.Random(seed)
+    names = [f"team{i % 40}-{rng.choice(['api', 'worker', 'cron', 'gateway'])}-{i}" for i in range(deployments)]
+    hashes = {name: ["".join(rng.choices(K8S_ALPHABET, k=10)) for _ in range(3)] for name in names}
+
+    pods: set[str] = set()
+    while len(pods) < count:
+        name = rng.choice(names)
+        pods.add(f"{name}-{rng.choice(hashes[name])}-{''.join(rng.choices(K8S_ALPHABET, k=5))}")
+    return pods
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Field values pattern normalization benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        values = sorted(make_k8s_pod_names(size))
+
+        start = time.perf_counter()
+        patterns = normalize_values(values)
+        elapsed = time.perf_counter() - start
+
+        raw_chars = len(json.dumps(values))
+        compact_chars = len(json.dumps(patterns.compact()))
+        print(
+            f"{size:>8} values {elapsed * 1000:>9.1f} ms ({size / elapsed:>10.0f} values/s) "
+            f"{len(patterns.templates):>6} templates, prompt {raw_chars} -> {compact_chars} chars"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures the memory held by discovered value sets, comparing a `set[str]`, a sorted `list[str]`
+and the packed `ValueStore`, and the lookup and prefix iteration speed of the store.
+
+Run from the repository root with:
+    PYTHONPATH=src python -m benchmark.perf.bench_value_store
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmark.perf.bench_value_patterns import make_k8s_pod_names
+from kibfieldvalues import ValueStore
+
+
+def retained(build: Callable[[list[bytes]], Any], encoded: list[bytes]) -> tuple[Any, int]:
+    """Returns the object built from the encoded values and the memory it keeps allocated, in bytes."""
+
+    tracemalloc.start()
+    result = build(encoded)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Packed value store benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        # Values arrive from Elasticsearch as new strings, built inside the measurement
+        names = sorted(make_k8s_pod_names(size))
+        encoded = [name.encode("utf-8") for name in names]
+        del names
+
+        _, set_bytes = retained(lambda values: {value.decode("utf-8") for value in values}, encoded)
+        _, list_bytes = retained(lambda values: [value.decode("utf-8") for value in values], encoded)
+        store, store_bytes = retained(lambda values: ValueStore(value.decode("utf-8") for value in values), encoded)
+
+        probes = [value.decode("utf-8") for value in encoded[:: max(1, size // 10_000)]]
+        start = time.perf_counter()
+        found = sum(probe in store for probe in probes)
+        lookup_us = (time.perf_counter() - start) / len(probes) * 1e6
+
+        prefix = probes[len(probes) // 2].rsplit("-", 2)[0]
+        start = time.perf_counter()
+        matches = sum(1 for _ in store.with_prefix(prefix))
+        prefix_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"{size:>8} values  set {set_bytes / 2**20:>7.1f} MiB  list {list_bytes / 2**20:>7.1f} MiB  "
+            f"store {store_bytes / 2**20:>7.1f} MiB  lookup {lookup_us:>5.1f} us ({found} found)  "
+            f"prefix {prefix!r} {prefix_ms:.2f} ms ({matches} values)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""In-process stand-in for the Elasticsearch client, answering the field values aggregations."""
+
+import bisect
+import threading
+import time
+import zlib
+from typing import Any
+
+
+class StubElasticsearch:
+    """
+    Answers `composite`, partitioned `terms` and `cardinality` aggregations on a single keyword field
+    from an in-memory list of values, sleeping `latency + per_bucket * buckets` seconds per search
+    like a remote cluster would.
+    """
+
+    def __init__(self, values: list[str], latency: float = 0.02, per_bucket: float = 1e-6) -> None:
+        self.values = sorted(set(values))
+        self.latency = latency
+        self.per_bucket = per_bucket
+        self.searches = 0
+        self._lock = threading.Lock()
+        self._hashes = [zlib.crc32(value.encode()) for value in self.values]
+        self._partitions: dict[int, list[list[str]]] = {}
+
+    def partition(self, partition: int, partitions: int) -> list[str]:
+        """Returns the values of a partition, hashing every value only once."""
+
+        with self._lock:
+            if partitions not in self._partitions:
+                split: list[list[str]] = [[] for _ in range(partitions)]
+                for value, value_hash in zip(self.values, self._hashes):
+                    split[value_hash % partitions].append(value)
+                self._partitions[partitions] = split
+            return self._partitions[partitions][partition]
+
+    def search(self, index: str, body: dict[str, Any], **_: Any) -> dict[str, Any]:  # pylint: disable=unused-argument
+        """Run one of the supported aggregations."""
+
+        with self._lock:
+            self.searches += 1
+
+        name, aggregation = next(iter(body["aggs"].items()))
+        result: dict[str, Any]
+
+        if "cardinality" in aggregation:
+            result = {"value": len(self.values)}
+        elif "composite" in aggregation:
+            composite = aggregation["composite"]
+            after = composite.get("after", {}).get("single_result")
+            start = bisect.bisect_right(self.values, after) if after is not None else 0
+            page = self.values[start : start + composite["size"]]
+            # Fresh strings, like the ones decoded from a real response
+            result = {
+                "buckets": [{"key": {"single_result": value.encode().decode()}, "doc_count": 1} for value in page]
+            }
+            if page:
+                result["after_key"] = {"single_result": page[-1]}
+        else:
+            terms = aggregation["terms"]
+            partition, partitions = terms["include"]["partition"], terms["include"]["num_partitions"]
+            matching = self.partition(partition, partitions)
+            result = {
+                "buckets": [{"key": value.encode().decode(), "doc_count": 1} for value in matching[: terms["size"]]],
+                "sum_other_doc_count": max(0, len(matching) - terms["size"]),
+            }
+
+        time.sleep(self.latency + self.per_bucket * len(result.get("buckets", ())))
+        return {"aggregations": {name: result}}
@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+def make_field(name: str, field_type: str = "string") -> dict[str, Any]:
+    """Returns a field definition shaped like the ones of `/internal/data_views/fields`."""
+    return {
+        "name": name,
+        "type": field_type,
+        "esTypes": ["text" if field_type == "string" else field_type],
+        "searchable": True,
+        "aggregatable": field_type != "string",
+        "readFromDocValues": field_type != "string",
+    }
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # Large listen backlog so bursts of concurrent connections are not delayed by SYN retries
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StubKibanaServer:
+    """
+    Local threaded HTTP server imitating the Kibana endpoints used by `kibapi`,
+    with a fixed artificial latency per request.
+    """
+
+    def __init__(self, latency_ms: float = 50, fields: list[dict[str, Any]] | None = None) -> None:
+        self.latency_ms = latency_ms
+        self.fields = fields or []
+        self.requests_count = 0
+        self._server = _StubHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "StubKibanaServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self, payload: Any, status: int = 200) -> None:
+                stub.requests_count += 1
+                time.sleep(stub.latency_ms / 1000)
+
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                if self.path.startswith("/api/spaces/space"):
+                    self._reply([{"id": "default", "name": "Default"}])
+                elif self.path.startswith("/api/data_views"):
+                    self._reply({"data_view": [{"id": "logs*", "title": "logs*"}]})
+                elif "/internal/data_views/fields" in self.path:
+                    self._reply({"fields": stub.fields})
+                else:
+                    self._reply({"error": "not found"}, status=404)
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if "/internal/kibana/suggestions/values/" in self.path:
+                    self._reply([f"{body.get('field')}-value-{i}" for i in range(10)])
+                else:
+                    self._reply({"error": "not found"}, status=404)
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                return
+
+        return Handler
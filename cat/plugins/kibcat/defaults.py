@@ -1,2 +1,5 @@
 DEFAULT_START_TIME = "P10DT0H0M"  # Default to 10 days
 DEFAULT_END_TIME = "PT0S"  # Default to now
+
+DEFAULT_DISCOVERY_LOOKBACK = "P7D"  # Field values are discovered on the last 7 days by default
+DEFAULT_DISCOVERY_WINDOW_BUCKET = "PT1H"  # Discovery windows are aligned on hours
@@ -13,12 +13,19 @@ from elasticsearch import Elasticsearch
 from langchain_core.exceptions import OutputParserException
 from pydantic import BaseModel
 
-from kibapi import NotCertifiedKibana
-from kibtemplate import FilterOperators, KibCatFilter, build_template
+from kibapi import CircuitBreaker, FieldCatalog, MetadataCache, NotCertifiedKibana
+from kibcache import WarmCache
+from kibfieldvalues import DEFAULT_TIME_FIELD
+from kibtemplate import FilterOperators, KibCatFilter, build_template, set_bytecode_cache_dir
 from kibtypes import ParsedKibanaURL
 from kiburl import build_rison_url_from_json
 
-from .defaults import DEFAULT_END_TIME, DEFAULT_START_TIME
+from .defaults import (
+    DEFAULT_DISCOVERY_LOOKBACK,
+    DEFAULT_DISCOVERY_WINDOW_BUCKET,
+    DEFAULT_END_TIME,
+    DEFAULT_START_TIME,
+)
 from .prompts.builders import (
     build_agent_prefix,
     build_form_check_exit_intent,
@@ -29,14 +36,21 @@ from .prompts.builders import (
     build_refine_filter_json,
 )
 from .utils import (
+    DiscoveryWindow,
     KibCatLogger,
-    automated_field_value_extraction,
     check_env_vars,
+    data_view_time_field,
+    describe_main_fields,
+    discovery_window,
     format_T_in_date,
     format_time_kibana,
-    generate_field_to_group,
     get_main_fields_dict,
+    load_field_values_many,
+    load_fields_catalog,
+    parse_duration,
+    refresh_in_background,
     verify_data_views_space_id,
+    warm_cache_is_stale,
 )
 
 # Environment Variables
@@ -49,9 +63,169 @@ SPACE_ID = os.getenv("KIBANA_SPACE_ID")
 DATA_VIEW_ID = os.getenv("KIBANA_DATA_VIEW_ID")
 
 FIELDS_JSON_PATH = os.getenv("FIELDS_JSON_PATH")
+WARM_CACHE_PATH = os.getenv("WARM_CACHE_PATH")
+
+# Field values are discovered on this ISO 8601 duration before now, all-time if empty
+DISCOVERY_LOOKBACK = os.getenv("DISCOVERY_LOOKBACK", DEFAULT_DISCOVERY_LOOKBACK)
+DISCOVERY_WINDOW_BUCKET = os.getenv("DISCOVERY_WINDOW_BUCKET", DEFAULT_DISCOVERY_WINDOW_BUCKET)
+
+# Compiled templates bytecode, so a restart does not compile the prompts and URL templates again
+TEMPLATE_BYTECODE_CACHE_PATH = os.getenv("TEMPLATE_BYTECODE_CACHE_PATH")
+if TEMPLATE_BYTECODE_CACHE_PATH:
+    set_bytecode_cache_dir(TEMPLATE_BYTECODE_CACHE_PATH)
 
 MAIN_FIELDS_DICT: dict[str, Any] | None = None
 
+# Shared between form instances so the pooled Kibana connections are kept alive
+# and the spaces, data views and fields list are not fetched again for every form
+KIBANA_CLIENT: NotCertifiedKibana | None = None
+KIBANA_METADATA_CACHE: MetadataCache = MetadataCache(logger=KibCatLogger)
+
+# The suggestions endpoint has a heavy latency tail, slow requests are duplicated after its p95
+SUGGESTIONS_ENDPOINT = "/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
+ELASTIC_CLIENT: Elasticsearch | None = None
+
+# Persistent fields list and main fields values, so a restart serves warm data immediately
+WARM_CACHE: WarmCache | None = None
+
+# Time field (timeFieldName) of the data view, "" if it has none, fetched on first use
+DATA_VIEW_TIME_FIELD: str | None = None
+
+
+def get_kibana_client() -> NotCertifiedKibana:
+    """Returns the process-wide Kibana client, creating it on first use."""
+
+    global KIBANA_CLIENT
+    if KIBANA_CLIENT is None:
+        assert URL is not None
+        assert USERNAME is not None
+        assert PASSWORD is not None
+        KIBANA_CLIENT = NotCertifiedKibana(
+            base_url=URL,
+            username=USERNAME,
+            password=PASSWORD,
+            logger=KibCatLogger,
+            cache=KIBANA_METADATA_CACHE,
+            circuit_breaker=CircuitBreaker(),
+            hedged_endpoints=[SUGGESTIONS_ENDPOINT],
+        )
+    return KIBANA_CLIENT
+
+
+def get_elastic_client() -> Elasticsearch:
+    """Returns the process-wide Elasticsearch client, creating it on first use."""
+
+    global ELASTIC_CLIENT
+    if ELASTIC_CLIENT is None:
+        assert ELASTIC_URL is not None
+        assert USERNAME is not None
+        assert PASSWORD is not None
+        node_config: NodeConfig = NodeConfig(
+            scheme="https",
+            host=ELASTIC_URL.split("://")[-1].split(":")[0],
+            port=443,
+            verify_certs=False,
+            ssl_show_warn=False,
+        )
+        ELASTIC_CLIENT = Elasticsearch(
+            [node_config],
+            basic_auth=(USERNAME, PASSWORD),
+        )
+    return ELASTIC_CLIENT
+
+
+def get_warm_cache() -> WarmCache | None:
+    """Returns the process-wide warm cache, None if WARM_CACHE_PATH is not set.
+    Entries are dropped when the main fields configuration or the data view change"""
+
+    global WARM_CACHE
+    if WARM_CACHE is None and WARM_CACHE_PATH:
+        main_fields: dict[str, Any] = get_main_fields_dict(fields_json_path=FIELDS_JSON_PATH, logger=KibCatLogger)
+        WARM_CACHE = WarmCache(
+            path=WARM_CACHE_PATH,
+            fingerprint=WarmCache.make_fingerprint(main_fields, SPACE_ID, DATA_VIEW_ID),
+            logger=KibCatLogger,
+        )
+    return WARM_CACHE
+
+
+def get_time_field() -> str:
+    """Returns the time field of the data view, "" if it has none.
+    @timestamp is assumed, without being remembered, while the data view can't be fetched"""
+
+    global DATA_VIEW_TIME_FIELD
+    if DATA_VIEW_TIME_FIELD is None:
+        assert SPACE_ID is not None
+        assert DATA_VIEW_ID is not None
+        time_field: str | None = data_view_time_field(get_kibana_client(), SPACE_ID, DATA_VIEW_ID, logger=KibCatLogger)
+        if time_field is None:
+            return DEFAULT_TIME_FIELD
+        DATA_VIEW_TIME_FIELD = time_field
+    return DATA_VIEW_TIME_FIELD
+
+
+def time_window(start_time: str, end_time: str) -> DiscoveryWindow | None:
+    """Returns the quantized window field values are discovered on, None (all-time)
+    if the data view has no time field to restrict the documents with"""
+
+    if not get_time_field():
+        return None
+    return discovery_window(start_time, end_time, DISCOVERY_WINDOW_BUCKET)
+
+
+def default_discovery_window() -> DiscoveryWindow | None:
+    """Returns the window field values are discovered on when no time range is requested.
+    It is labelled with the lookback, so its warm cache entries are refreshed in place
+    instead of piling up on every bucket"""
+
+    window: DiscoveryWindow | None = time_window(DISCOVERY_LOOKBACK, "PT0S")
+    return window._replace(label=DISCOVERY_LOOKBACK) if window else None
+
+
+def refresh_warm_cache() -> None:
+    """Fetch the fields list and the main fields values again and store them in the warm cache"""
+
+    warm_cache: WarmCache | None = get_warm_cache()
+    if warm_cache is None:
+        return
+
+    # Requested time ranges move to a new window on every bucket, older windows are never served again
+    warm_cache.prune(
+        WarmCache.VALUES,
+        max_age=parse_duration(DISCOVERY_WINDOW_BUCKET).total_seconds(),
+        keep_windows=("", DISCOVERY_LOOKBACK),
+    )
+
+    assert SPACE_ID is not None
+    assert DATA_VIEW_ID is not None
+    kibana: NotCertifiedKibana = get_kibana_client()
+
+    fields_catalog: FieldCatalog | None = load_fields_catalog(
+        kibana=kibana,
+        space_id=SPACE_ID,
+        data_view_id=DATA_VIEW_ID,
+        warm_cache=warm_cache,
+        refresh=True,
+        logger=KibCatLogger,
+    )
+    if not fields_catalog:
+        return
+
+    main_fields: dict[str, Any] = get_main_fields_dict(fields_json_path=FIELDS_JSON_PATH, logger=KibCatLogger)
+    load_field_values_many(
+        element_fields=[fields_catalog.group_of(key) for key in main_fields],
+        data_view_id=DATA_VIEW_ID,
+        space_id=SPACE_ID,
+        fields_catalog=fields_catalog,
+        kibana=kibana,
+        elastic=get_elastic_client(),
+        warm_cache=warm_cache,
+        refresh=True,
+        logger=KibCatLogger,
+        window=default_discovery_window(),
+        time_field=get_time_field() or DEFAULT_TIME_FIELD,
+    )
+
 
 ######################## Hooks #######################
 
@@ -68,6 +242,10 @@ def after_cat_bootstrap(cat):
         data_view_id=DATA_VIEW_ID,
     )
 
+    # Warm the persistent cache without delaying the bootstrap
+    if get_warm_cache() is not None:
+        refresh_in_background(refresh_warm_cache, logger=KibCatLogger)
+
 
 @hook
 def agent_prompt_prefix(prefix, cat):
@@ -100,83 +278,67 @@ class FilterForm(CatForm):  # type: ignore
 
     _kibana: NotCertifiedKibana
     _elastic: Elasticsearch
+    _warm_cache: WarmCache | None
 
     def __init__(self, cat):
-        # Initialize the NotCertifiedKibana instance with the provided credentials
-        assert URL is not None
+        # Reuse the shared NotCertifiedKibana instance with the provided credentials
         assert USERNAME is not None
         assert PASSWORD is not None
-        self._kibana = NotCertifiedKibana(base_url=URL, username=USERNAME, password=PASSWORD, logger=KibCatLogger)
-
-        # Initialize Elastic instance
-        assert ELASTIC_URL is not None
-        node_config: NodeConfig = NodeConfig(
-            scheme="https",
-            host=ELASTIC_URL.split("://")[-1].split(":")[0],
-            port=443,
-            verify_certs=False,
-            ssl_show_warn=False,
-        )
-
-        self._elastic: Elasticsearch = Elasticsearch(
-            [node_config],
-            basic_auth=(USERNAME, PASSWORD),
-        )
+        self._kibana = get_kibana_client()
 
-        self._fields_list: list[dict[str, Any]] = []
+        # Reuse the shared Elastic instance
+        self._elastic = get_elastic_client()
+        self._warm_cache = get_warm_cache()
 
-        # Get all the fields using the Kibana API
+        # Get all the fields using the Kibana API (or the warm cache), as an indexed catalog
         # Type is ignored because env variables are already checked using the check_env_vars function
         assert SPACE_ID is not None
         assert DATA_VIEW_ID is not None
-        optional_fields_list: list[dict[str, Any]] | None = self._kibana.get_fields_list(
-            space_id=SPACE_ID, data_view_id=DATA_VIEW_ID
-        )
-
-        if not optional_fields_list:
-            self._fields_list = []
-        else:
-            self._fields_list = optional_fields_list
+        self._fields_catalog: FieldCatalog = load_fields_catalog(
+            kibana=self._kibana,
+            space_id=SPACE_ID,
+            data_view_id=DATA_VIEW_ID,
+            warm_cache=self._warm_cache,
+            logger=KibCatLogger,
+        ) or FieldCatalog([])
 
         verify_result: str | None = verify_data_views_space_id(
             kibana=self._kibana,
             space_id=SPACE_ID,
             data_view_id=DATA_VIEW_ID,
-            fields_list=self._fields_list,
+            fields_catalog=self._fields_catalog,
             logger=KibCatLogger,
         )
         if verify_result:
             return verify_result
 
-        # Associate a group to every field in this dict
-        field_to_group: dict[str, Any] = generate_field_to_group(self._fields_list)
-
         global MAIN_FIELDS_DICT
         MAIN_FIELDS_DICT = get_main_fields_dict(fields_json_path=FIELDS_JSON_PATH, logger=KibCatLogger)
 
-        new_main_fields: dict[str, Any] = {}
-
-        # Replace the key names with the possible keys in the input
-        for key, element in MAIN_FIELDS_DICT.items():
-            description: str = element
-
-            element_field_group = field_to_group.get(key, [key])
-            possible_vals: dict[str, Any] = automated_field_value_extraction(
-                element_field=element_field_group,
-                data_view_id=DATA_VIEW_ID,
-                space_id=SPACE_ID,
-                fields_list=self._fields_list,
-                kibana=self._kibana,
-                elastic=self._elastic,
-                logger=KibCatLogger,
-            )
+        # Replace the key names with the possible keys in the input, fetching every field at once
+        main_field_keys: list[str] = list(MAIN_FIELDS_DICT.keys())
+        main_element_fields: list[list[str]] = [self._fields_catalog.group_of(key) for key in main_field_keys]
+        main_window: DiscoveryWindow | None = default_discovery_window()
+        main_possible_vals: list[dict[str, Any]] = load_field_values_many(
+            element_fields=main_element_fields,
+            data_view_id=DATA_VIEW_ID,
+            space_id=SPACE_ID,
+            fields_catalog=self._fields_catalog,
+            kibana=self._kibana,
+            elastic=self._elastic,
+            warm_cache=self._warm_cache,
+            logger=KibCatLogger,
+            window=main_window,
+            time_field=get_time_field() or DEFAULT_TIME_FIELD,
+        )
 
-            new_main_fields[key] = {
-                "description": description,
-                "possible_values": possible_vals,
-            }
+        # Served data may be stale, refresh it for the next forms once it is old enough
+        if self._warm_cache is not None and warm_cache_is_stale(
+            self._warm_cache, self._kibana.base_url, SPACE_ID, DATA_VIEW_ID, main_element_fields, main_window
+        ):
+            refresh_in_background(refresh_warm_cache, logger=KibCatLogger)
 
-        MAIN_FIELDS_DICT = new_main_fields
+        MAIN_FIELDS_DICT = describe_main_fields(MAIN_FIELDS_DICT, main_possible_vals, self._fields_catalog)
 
         super().__init__(cat)
 
@@ -295,7 +457,7 @@ class FilterForm(CatForm):  # type: ignore
             kibana=self._kibana,
             space_id=cast(str, SPACE_ID),
             data_view_id=cast(str, DATA_VIEW_ID),
-            fields_list=self._fields_list,
+            fields_catalog=self._fields_catalog,
             logger=KibCatLogger,
         )
         if verify_result:
@@ -304,22 +466,27 @@ class FilterForm(CatForm):  # type: ignore
         # Extract the filters and create a shallow copy of the list
         filters = list([filter_element.model_dump() for filter_element in self._model.get("filters", [])])
 
-        # Associate a group to every field in this dict
-        field_to_group: dict[str, Any] = generate_field_to_group(self._fields_list)
-
-        # Replace the key names with the possible keys in the input
-        for element in filters:
-            key: str = element["field"]
-            element_field_group = field_to_group.get(key, [key])
-            element["field"] = automated_field_value_extraction(
-                element_field=element_field_group,
-                data_view_id=cast(str, DATA_VIEW_ID),
-                space_id=cast(str, SPACE_ID),
-                fields_list=self._fields_list,
-                kibana=self._kibana,
-                elastic=self._elastic,
-                logger=KibCatLogger,
-            )
+        # Only look for values in the requested time range, aligned so nearby ranges share the cache
+        window: DiscoveryWindow | None = time_window(
+            self._model.get("start_time", DEFAULT_START_TIME),
+            self._model.get("end_time", DEFAULT_END_TIME),
+        )
+
+        # Replace the key names with the possible keys in the input, fetching every field at once
+        filters_possible_vals: list[dict[str, Any]] = load_field_values_many(
+            element_fields=[self._fields_catalog.group_of(element["field"]) for element in filters],
+            data_view_id=cast(str, DATA_VIEW_ID),
+            space_id=cast(str, SPACE_ID),
+            fields_catalog=self._fields_catalog,
+            kibana=self._kibana,
+            elastic=self._elastic,
+            warm_cache=self._warm_cache,
+            logger=KibCatLogger,
+            window=window,
+            time_field=get_time_field() or DEFAULT_TIME_FIELD,
+        )
+        for element, possible_vals in zip(filters, filters_possible_vals):
+            element["field"] = possible_vals
 
         operators_str: str = json.dumps([op.name.lower() for op in FilterOperators], indent=2)
         filter_data: str = build_refine_filter_json(
@@ -368,9 +535,7 @@ class FilterForm(CatForm):  # type: ignore
         form_data_kql = self._model.get("query", "")
 
         requested_keys: set[str] = {element.field for element in form_data_filters}
-        fields_to_visualize: list[str] = [
-            field["name"] for field in self._fields_list if field["name"] in requested_keys
-        ]
+        fields_to_visualize: list[str] = [name for name in self._fields_catalog.names if name in requested_keys]
 
         # Add to the visualize
         for key, _ in cast(dict[str, Any], MAIN_FIELDS_DICT).items():
@@ -1,9 +1,18 @@
 from .check_env_vars import check_env_vars
+from .discovery_window import DiscoveryWindow, discovery_window, parse_duration, quantize_window
 from .format_t_in_date import format_T_in_date
 from .format_time_kibana import format_time_kibana
-from .generate_field_values import automated_field_value_extraction, generate_field_to_group, verify_data_views_space_id
+from .generate_field_values import (
+    automated_field_value_extraction,
+    automated_field_value_extraction_many,
+    data_view_time_field,
+    describe_main_fields,
+    generate_field_to_group,
+    verify_data_views_space_id,
+)
 from .get_main_fields_dict import get_main_fields_dict
 from .kib_cat_logger import KibCatLogger
+from .warm_start import load_field_values_many, load_fields_catalog, refresh_in_background, warm_cache_is_stale
 
 __all__ = [
     "KibCatLogger",
@@ -12,7 +21,18 @@ __all__ = [
     "format_T_in_date",
     "check_env_vars",
     "automated_field_value_extraction",
+    "automated_field_value_extraction_many",
+    "data_view_time_field",
+    "describe_main_fields",
     "generate_field_values",
     "generate_field_to_group",
     "verify_data_views_space_id",
+    "load_fields_catalog",
+    "load_field_values_many",
+    "refresh_in_background",
+    "warm_cache_is_stale",
+    "DiscoveryWindow",
+    "discovery_window",
+    "parse_duration",
+    "quantize_window",
 ]
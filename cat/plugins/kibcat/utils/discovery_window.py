@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+import isodate
+
+from .format_t_in_date import format_T_in_date
+from .format_time_kibana import format_time_kibana
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class DiscoveryWindow(NamedTuple):
+    """
+    Time range field values are discovered on, aligned on bucket boundaries so nearby
+    ranges share the same warm cache entries.
+
+    Attributes:
+        start_date (str): ISO 8601 lower bound of the data view time field.
+        end_date (str): ISO 8601 upper bound of the data view time field.
+        label (str): Warm cache window of a range kept up to date in place, e.g. the lookback "P7D".
+            Empty to key the entries by the bounds.
+    """
+
+    start_date: str
+    end_date: str
+    label: str = ""
+
+    @property
+    def key(self) -> str:
+        """The warm cache window of the range, its label or e.g.
+        "2025-06-01T00:00:00.000Z/2025-06-10T00:00:00.000Z"."""
+        return self.label or f"{self.start_date}/{self.end_date}"
+
+
+def parse_duration(duration: str) -> timedelta:
+    """Returns an ISO 8601 duration, e.g. "P7D" or "PT1H", as a timedelta"""
+    parsed = isodate.parse_duration(format_T_in_date(duration))
+    return parsed if isinstance(parsed, timedelta) else parsed.totimedelta(end=datetime.now(timezone.utc))
+
+
+def quantize_window(start: datetime, end: datetime, bucket: timedelta) -> DiscoveryWindow:
+    """Returns the smallest window made of whole buckets containing [start, end]"""
+
+    size = bucket.total_seconds()
+    start_buckets = (start - EPOCH).total_seconds() // size
+    end_buckets = -(-(end - EPOCH).total_seconds() // size)
+
+    return DiscoveryWindow(
+        start_date=format_time_kibana(EPOCH + timedelta(seconds=start_buckets * size)),
+        end_date=format_time_kibana(EPOCH + timedelta(seconds=end_buckets * size)),
+    )
+
+
+def discovery_window(
+    start_time: str, end_time: str, bucket: str, now: datetime | None = None
+) -> DiscoveryWindow | None:
+    """Returns the quantized window between two ISO 8601 durations before now,
+    e.g. ("P10D", "PT0S") for the last 10 days. None if start_time is empty (no time bound)"""
+
+    if not start_time:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    start: datetime = now - parse_duration(start_time)
+    end: datetime = now - parse_duration(end_time)
+
+    return quantize_window(min(start, end), max(start, end), parse_duration(bucket))
@@ -2,55 +2,146 @@ from typing import Any, Type, cast
 
 from elasticsearch import Elasticsearch
 
-from kibapi import NotCertifiedKibana, get_field_properties, group_fields
-from kibfieldvalues import get_initial_part_of_fields
+from kibapi import FieldCatalog, NotCertifiedKibana, get_field_properties, group_fields
+from kibcache import WarmCache, WarmCacheKey
+from kibfieldvalues import (
+    DEFAULT_TIME_FIELD,
+    SUMMARIZED_TYPES,
+    FieldSummary,
+    FieldValuesDiscovery,
+    compact_field_values,
+    discover_field_values,
+    discover_field_values_many,
+    get_initial_part_of_fields_incremental,
+    summarize_fields,
+)
 from kiblog import BaseLogger
 
+from .discovery_window import DiscoveryWindow
+
+
+def split_field_group(element_field: list[str]) -> tuple[str | None, str | None]:
+    """Returns the (normal field, keyword field) pair of a field group, None where missing"""
+
+    normal_field: str | None = None
+    keyword_field: str | None = None
+
+    for field in element_field:
+        if field.endswith(".keyword"):
+            keyword_field = field
+            continue
+        normal_field = field
+
+    return normal_field, keyword_field
+
+
+def summarized_field_type(fields_catalog: FieldCatalog, field_name: str) -> str | None:
+    """Returns the type of a numeric, date or IP aggregatable field, described as a range instead of
+    being enumerated, None for the other fields"""
+
+    record = fields_catalog.get(field_name)
+    if record and record.aggregatable and record.type in SUMMARIZED_TYPES:
+        return record.type
+    return None
+
+
+def data_view_time_field(
+    kibana: NotCertifiedKibana, space_id: str, data_view_id: str, logger: Type[BaseLogger] | None = None
+) -> str | None:
+    """Returns the time field (timeFieldName) of the data view, "" if it has none,
+    None if the data view can't be fetched"""
+
+    data_view: dict[str, Any] | None = kibana.get_data_view(data_view_id, space_id=space_id)
+    if data_view is None:
+        return None
+
+    time_field: str = data_view.get("timeFieldName") or ""
+    if logger:
+        logger.message(f"Data view {data_view_id} time field: {time_field or 'none'}")
+    return time_field
+
+
+def log_discovery(keyword_field: str, discovery: FieldValuesDiscovery, logger: Type[BaseLogger] | None) -> None:
+    """Logs the cardinality estimate and the strategy used to discover the values of a keyword field"""
+
+    if logger:
+        logger.message(
+            f"Field {keyword_field} has about {discovery.estimate} values, "
+            f"read with the {discovery.strategy.value} strategy" + ("" if discovery.complete else " (partial)")
+        )
+
 
 def automated_field_value_extraction(
     element_field: list[str],
     data_view_id: str,
     space_id: str,
-    fields_list: list[dict[str, Any]],
+    fields_catalog: FieldCatalog,
     kibana: NotCertifiedKibana,
     elastic: Elasticsearch,
     logger: Type[BaseLogger] | None = None,
+    warm_cache: WarmCache | None = None,
+    window: DiscoveryWindow | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
 ) -> dict[str, Any]:
-    """Returns element.field, given an element.field pre-processed"""
+    """Returns element.field, given an element.field pre-processed, with the values found in the window
+    of time_field (all-time if None). Without a window, keyword values are discovered incrementally from
+    the last scanned time_field value when a warm cache is available. Numeric, date and IP fields are
+    described as ranges"""
 
-    key_fields: list[str] = element_field
     new_key: dict[str, Any] = {}
+    start_date, end_date = (window.start_date, window.end_date) if window else (None, None)
 
-    normal_field: str | None = None
-    keyword_field: str | None = None
-
-    for field in key_fields:
-        if field.endswith(".keyword"):
-            keyword_field = field
-            continue
-        normal_field = field
+    normal_field, keyword_field = split_field_group(element_field)
 
     if keyword_field:
         if logger:
             msg: str = f"Getting field {keyword_field} possible values using Elastic"
             logger.message(msg)
 
-        keyword_field_values: list[str] = get_initial_part_of_fields(elastic, keyword_field, data_view_id)
+        keyword_field_values: list[str]
+        if warm_cache and window is None:
+            keyword_field_values = get_initial_part_of_fields_incremental(
+                elastic,
+                keyword_field,
+                data_view_id,
+                warm_cache,
+                key=WarmCacheKey(kibana.base_url, space_id, data_view_id, keyword_field),
+                logger=logger,
+                time_field=time_field,
+            )
+        else:
+            discovery: FieldValuesDiscovery = discover_field_values(
+                elastic, keyword_field, data_view_id, start_date, end_date, time_field=time_field
+            )
+            log_discovery(keyword_field, discovery, logger)
+            keyword_field_values = discovery.values
 
         new_key[keyword_field] = keyword_field_values
+    elif normal_field and (field_type := summarized_field_type(fields_catalog, normal_field)):
+        if logger:
+            summary_msg: str = f"Summarizing {field_type} field {normal_field} using Elastic"
+            logger.message(summary_msg)
+
+        summary: FieldSummary = summarize_fields(
+            elastic, {normal_field: field_type}, data_view_id, start_date, end_date, time_field=time_field
+        )[normal_field]
+        new_key[normal_field] = [summary.describe()]
     else:
         if normal_field:
             if logger:
                 log_msg: str = f"Getting field {normal_field} possible values using Kibana"
                 logger.message(log_msg)
 
-            field_properties: dict[str, Any] = get_field_properties(fields_list, normal_field)
+            field_properties: dict[str, Any] = get_field_properties(fields_catalog, normal_field)
 
             # Get all the field's possible values
             possible_values: list[Any] = kibana.get_field_possible_values(
                 space_id,
                 data_view_id,
                 field_properties,
+                start_date,
+                end_date,
+                time_field,
             )
 
             new_key[normal_field] = possible_values
@@ -58,7 +149,122 @@ def automated_field_value_extraction(
     return new_key
 
 
-def generate_field_to_group(fields_list: list[dict[str, Any]]) -> dict[str, Any]:
+def automated_field_value_extraction_many(
+    element_fields: list[list[str]],
+    data_view_id: str,
+    space_id: str,
+    fields_catalog: FieldCatalog,
+    kibana: NotCertifiedKibana,
+    elastic: Elasticsearch,
+    logger: Type[BaseLogger] | None = None,
+    max_workers: int = 8,
+    warm_cache: WarmCache | None = None,
+    window: DiscoveryWindow | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+    failed: set[int] | None = None,
+) -> list[dict[str, Any]]:
+    """Batched automated_field_value_extraction, the Kibana suggestions of every
+    non keyword field are requested in parallel, numeric, date and IP fields are summarized in one
+    Elastic search and, unless discovered incrementally, the values
+    of every keyword field are discovered together with shared Elastic searches.
+    Results keep the order of element_fields. Field groups whose Kibana suggestions failed get no
+    values, and their indexes are added to failed if given"""
+
+    start_date, end_date = (window.start_date, window.end_date) if window else (None, None)
+
+    results: list[dict[str, Any]] = [{} for _ in element_fields]
+    kibana_fields: dict[int, str] = {}
+    elastic_fields: dict[int, str] = {}
+    summarized_fields: dict[int, str] = {}
+    field_types: dict[str, str] = {}
+
+    for index, element_field in enumerate(element_fields):
+        normal_field, keyword_field = split_field_group(element_field)
+
+        if keyword_field and (not warm_cache or window):
+            elastic_fields[index] = keyword_field
+        elif keyword_field:
+            results[index] = automated_field_value_extraction(
+                element_field=[keyword_field],
+                data_view_id=data_view_id,
+                space_id=space_id,
+                fields_catalog=fields_catalog,
+                kibana=kibana,
+                elastic=elastic,
+                logger=logger,
+                warm_cache=warm_cache,
+                time_field=time_field,
+            )
+        elif normal_field and (field_type := summarized_field_type(fields_catalog, normal_field)):
+            summarized_fields[index] = normal_field
+            field_types[normal_field] = field_type
+        elif normal_field:
+            kibana_fields[index] = normal_field
+
+    if elastic_fields:
+        if logger:
+            logger.message(f"Getting fields {list(elastic_fields.values())} possible values using Elastic")
+
+        discoveries: dict[str, FieldValuesDiscovery] = discover_field_values_many(
+            elastic, list(elastic_fields.values()), data_view_id, start_date, end_date, time_field=time_field
+        )
+        for index, name in elastic_fields.items():
+            log_discovery(name, discoveries[name], logger)
+            results[index] = {name: discoveries[name].values}
+
+    if summarized_fields:
+        if logger:
+            logger.message(f"Summarizing fields {list(field_types)} using Elastic")
+
+        summaries: dict[str, FieldSummary] = summarize_fields(
+            elastic, field_types, data_view_id, start_date, end_date, time_field=time_field
+        )
+        for index, name in summarized_fields.items():
+            results[index] = {name: [summaries[name].describe()]}
+
+    if not kibana_fields:
+        return results
+
+    if logger:
+        logger.message(f"Getting fields {list(kibana_fields.values())} possible values using Kibana")
+
+    field_dicts: list[dict[str, Any]] = [get_field_properties(fields_catalog, name) for name in kibana_fields.values()]
+    batch: dict[str, list[Any] | Exception] = kibana.get_field_possible_values_many(
+        space_id, data_view_id, field_dicts, start_date, end_date, max_workers=max_workers, time_field=time_field
+    )
+
+    # Failed fields are already logged by the batch call, they just get no values
+    for index, name in kibana_fields.items():
+        values: list[Any] | Exception = batch.get(name, [])
+        if isinstance(values, Exception):
+            values = []
+            if failed is not None:
+                failed.add(index)
+        results[index] = {name: values}
+
+    return results
+
+
+def describe_main_fields(
+    descriptions: dict[str, str], possible_values: list[dict[str, Any]], fields_catalog: FieldCatalog
+) -> dict[str, Any]:
+    """Returns the main fields dict given to the prompts, the description and the compacted
+    possible values of every main field, in the order of the descriptions. The numeric, date and IP
+    fields of the catalog hold a summary, kept as is"""
+
+    return {
+        key: {
+            "description": description,
+            # Only a hint for the data extractor, the filters are checked against the raw values
+            "possible_values": compact_field_values(
+                values, summarized=[name for name in values if summarized_field_type(fields_catalog, name)]
+            ),
+        }
+        for (key, description), values in zip(descriptions.items(), possible_values)
+    }
+
+
+def generate_field_to_group(fields_list: list[dict[str, Any]] | FieldCatalog) -> dict[str, Any]:
     """Automatically generate the field-to-group dict"""
 
     # Group them with keywords if there are
@@ -74,27 +280,21 @@ def verify_data_views_space_id(
     kibana: NotCertifiedKibana,
     space_id: str,
     data_view_id: str,
-    fields_list: list[Any],
+    fields_catalog: FieldCatalog | None,
     logger: Type[BaseLogger] | None = None,
 ) -> str | None:
     """If an error occurs reurn the error string, else None"""
 
-    # Get the list of spaces in Kibana
-    spaces: list[dict[str, Any]] | None = kibana.get_spaces()
-
     # Check if the needed space exists, otherwise return the error
-    if (not spaces) or (not any(space["id"] == space_id for space in spaces)):
+    if not kibana.space_exists(space_id):
         msg = "Specified space ID not found"
 
         if logger:
             logger.error(msg)
         return msg
 
-    # Get the dataviews from the Kibana API
-    data_views: list[dict[str, Any]] | None = kibana.get_dataviews()
-
     # Check if the dataview needed exists, otherwise return the error
-    if (not data_views) or (not any(view["id"] == data_view_id for view in data_views)):
+    if not kibana.data_view_exists(data_view_id, space_id=space_id):
         error_msg: str = "Specified data view not found"
 
         if logger:
@@ -102,7 +302,7 @@ def verify_data_views_space_id(
         return error_msg
 
     # if the field list cant be loaded, return the error
-    if not fields_list:
+    if not fields_catalog:
         msg = "Not found fields_list"
 
         if logger:
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Any, Callable, Type
+
+from elasticsearch import Elasticsearch
+
+from kibapi import FieldCatalog, NotCertifiedKibana
+from kibcache import WarmCache, WarmCacheKey
+from kibfieldvalues import DEFAULT_TIME_FIELD
+from kiblog import BaseLogger
+
+from .discovery_window import DiscoveryWindow
+from .generate_field_values import automated_field_value_extraction_many
+
+# Minimum number of seconds between two background refreshes of the warm cache
+WARM_REFRESH_INTERVAL = 600
+
+# Entries older than this many seconds are refreshed in the background
+WARM_MAX_AGE = 600
+
+_refresh_lock = threading.Lock()
+_last_refresh: float = 0.0
+
+
+def load_fields_catalog(
+    kibana: NotCertifiedKibana,
+    space_id: str,
+    data_view_id: str,
+    warm_cache: WarmCache | None,
+    refresh: bool = False,
+    logger: Type[BaseLogger] | None = None,
+) -> FieldCatalog | None:
+    """Returns the fields catalog, from the warm cache when available unless refresh is True.
+    Freshly fetched catalogs are written back to the warm cache"""
+
+    key = WarmCacheKey(kibana.base_url, space_id, data_view_id)
+
+    if warm_cache and not refresh:
+        fields: list[dict[str, Any]] | None = warm_cache.get(WarmCache.FIELDS, key)
+        if fields:
+            if logger:
+                logger.message(f"Serving {len(fields)} fields from the warm cache")
+            return FieldCatalog.from_fields(fields)
+
+    catalog: FieldCatalog | None = kibana.get_fields_catalog(space_id=space_id, data_view_id=data_view_id)
+    if catalog and warm_cache:
+        warm_cache.set(WarmCache.FIELDS, key, [record.to_dict() for record in catalog])
+
+    return catalog
+
+
+def field_values_keys(
+    kibana_url: str,
+    space_id: str,
+    data_view_id: str,
+    element_fields: list[list[str]],
+    window: DiscoveryWindow | None = None,
+) -> list[WarmCacheKey]:
+    """Returns the warm cache keys of the values of every field group"""
+    return [
+        WarmCacheKey(kibana_url, space_id, data_view_id, "|".join(element_field), window.key if window else "")
+        for element_field in element_fields
+    ]
+
+
+# pylint: disable=too-many-positional-arguments
+def warm_cache_is_stale(
+    warm_cache: WarmCache,
+    kibana_url: str,
+    space_id: str,
+    data_view_id: str,
+    element_fields: list[list[str]],
+    window: DiscoveryWindow | None = None,
+    max_age: float = WARM_MAX_AGE,
+) -> bool:
+    """Returns True if the fields list or the values of a field group are missing from the warm cache,
+    or were stored more than max_age seconds ago"""
+
+    keys: list[tuple[str, WarmCacheKey]] = [(WarmCache.FIELDS, WarmCacheKey(kibana_url, space_id, data_view_id))]
+    keys += [
+        (WarmCache.VALUES, key) for key in field_values_keys(kibana_url, space_id, data_view_id, element_fields, window)
+    ]
+
+    oldest: float = time.time() - max_age
+    for kind, key in keys:
+        updated_at: float | None = warm_cache.updated_at(kind, key)
+        if updated_at is None or updated_at < oldest:
+            return True
+    return False
+
+
+def load_field_values_many(
+    element_fields: list[list[str]],
+    data_view_id: str,
+    space_id: str,
+    fields_catalog: FieldCatalog,
+    kibana: NotCertifiedKibana,
+    elastic: Elasticsearch,
+    warm_cache: WarmCache | None,
+    refresh: bool = False,
+    logger: Type[BaseLogger] | None = None,
+    window: DiscoveryWindow | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> list[dict[str, Any]]:
+    """automated_field_value_extraction_many served from the warm cache when available,
+    only the missing field groups (or all of them if refresh is True) are discovered again.
+    Entries are cached per window key (the quantized bounds, or the label of a lookback window),
+    all-time keyword values are discovered incrementally since the last discovery.
+    Field groups whose values couldn't be fetched are not cached, so the next call tries them again"""
+
+    keys: list[WarmCacheKey] = field_values_keys(kibana.base_url, space_id, data_view_id, element_fields, window)
+
+    results: list[dict[str, Any] | None] = [None] * len(element_fields)
+    if warm_cache and not refresh:
+        results = [warm_cache.get(WarmCache.VALUES, key) for key in keys]
+
+    missing: list[int] = [index for index, result in enumerate(results) if result is None]
+    if logger and warm_cache and not refresh:
+        logger.message(f"Serving {len(results) - len(missing)}/{len(results)} field values from the warm cache")
+
+    if missing:
+        failed: set[int] = set()
+        discovered: list[dict[str, Any]] = automated_field_value_extraction_many(
+            element_fields=[element_fields[index] for index in missing],
+            data_view_id=data_view_id,
+            space_id=space_id,
+            fields_catalog=fields_catalog,
+            kibana=kibana,
+            elastic=elastic,
+            logger=logger,
+            warm_cache=warm_cache,
+            window=window,
+            time_field=time_field,
+            failed=failed,
+        )
+        for position, (index, values) in enumerate(zip(missing, discovered)):
+            results[index] = values
+            if warm_cache and position not in failed:
+                warm_cache.set(WarmCache.VALUES, keys[index], values)
+
+    return [result or {} for result in results]
+
+
+def refresh_in_background(refresh: Callable[[], None], logger: Type[BaseLogger] | None = None) -> bool:
+    """Runs refresh in a daemon thread, unless one is already running or the last one
+    started less than WARM_REFRESH_INTERVAL seconds ago. Returns True if it was started"""
+
+    global _last_refresh  # pylint: disable=global-statement
+
+    if time.monotonic() - _last_refresh < WARM_REFRESH_INTERVAL or not _refresh_lock.acquire(blocking=False):
+        return False
+    _last_refresh = time.monotonic()
+
+    def run() -> None:
+        try:
+            refresh()
+            if logger:
+                logger.message("Warm cache refreshed")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if logger:
+                logger.error(f"Warm cache refresh failed: {e}")
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
@@ -35,29 +35,27 @@ def run_example(logger: Type[BaseLogger] | None = None) -> list[Any] | None:
     # Initialize Kibana API
     kibana = NotCertifiedKibana(base_url=BASE_URL, username=USERNAME, password=PASS, logger=logger)
 
+    if SPACE_ID is None or DATA_VIEW_ID is None:
+        msg = "[example.kibapi] - SPACE_ID or DATA_VIEW_ID are None."
+        if logger:
+            logger.error(msg)
+        raise ValueError(msg)
+
     # Validate space
-    spaces = kibana.get_spaces()
-    if not spaces or not any(space.get("id") == SPACE_ID for space in spaces):
+    if not kibana.space_exists(SPACE_ID):
         msg = f"[example.kibapi] - Specified Space ID '{SPACE_ID}' not found."
         if logger:
             logger.error(msg)
         return None
 
     # Validate date view
-    data_views = kibana.get_dataviews()
-    if not data_views or not any(view.get("id") == DATA_VIEW_ID for view in data_views):
+    if not kibana.data_view_exists(DATA_VIEW_ID, space_id=SPACE_ID):
         msg = f"[example.kibapi] - Specified data view ID '{DATA_VIEW_ID}' not found."
         if logger:
             logger.error(msg)
         return None
 
     # Fetch and group fields
-    if SPACE_ID is None or DATA_VIEW_ID is None:
-        msg = "[example.kibapi] - SPACE_ID or DATA_VIEW_ID are None."
-        if logger:
-            logger.error(msg)
-        raise ValueError(msg)
-
     fields_list = kibana.get_fields_list(SPACE_ID, DATA_VIEW_ID)
     if not fields_list:
         msg = "[example.kibapi] - No fields found for the specified data view."
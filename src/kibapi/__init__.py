@@ -1,4 +1,21 @@
+from .async_not_certified_kibana import AsyncNotCertifiedKibana
+from .cache import MetadataCache
+from .field_catalog import FieldCatalog, FieldRecord
+from .metrics import RequestMetrics
 from .not_certified_kibana import NotCertifiedKibana
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
 from .utils import get_field_properties, group_fields
 
-__all__ = ["NotCertifiedKibana", "get_field_properties", "group_fields"]
+__all__ = [
+    "AsyncNotCertifiedKibana",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FieldCatalog",
+    "FieldRecord",
+    "MetadataCache",
+    "NotCertifiedKibana",
+    "RequestMetrics",
+    "RetryPolicy",
+    "get_field_properties",
+    "group_fields",
+]
@@ -0,0 +1,321 @@
+# The async client intentionally mirrors the sync NotCertifiedKibana methods
+# pylint: disable=duplicate-code
+import asyncio
+import json
+import time
+from typing import Any, Type, cast
+
+import aiohttp
+
+from kiblog import BaseLogger
+
+from .metrics import RequestMetrics, endpoint_template
+from .utils import DEFAULT_TIME_FIELD, build_suggestions_request_body
+
+
+class AsyncNotCertifiedKibana:  # pylint: disable=too-many-instance-attributes
+    """
+    Asyncio counterpart of `NotCertifiedKibana`, built on `aiohttp`.
+
+    SSL certificate verification is disabled, connections are pooled by a single
+    `aiohttp.ClientSession`, and the number of in-flight requests is bounded by a semaphore,
+    so many calls can be awaited together (e.g. with `asyncio.gather`) without flooding Kibana.
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(
+        self,
+        base_url: str,
+        username: str | None = None,
+        password: str | None = None,
+        logger: Type[BaseLogger] | None = None,
+        max_concurrency: int = 10,
+        timeout: float = 10,
+        metrics: RequestMetrics | None = None,
+    ) -> None:
+        """
+        Initialize the client. The HTTP session is created lazily inside the running event loop.
+
+        Args:
+            base_url (str): The Kibana base URL.
+            username (str | None): Username used for basic authentication.
+            password (str | None): Password used for basic authentication.
+            logger (Type[BaseLogger] | None): Optional logger for info and error messages.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+            timeout (float): Total timeout of a single request, in seconds.
+            metrics (RequestMetrics | None): Where the requests are recorded, per endpoint template.
+                A new instance is created if not given, it can be shared between clients.
+        """
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> "AsyncNotCertifiedKibana":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared session, creating it on first use."""
+
+        if self._session is None or self._session.closed:
+            auth = aiohttp.BasicAuth(self.username, self.password) if (self.username and self.password) else None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ssl=False, limit=self.max_concurrency),
+                auth=auth,
+                headers={"kbn-xsrf": "True"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def requester(self, method: str, path: str, body: dict[str, Any] | None = None) -> tuple[int, Any]:
+        """
+        Send an HTTP request to Kibana API, waiting for a free concurrency slot first.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The API endpoint path, relative to the base URL.
+            body (dict[str, Any] | None): Optional JSON-serializable body payload.
+
+        Returns:
+            tuple[int, Any]: The status code and the decoded JSON body (None if the body is not JSON).
+        """
+
+        session = self._get_session()
+        assert self._semaphore is not None
+
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else None
+
+        async with self._semaphore:
+            start_time = time.perf_counter()
+            try:
+                async with session.request(method, f"{self.base_url}{path}", data=data, headers=headers) as response:
+                    raw = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.metrics.observe(method, endpoint_template(path), None, time.perf_counter() - start_time)
+                raise
+            elapsed = time.perf_counter() - start_time
+
+        self.metrics.observe(
+            method=method,
+            endpoint=endpoint_template(path),
+            status_code=response.status,
+            elapsed=elapsed,
+            request_bytes=len(data) if data else 0,
+            response_bytes=response.content_length if response.content_length is not None else len(raw),
+        )
+        if self.logger:
+            self.logger.debug(
+                f"[kibapi.AsyncNotCertifiedKibana.requester] - Request to {path} completed in {elapsed * 1000:.2f}ms"
+            )
+
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = None
+        return response.status, payload
+
+    async def get_spaces(self) -> list[dict[str, Any]] | None:
+        """
+        Retrieve the list of Kibana spaces.
+
+        Returns:
+            list[dict[str, Any]] | None: List of spaces as dictionaries if successful, else None.
+        """
+
+        try:
+            status, payload = await self.requester("GET", "/api/spaces/space")
+            if status == 200 and isinstance(payload, list):
+                return cast(list[dict[str, Any]], payload)
+            msg = (
+                f"[kibapi.AsyncNotCertifiedKibana.get_spaces] - Unexpected status code: {status}"
+                if status != 200
+                else "[kibapi.AsyncNotCertifiedKibana.get_spaces] - Response is not a JSON list"
+            )
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            msg = f"[kibapi.AsyncNotCertifiedKibana.get_spaces] - Exception while getting spaces.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
+    async def get_dataviews(self) -> list[dict[str, Any]] | None:
+        """
+        Retrieve all available data views.
+
+        Returns:
+            list[dict[str, Any]] | None: List of data views as dictionaries if successful, else None.
+        """
+
+        try:
+            status, payload = await self.requester("GET", "/api/data_views")
+            if status == 200 and isinstance(payload, dict):
+                return cast(list[dict[str, Any]], payload.get("data_view", []))
+            msg = (
+                f"[kibapi.AsyncNotCertifiedKibana.get_dataviews] - Can't get data views - Code {status}"
+                if status != 200
+                else "[kibapi.AsyncNotCertifiedKibana.get_dataviews] - Can't get data views - Not a JSON object"
+            )
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            msg = f"[kibapi.AsyncNotCertifiedKibana.get_dataviews] - Exception while getting dataviews.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
+    async def get_fields_list(self, space_id: str, data_view_id: str) -> list[dict[str, Any]] | None:
+        """
+        Retrieve the list of fields for a specified space and data view.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID or pattern of the data view.
+
+        Returns:
+            list[dict[str, Any]] | None: List of fields as dictionaries if successful, else None.
+        """
+
+        try:
+            url = f"/s/{space_id}/internal/data_views/fields?pattern={data_view_id}"
+            status, payload = await self.requester("GET", url)
+            if status == 200 and isinstance(payload, dict):
+                return cast(list[dict[str, Any]], payload.get("fields", []))
+            msg = (
+                f"[kibapi.AsyncNotCertifiedKibana.get_fields_list] - Unexpected status code: {status}"
+                if status != 200
+                else "[kibapi.AsyncNotCertifiedKibana.get_fields_list] - Response is not a JSON object"
+            )
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            msg = f"[kibapi.AsyncNotCertifiedKibana.get_fields_list] - Exception while getting fields list.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
+    async def get_field_possible_values(
+        self,
+        space_id: str,
+        data_view_id: str,
+        field_dict: dict[str, Any],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        time_field: str = DEFAULT_TIME_FIELD,
+    ) -> list[Any]:
+        """
+        Retrieve suggested possible values for a given field within a space and data view,
+        optionally filtered by a date range.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID of the data view.
+            field_dict (dict[str, Any]): Dictionary describing the field (name, type, etc.).
+            start_date (str | None): ISO 8601 formatted start date for filtering (inclusive).
+            end_date (str | None): ISO 8601 formatted end date for filtering (inclusive).
+            time_field (str): The field the date range applies to, the `timeFieldName` of the data view.
+
+        Returns:
+            list[Any]: List of suggested field values, empty if none or on error.
+        """
+
+        if not field_dict:
+            return []
+
+        request_body: dict[str, Any] = build_suggestions_request_body(field_dict, start_date, end_date, time_field)
+
+        try:
+            api_url = f"/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
+            status, payload = await self.requester("POST", api_url, body=request_body)
+            if status == 200 and isinstance(payload, list):
+                return payload
+
+            msg = (
+                f"[kibapi.AsyncNotCertifiedKibana.get_field_possible_values] - Unexpected status code: {status}"
+                if status != 200
+                else "[kibapi.AsyncNotCertifiedKibana.get_field_possible_values] - Response is not a JSON list"
+            )
+            if self.logger:
+                self.logger.error(msg)
+            return []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            msg = (
+                "[kibapi.AsyncNotCertifiedKibana.get_field_possible_values] - "
+                f"Exception while getting field possible values.\n{e}"
+            )
+            if self.logger:
+                self.logger.error(msg)
+            return []
+
+    async def get_field_possible_values_many(
+        self,
+        space_id: str,
+        data_view_id: str,
+        field_dicts: list[dict[str, Any]],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        time_field: str = DEFAULT_TIME_FIELD,
+    ) -> dict[str, list[Any] | Exception]:
+        """
+        Retrieve the suggested possible values of many fields concurrently.
+
+        A failing field never aborts the batch: its exception is stored in place of its values.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID of the data view.
+            field_dicts (list[dict[str, Any]]): Dictionaries describing the fields (name, type, etc.).
+            start_date (str | None): ISO 8601 formatted start date for filtering (inclusive).
+            end_date (str | None): ISO 8601 formatted end date for filtering (inclusive).
+            time_field (str): The field the date range applies to, the `timeFieldName` of the data view.
+
+        Returns:
+            dict[str, list[Any] | Exception]: The suggested values of every field, or the exception
+                raised while fetching them, keyed by field name.
+        """
+
+        async def fetch(field_dict: dict[str, Any]) -> list[Any]:
+            api_url = f"/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
+            request_body = build_suggestions_request_body(field_dict, start_date, end_date, time_field)
+            status, payload = await self.requester("POST", api_url, body=request_body)
+            if status != 200:
+                raise RuntimeError(f"Unexpected status code: {status}")
+            if not isinstance(payload, list):
+                raise RuntimeError("Response is not a JSON list")
+            return payload
+
+        field_dicts = [field_dict for field_dict in field_dicts if field_dict]
+        results = await asyncio.gather(*(fetch(field_dict) for field_dict in field_dicts), return_exceptions=True)
+
+        output: dict[str, list[Any] | Exception] = {}
+        for field_dict, result in zip(field_dicts, results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+
+            if isinstance(result, Exception) and self.logger:
+                self.logger.error(
+                    "[kibapi.AsyncNotCertifiedKibana.get_field_possible_values_many] - "
+                    f"Exception while getting possible values of {field_dict['name']}.\n{result}"
+                )
+            output[field_dict["name"]] = result
+        return output
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Type
+
+import requests
+
+from kiblog import BaseLogger
+
+# Default time to live, in seconds, of every cached Kibana endpoint
+DEFAULT_TTLS: dict[str, float] = {
+    "spaces": 600,
+    "data_views": 600,
+    "fields": 300,
+}
+
+
+@dataclass
+class CacheEntry:
+    """A cached Kibana response payload with its validators."""
+
+    endpoint: str
+    value: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class MetadataCache:  # pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe, size-bounded LRU cache for rarely changing Kibana metadata endpoints
+    (spaces, data views, fields list).
+
+    Each endpoint has its own time to live. Once an entry expires it is still served for
+    `stale_ttl` seconds while it is revalidated in a background thread
+    (stale-while-revalidate). Revalidation sends `If-None-Match`/`If-Modified-Since`
+    when Kibana returned an `ETag`/`Last-Modified`, so unchanged data costs a 304.
+
+    Cached payloads are shared between callers and must not be mutated.
+    """
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = 300,
+        stale_ttl: float = 60,
+        max_entries: int = 128,
+        background_refresh: bool = True,
+        logger: Type[BaseLogger] | None = None,
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttls (dict[str, float] | None): Time to live in seconds per endpoint name,
+                merged over `DEFAULT_TTLS`.
+            default_ttl (float): Time to live of endpoints without an explicit one.
+            stale_ttl (float): Seconds an expired entry is still served while being revalidated.
+            max_entries (int): Maximum number of entries before the least recently used is evicted.
+            background_refresh (bool): If False, expired entries are never served and are
+                revalidated synchronously.
+            logger (Type[BaseLogger] | None): Optional logger for debug and error messages.
+        """
+        self.ttls: dict[str, float] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.background_refresh = background_refresh
+        self.logger = logger
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "not_modified": 0,
+            "evictions": 0,
+        }
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Returns the time to live, in seconds, of the given endpoint."""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict[str, float]: hits, stale_hits, misses, revalidations, not_modified, evictions,
+                the current number of entries and the hit ratio.
+        """
+
+        with self._lock:
+            stats: dict[str, float] = dict(self._counters)
+            stats["entries"] = len(self._entries)
+
+        served = stats["hits"] + stats["stale_hits"]
+        total = served + stats["misses"]
+        stats["hit_ratio"] = served / total if total else 0.0
+        return stats
+
+    def invalidate(self, endpoint: str | None = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            endpoint (str | None): If given, only entries of this endpoint are dropped.
+        """
+
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key, entry in self._entries.items() if entry.endpoint == endpoint]:
+                del self._entries[key]
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        key: str,
+        fetch: Callable[[dict[str, str]], requests.Response],
+        parse: Callable[[requests.Response], Any],
+    ) -> tuple[int, Any]:
+        """
+        Returns the cached payload of `key`, fetching it when missing or too old.
+
+        Args:
+            endpoint (str): The endpoint name, used to pick the time to live.
+            key (str): The cache key, usually the full request URL.
+            fetch (Callable[[dict[str, str]], requests.Response]): Sends the request with the
+                given extra (conditional) headers.
+            parse (Callable[[requests.Response], Any]): Extracts the payload from a 200 response.
+
+        Returns:
+            tuple[int, Any]: The status code (200 when served from cache) and the payload,
+                None if the status code is not 200.
+
+        Raises:
+            requests.RequestException: If a synchronous fetch fails.
+            ValueError: If `parse` fails on a synchronously fetched body, e.g. not JSON.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and now < entry.expires_at:
+                self._counters["hits"] += 1
+                self._entries.move_to_end(key)
+                return 200, entry.value
+
+            serve_stale = entry is not None and self.background_refresh and now < entry.expires_at + self.stale_ttl
+            start_refresh = serve_stale and key not in self._refreshing
+            if serve_stale:
+                self._counters["stale_hits"] += 1
+                self._entries.move_to_end(key)
+                if start_refresh:
+                    self._refreshing.add(key)
+            else:
+                self._counters["misses"] += 1
+
+        if serve_stale:
+            assert entry is not None
+            if start_refresh:
+                threading.Thread(
+                    target=self._background_revalidate, args=(endpoint, key, entry, fetch, parse), daemon=True
+                ).start()
+            return 200, entry.value
+
+        return self._revalidate(endpoint, key, entry, fetch, parse)
+
+    def _background_revalidate(
+        self,
+        endpoint: str,
+        key: str,
+        entry: CacheEntry,
+        fetch: Callable[[dict[str, str]], requests.Response],
+        parse: Callable[[requests.Response], Any],
+    ) -> None:
+        """Revalidate a stale entry, logging instead of raising on failure."""
+
+        try:
+            self._revalidate(endpoint, key, entry, fetch, parse)
+        # A 200 response whose body is not JSON raises a ValueError while parsed
+        except (requests.RequestException, ValueError) as e:
+            if self.logger:
+                self.logger.error(f"[kibapi.MetadataCache] - Background revalidation of {key} failed.\n{e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _revalidate(
+        self,
+        endpoint: str,
+        key: str,
+        entry: CacheEntry | None,
+        fetch: Callable[[dict[str, str]], requests.Response],
+        parse: Callable[[requests.Response], Any],
+    ) -> tuple[int, Any]:
+        """Fetch `key`, conditionally if the previous entry has validators, and store the result."""
+
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = fetch(headers)
+        ttl = self.ttl_for(endpoint)
+
+        # Closed on every path, streamed responses hold a pooled connection until then
+        with response:
+            with self._lock:
+                if entry is not None:
+                    self._counters["revalidations"] += 1
+
+                if response.status_code == 304 and entry is not None:
+                    self._counters["not_modified"] += 1
+                    entry.expires_at = time.monotonic() + ttl
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    return 200, entry.value
+
+            if response.status_code != 200:
+                return response.status_code, None
+
+            value = parse(response)
+
+        new_entry = CacheEntry(
+            endpoint=endpoint,
+            value=value,
+            expires_at=time.monotonic() + ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+        with self._lock:
+            self._entries[key] = new_entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+        if self.logger:
+            self.logger.debug(f"[kibapi.MetadataCache] - Cached {key} for {ttl}s")
+        return 200, value
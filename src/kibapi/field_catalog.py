@@ -0,0 +1,172 @@
+import sys
+from collections import defaultdict
+from typing import Any, Iterable, Iterator
+
+
+class FieldRecord:
+    """
+    Compact description of a data view field, keeping only the attributes used by KibCat.
+
+    Attributes:
+        name (str): The field name.
+        type (str): The Kibana field type (string, number, date, ...).
+        es_types (tuple[str, ...]): The Elasticsearch mapping types.
+        searchable (bool): Whether the field is searchable.
+        aggregatable (bool): Whether the field is aggregatable.
+        read_from_doc_values (bool): Whether the field is read from doc values.
+        parent (str | None): The parent field if this is a multi-field (e.g. `name` for `name.keyword`).
+    """
+
+    __slots__ = ("name", "type", "es_types", "searchable", "aggregatable", "read_from_doc_values", "parent")
+
+    # pylint: disable=too-many-positional-arguments
+    def __init__(
+        self,
+        name: str,
+        type: str,  # pylint: disable=redefined-builtin
+        es_types: tuple[str, ...],
+        searchable: bool,
+        aggregatable: bool,
+        read_from_doc_values: bool,
+        parent: str | None = None,
+    ) -> None:
+        self.name = name
+        self.type = type
+        self.es_types = es_types
+        self.searchable = searchable
+        self.aggregatable = aggregatable
+        self.read_from_doc_values = read_from_doc_values
+        self.parent = parent
+
+    @classmethod
+    def from_dict(cls, field: dict[str, Any]) -> "FieldRecord":
+        """
+        Build a record from a field dictionary of `/internal/data_views/fields`.
+
+        Repeated strings like types are interned, so thousands of fields share them.
+        """
+        return cls(
+            name=field["name"],
+            type=sys.intern(field.get("type", "unknown")),
+            es_types=tuple(sys.intern(es_type) for es_type in field.get("esTypes", [])),
+            searchable=bool(field.get("searchable", False)),
+            aggregatable=bool(field.get("aggregatable", False)),
+            read_from_doc_values=bool(field.get("readFromDocValues", False)),
+            parent=field.get("subType", {}).get("multi", {}).get("parent"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the field as a dictionary shaped like the ones returned by Kibana."""
+        field: dict[str, Any] = {
+            "name": self.name,
+            "type": self.type,
+            "esTypes": list(self.es_types),
+            "searchable": self.searchable,
+            "aggregatable": self.aggregatable,
+            "readFromDocValues": self.read_from_doc_values,
+        }
+        if self.parent:
+            field["subType"] = {"multi": {"parent": self.parent}}
+        return field
+
+    def __repr__(self) -> str:
+        return f"FieldRecord(name={self.name!r}, type={self.type!r})"
+
+
+class FieldCatalog:
+    """
+    Indexed, read-only catalog of the fields of a data view.
+
+    Built once per fetch, it holds an O(1) name index, the multi-field groups
+    (e.g. `["stream", "stream.keyword"]`) and the type/aggregatable filters, so callers
+    don't scan or regroup the whole fields list on every use.
+    """
+
+    __slots__ = ("_records", "_by_name", "_groups", "_field_to_group", "_by_type", "_aggregatable")
+
+    def __init__(self, records: Iterable[FieldRecord]) -> None:
+        self._records: tuple[FieldRecord, ...] = tuple(records)
+        self._by_name: dict[str, FieldRecord] = {record.name: record for record in self._records}
+
+        by_type: dict[str, list[str]] = defaultdict(list)
+        for record in self._records:
+            by_type[record.type].append(record.name)
+        self._by_type: dict[str, tuple[str, ...]] = {key: tuple(names) for key, names in by_type.items()}
+        self._aggregatable: tuple[str, ...] = tuple(record.name for record in self._records if record.aggregatable)
+
+        self._groups: tuple[tuple[str, ...], ...] = self._build_groups(self._records)
+        self._field_to_group: dict[str, tuple[str, ...]] = {field: group for group in self._groups for field in group}
+
+    @classmethod
+    def from_fields(cls, fields: Iterable[dict[str, Any]]) -> "FieldCatalog":
+        """
+        Build a catalog from the field dictionaries returned by Kibana.
+
+        Args:
+            fields (Iterable[dict[str, Any]]): The fields of `/internal/data_views/fields`.
+
+        Returns:
+            FieldCatalog: The indexed catalog. Fields without a name are skipped.
+        """
+        return cls(FieldRecord.from_dict(field) for field in fields if field.get("name"))
+
+    @staticmethod
+    def _build_groups(records: tuple[FieldRecord, ...]) -> tuple[tuple[str, ...], ...]:
+        """Groups fields with their multi-fields, with the same output as `group_fields`."""
+
+        children: dict[str, list[str]] = defaultdict(list)
+        for record in records:
+            if record.parent:
+                children[record.parent].append(record.name)
+
+        grouped: set[str] = set()
+        result: list[tuple[str, ...]] = []
+
+        for record in records:
+            if record.name in children:
+                group = (record.name, *children[record.name])
+                result.append(group)
+                grouped.update(group)
+            elif record.name not in grouped:
+                result.append((record.name,))
+                grouped.add(record.name)
+
+        return tuple(result)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def __iter__(self) -> Iterator[FieldRecord]:
+        return iter(self._records)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> FieldRecord | None:
+        """Returns the record of the field `name`, None if it does not exist."""
+        return self._by_name.get(name)
+
+    @property
+    def names(self) -> list[str]:
+        """The field names, in the order returned by Kibana."""
+        return [record.name for record in self._records]
+
+    @property
+    def groups(self) -> list[list[str]]:
+        """The fields grouped with their multi-fields, like `group_fields`."""
+        return [list(group) for group in self._groups]
+
+    def group_of(self, name: str) -> list[str]:
+        """Returns the group of the field `name`, or a group with only `name` if it is unknown."""
+        return list(self._field_to_group.get(name, (name,)))
+
+    def names_by_type(self, field_type: str) -> list[str]:
+        """Returns the names of the fields with the given Kibana type."""
+        return list(self._by_type.get(field_type, ()))
+
+    def aggregatable_names(self) -> list[str]:
+        """Returns the names of the aggregatable fields."""
+        return list(self._aggregatable)
@@ -0,0 +1,241 @@
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Status class recorded when no response was received (timeout, connection error, ...)
+ERROR_STATUS_CLASS = "error"
+
+# Path parameters of the Kibana endpoints, replaced by their name in the endpoint templates
+_PATH_PARAMETERS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"^/s/[^/]+(?=/)"), "/s/{space_id}"),
+    (re.compile(r"^/api/spaces/space/[^/]+$"), "/api/spaces/space/{space_id}"),
+    (re.compile(r"/api/data_views/data_view/[^/]+$"), "/api/data_views/data_view/{data_view_id}"),
+    (re.compile(r"/internal/kibana/suggestions/values/[^/]+$"), "/internal/kibana/suggestions/values/{data_view_id}"),
+    (re.compile(r"/api/saved_objects/([^/_][^/]*)/[^/]+$"), r"/api/saved_objects/\1/{id}"),
+)
+
+
+def endpoint_template(url: str, base_url: str = "") -> str:
+    """
+    Returns the endpoint template of a request URL, so requests to different spaces,
+    data views or objects are aggregated together.
+
+    Args:
+        url (str): The full request URL or path.
+        base_url (str): The Kibana base URL, stripped from `url` together with the query string.
+
+    Returns:
+        str: The templated path, e.g. `/s/{space_id}/internal/data_views/fields`.
+    """
+
+    if base_url and url.startswith(base_url):
+        url = url[len(base_url) :]
+    path = urlsplit(url).path or "/"
+
+    for pattern, replacement in _PATH_PARAMETERS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def status_class(status_code: int | None) -> str:
+    """Returns the class of an HTTP status code (`2xx`, `4xx`, ...), `error` if there was no response."""
+    return f"{status_code // 100}xx" if status_code else ERROR_STATUS_CLASS
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters and latency histogram of a single (method, endpoint template) pair."""
+
+    buckets: tuple[float, ...]
+    count: int = 0
+    status_classes: dict[str, int] = field(default_factory=dict)
+    request_bytes: int = 0
+    response_bytes: int = 0
+    latency_sum: float = 0.0
+    latency_counts: list[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        # One counter per bucket, plus the +Inf one
+        self.latency_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, status: str, elapsed: float, request_bytes: int, response_bytes: int) -> None:
+        """Record a request. Not thread-safe, the caller holds the lock."""
+        self.count += 1
+        self.status_classes[status] = self.status_classes.get(status, 0) + 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.latency_sum += elapsed
+        self.latency_counts[bisect_left(self.buckets, elapsed)] += 1
+
+    def cumulative_buckets(self) -> list[tuple[str, int]]:
+        """Returns the cumulative histogram as (upper bound, count) pairs, Prometheus style."""
+
+        result: list[tuple[str, int]] = []
+        total = 0
+        for bound, count in zip([*map(repr, self.buckets), "+Inf"], self.latency_counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class RequestMetrics:
+    """
+    Thread-safe request metrics aggregated per HTTP method and endpoint template:
+    request count, status code classes, bytes sent and received and a latency histogram.
+
+    Snapshots can be exported as a dictionary or in the Prometheus text exposition format.
+    An instance can be shared between several clients.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS, prefix: str = "kibapi") -> None:
+        """
+        Initialize empty metrics.
+
+        Args:
+            buckets (tuple[float, ...]): Sorted upper bounds, in seconds, of the latency histogram buckets.
+            prefix (str): Prefix of the exported Prometheus metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+
+    # pylint: disable=too-many-positional-arguments
+    def observe(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: int | None,
+        elapsed: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        """
+        Record a request.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The endpoint template, see `endpoint_template`.
+            status_code (int | None): The response status code, None if no response was received.
+            elapsed (float): The request duration in seconds.
+            request_bytes (int): Size of the request body.
+            response_bytes (int): Size of the response body as transferred.
+        """
+
+        key = (method.upper(), endpoint)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics(buckets=self.buckets)
+            metrics.observe(status_class(status_code), elapsed, request_bytes, response_bytes)
+
+    def quantile(self, method: str, endpoint: str, q: float, min_count: int = 20) -> float | None:
+        """
+        Estimate a latency quantile of an endpoint from its histogram.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The endpoint template.
+            q (float): The quantile, between 0 and 1 (e.g. 0.95).
+            min_count (int): Minimum number of recorded requests for the estimate to be returned.
+
+        Returns:
+            float | None: The upper bound, in seconds, of the bucket holding the quantile. None if
+                there are not enough requests or the quantile is above the last bucket.
+        """
+
+        with self._lock:
+            metrics = self._endpoints.get((method.upper(), endpoint))
+            if metrics is None or metrics.count < max(min_count, 1):
+                return None
+
+            rank = q * metrics.count
+            total = 0
+            for bound, count in zip(self.buckets, metrics.latency_counts):
+                total += count
+                if total >= rank:
+                    return bound
+        return None
+
+    def reset(self) -> None:
+        """Drop every recorded request."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns a snapshot of the metrics.
+
+        Returns:
+            dict[str, dict[str, Any]]: Per `"METHOD endpoint"` key: count, status_classes,
+                request_bytes, response_bytes, latency_sum (seconds) and latency_buckets
+                (cumulative counts per upper bound).
+        """
+
+        with self._lock:
+            return {
+                f"{method} {endpoint}": {
+                    "count": metrics.count,
+                    "status_classes": dict(metrics.status_classes),
+                    "request_bytes": metrics.request_bytes,
+                    "response_bytes": metrics.response_bytes,
+                    "latency_sum": metrics.latency_sum,
+                    "latency_buckets": dict(metrics.cumulative_buckets()),
+                }
+                for (method, endpoint), metrics in sorted(self._endpoints.items())
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Returns a snapshot of the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The `<prefix>_requests_total`, `<prefix>_request_bytes_total`,
+                `<prefix>_response_bytes_total` and `<prefix>_request_duration_seconds` families.
+        """
+
+        requests_total: list[str] = []
+        request_bytes: list[str] = []
+        response_bytes: list[str] = []
+        durations: list[str] = []
+
+        with self._lock:
+            for (method, endpoint), metrics in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{_escape_label(endpoint)}"'
+
+                for status, count in sorted(metrics.status_classes.items()):
+                    requests_total.append(f'{self.prefix}_requests_total{{{labels},status="{status}"}} {count}')
+                request_bytes.append(f"{self.prefix}_request_bytes_total{{{labels}}} {metrics.request_bytes}")
+                response_bytes.append(f"{self.prefix}_response_bytes_total{{{labels}}} {metrics.response_bytes}")
+
+                name = f"{self.prefix}_request_duration_seconds"
+                for bound, count in metrics.cumulative_buckets():
+                    durations.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                durations.append(f"{name}_sum{{{labels}}} {metrics.latency_sum!r}")
+                durations.append(f"{name}_count{{{labels}}} {metrics.count}")
+
+        families = (
+            ("requests_total", "counter", "Kibana requests by endpoint and status class.", requests_total),
+            ("request_bytes_total", "counter", "Bytes sent in Kibana request bodies.", request_bytes),
+            ("response_bytes_total", "counter", "Bytes received in Kibana response bodies.", response_bytes),
+            ("request_duration_seconds", "histogram", "Kibana request latency in seconds.", durations),
+        )
+
+        lines: list[str] = []
+        for name, kind, description, samples in families:
+            lines.append(f"# HELP {self.prefix}_{name} {description}")
+            lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,14 +1,38 @@
+import threading
 import time
-from typing import Any, Type, cast
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from typing import Any, Callable, Iterable, Iterator, Type, cast
+from urllib.parse import quote
 
 import requests
 import urllib3
 from kibana_api import Kibana
+from requests.adapters import HTTPAdapter
 
 from kiblog import BaseLogger
 
-
-class NotCertifiedKibana(Kibana):  # type: ignore[misc]
+from .cache import MetadataCache
+from .field_catalog import FieldCatalog
+from .metrics import RequestMetrics, endpoint_template
+from .resilience import (
+    DEFAULT_TIMEOUT,
+    DEFAULT_TIMEOUTS,
+    IDEMPOTENT_ENDPOINTS,
+    IDEMPOTENT_METHODS,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+)
+from .streaming import DEFAULT_FIELD_ATTRIBUTES, iter_fields
+from .utils import DEFAULT_TIME_FIELD, build_suggestions_request_body
+
+# Size of the chunks read from streamed responses
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+class NotCertifiedKibana(Kibana):  # type: ignore[misc]  # pylint: disable=too-many-instance-attributes
     """
     Kibana API client wrapper that disables SSL certificate verification and adds
     simplified methods for GET and POST requests.
@@ -16,33 +40,207 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
     Provides methods to retrieve spaces, data views, fields list, and possible values
     for fields with optional logging.
 
+    Every request goes through a single pooled `requests.Session`, so TCP/TLS connections
+    are kept alive and reused across calls (including the inherited `kibana_api` helpers).
+
+    Requests get a per-endpoint timeout, idempotent ones are retried with jittered backoff,
+    and can optionally be hedged (a duplicate is sent when the first one is slower than the
+    endpoint p95) and guarded by a circuit breaker.
+
     Inherits from the base Kibana class.
     """
 
+    # pylint: disable=too-many-positional-arguments
     def __init__(
         self,
         base_url: str,
         username: str | None = None,
         password: str | None = None,
         logger: Type[BaseLogger] | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        session_auth: bool = False,
+        compression: bool = True,
+        cache: MetadataCache | None = None,
+        metrics: RequestMetrics | None = None,
+        timeouts: dict[str, float] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedged_endpoints: Iterable[str] = (),
+        hedge_delay: float = 0.5,
+        hedge_quantile: float = 0.95,
     ) -> None:
+        """
+        Initialize the client and its pooled HTTP session.
+
+        Args:
+            base_url (str): The Kibana base URL.
+            username (str | None): Username used for authentication.
+            password (str | None): Password used for authentication.
+            logger (Type[BaseLogger] | None): Optional logger for info and error messages.
+            pool_connections (int): Number of host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per host.
+            keep_alive (bool): If False, every request asks the server to close the connection.
+            session_auth (bool): If True, log in once and authenticate with the Kibana session
+                cookie instead of sending basic auth on every request.
+            compression (bool): If True, negotiate gzip/deflate compressed responses.
+            cache (MetadataCache | None): Optional cache for the spaces, data views and fields list
+                endpoints. It can be shared between clients.
+            metrics (RequestMetrics | None): Where the requests are recorded, per endpoint template.
+                A new instance is created if not given, it can be shared between clients.
+            timeouts (dict[str, float] | None): Timeout in seconds per endpoint template, merged
+                over `DEFAULT_TIMEOUTS`. Other endpoints use `DEFAULT_TIMEOUT`.
+            retry_policy (RetryPolicy | None): Retries of idempotent requests, `RetryPolicy()` if not given.
+            circuit_breaker (CircuitBreaker | None): Optional circuit breaker, failing fast with
+                `CircuitOpenError` while Kibana is degraded. It can be shared between clients.
+            hedged_endpoints (Iterable[str]): Templates of the idempotent endpoints whose requests are hedged.
+            hedge_delay (float): Seconds before a hedged request is duplicated, while the endpoint
+                does not have enough recorded requests to estimate its latency quantile.
+            hedge_quantile (float): Latency quantile of the endpoint used as hedging delay.
+        """
         self.logger = logger
+        self.session_auth = session_auth
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        self.timeouts: dict[str, float] = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.hedged_endpoints: frozenset[str] = frozenset(hedged_endpoints)
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self._hedge_executor: ThreadPoolExecutor | None = (
+            ThreadPoolExecutor(max_workers=2 * pool_maxsize, thread_name_prefix="kibapi-hedge")
+            if self.hedged_endpoints
+            else None
+        )
 
         # Disable SSL warnings for self-signed certificates
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         super().__init__(base_url=base_url, username=username, password=password)
 
+        self._session_lock = threading.Lock()
+        self._session_logged_in = False
+        self._session: requests.Session = self._build_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            compression=compression,
+        )
+
+    @staticmethod
+    def _build_session(
+        pool_connections: int, pool_maxsize: int, keep_alive: bool, compression: bool
+    ) -> requests.Session:
+        """
+        Create the pooled HTTP session shared by every request of this client.
+
+        Args:
+            pool_connections (int): Number of host connection pools to cache.
+            pool_maxsize (int): Maximum number of connections kept alive per host.
+            keep_alive (bool): If False, every request asks the server to close the connection.
+            compression (bool): If True, negotiate gzip/deflate compressed responses.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+
+        session = requests.Session()
+
+        # pool_block=True makes concurrent callers wait for a free connection instead of
+        # opening throwaway ones once the pool is exhausted
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        session.headers.update(
+            {
+                "Accept-Encoding": "gzip, deflate" if compression else "identity",
+                "Connection": "keep-alive" if keep_alive else "close",
+            }
+        )
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled `requests.Session` used for every request."""
+        return self._session
+
+    def close(self) -> None:
+        """Close the pooled session and release every kept-alive connection."""
+        self._session.close()
+        self._session_logged_in = False
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+
+    def __enter__(self) -> "NotCertifiedKibana":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _login(self) -> bool:
+        """
+        Authenticate against Kibana with the basic provider and store the session cookie.
+
+        Returns:
+            bool: True if the session cookie was obtained, False otherwise.
+        """
+
+        with self._session_lock:
+            if self._session_logged_in:
+                return True
+
+            body = {
+                "providerType": "basic",
+                "providerName": "basic",
+                "currentURL": f"{self.base_url}/login",
+                "params": {"username": self.username, "password": self.password},
+            }
+            try:
+                response = self._session.post(
+                    f"{self.base_url}/internal/security/login",
+                    json=body,
+                    headers={"kbn-xsrf": "True"},
+                    verify=False,
+                    timeout=10,
+                )
+            except requests.RequestException as e:
+                if self.logger:
+                    self.logger.warning(f"[kibapi.NotCertifiedKibana._login] - Session login failed.\n{e}")
+                return False
+
+            self._session_logged_in = response.status_code in (200, 204)
+            if not self._session_logged_in:
+                # Don't retry the login on every request, basic auth is used from now on
+                self.session_auth = False
+                if self.logger:
+                    self.logger.warning(
+                        "[kibapi.NotCertifiedKibana._login] - "
+                        f"Session login refused with code {response.status_code}, falling back to basic auth"
+                    )
+            return self._session_logged_in
+
     # Some types are ignored here, that's because the Kibana base class does not have Typings
     def requester(self, **kwargs: Any) -> requests.Response:
         """
-        Send an HTTP request to Kibana API with SSL verification disabled.
+        Send an HTTP request to Kibana API with SSL verification disabled, reusing the
+        pooled session connections.
+
+        The timeout defaults to the one of the endpoint. Idempotent requests are retried on
+        connection errors, timeouts and the retry policy status codes, and hedged if their
+        endpoint is in `hedged_endpoints`.
 
         Args:
-            **kwargs: Arguments passed to `requests.request`, such as method, url, json, etc.
+            **kwargs: Arguments passed to `requests.Session.request`, such as method, url, json, etc.
 
         Returns:
             requests.Response: The response object from the HTTP request.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            requests.RequestException: If the last attempt fails.
         """
 
         headers = (
@@ -53,28 +251,155 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
             if "files" not in kwargs
             else {"kbn-xsrf": "True"}
         )
-        auth: tuple[str, str] | None = (self.username, self.password) if (self.username and self.password) else None
-        start_time = time.time()
-        response = requests.request(headers=headers, auth=auth, verify=False, timeout=10, **kwargs)
-        elapsed_ms = (time.time() - start_time) * 1000
+        headers.update(kwargs.pop("headers", None) or {})
+
+        method = str(kwargs.get("method", "GET")).upper()
+        endpoint = endpoint_template(str(kwargs.get("url", "")), self.base_url)
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, DEFAULT_TIMEOUT))
+
+        idempotent = method in IDEMPOTENT_METHODS or endpoint in IDEMPOTENT_ENDPOINTS
+        hedged = idempotent and endpoint in self.hedged_endpoints
+        retries = self.retry_policy.max_retries if idempotent else 0
+
+        for retry in range(retries + 1):
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                raise CircuitOpenError(f"Circuit breaker open, {method} {endpoint} not sent")
+
+            try:
+                response = (
+                    self._send_hedged(method, endpoint, headers, kwargs) if hedged else self._send(headers, kwargs)
+                )
+            except requests.RequestException:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                if retry == retries:
+                    raise
+            except BaseException:
+                # Any other error still ends the attempt, a half open trial must not stay reserved
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                raise
+            else:
+                if self.circuit_breaker is not None:
+                    if response.status_code >= 500:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if retry == retries or response.status_code not in self.retry_policy.retry_statuses:
+                    return response
+                response.close()
+
+            delay = self.retry_policy.backoff(retry)
+            if self.logger:
+                self.logger.warning(
+                    f"[kibapi.NotCertifiedKibana.requester] - Retrying {method} {endpoint} in {delay * 1000:.0f}ms"
+                )
+            time.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def _send(self, headers: dict[str, str], kwargs: dict[str, Any]) -> requests.Response:
+        """Send a single request attempt, logging in again once if the session cookie expired."""
+
+        has_credentials = bool(self.username and self.password)
+        use_cookie = has_credentials and self.session_auth and self._login()
+        auth: tuple[str, str] | None = (self.username, self.password) if (has_credentials and not use_cookie) else None
+        start_time = time.perf_counter()
+        try:
+            response = self._session.request(headers=headers, auth=auth, verify=False, **kwargs)
+
+            # The session cookie expired, log in again and retry once
+            if use_cookie and response.status_code == 401:
+                self._session_logged_in = False
+                auth = None if self._login() else (self.username, self.password)
+                response = self._session.request(headers=headers, auth=auth, verify=False, **kwargs)
+        except requests.RequestException:
+            self._record(kwargs, None, time.perf_counter() - start_time)
+            raise
+
+        elapsed = time.perf_counter() - start_time
+        self._record(kwargs, response, elapsed)
         if self.logger:
             self.logger.debug(
                 "[kibapi.NotCertifiedKibana.requester] - "
-                f"Request to {kwargs.get('url')} completed in {elapsed_ms:.2f}ms"
+                f"Request to {kwargs.get('url')} completed in {elapsed * 1000:.2f}ms"
             )
         return response
 
-    def get(self, path: str) -> requests.Response:
+    def _send_hedged(
+        self, method: str, endpoint: str, headers: dict[str, str], kwargs: dict[str, Any]
+    ) -> requests.Response:
+        """
+        Send a request and, if it has not completed after the hedging delay, a duplicate one.
+        The first successful response wins and the other one is closed when it completes.
+        """
+
+        assert self._hedge_executor is not None
+        delay = self.metrics.quantile(method, endpoint, self.hedge_quantile) or self.hedge_delay
+
+        first = self._hedge_executor.submit(self._send, headers, kwargs)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+
+        if self.logger:
+            self.logger.debug(
+                f"[kibapi.NotCertifiedKibana._send_hedged] - Hedging {method} {endpoint} after {delay * 1000:.0f}ms"
+            )
+        pending = {first, self._hedge_executor.submit(self._send, headers, kwargs)}
+        error: BaseException | None = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winners = [future for future in done if future.exception() is None]
+            if winners:
+                for loser in [*winners[1:], *pending]:
+                    loser.add_done_callback(_close_response)
+                return winners[0].result()
+            error = next(iter(done)).exception()
+
+        assert error is not None
+        raise error
+
+    def _record(self, kwargs: dict[str, Any], response: requests.Response | None, elapsed: float) -> None:
+        """Record a request sent by `requester` in the metrics."""
+
+        request_bytes = 0
+        response_bytes = 0
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            request_bytes = len(body) if body else 0
+
+            # Size on the wire when known, streamed bodies without it are not read here
+            content_length = response.headers.get("Content-Length")
+            if content_length and content_length.isdigit():
+                response_bytes = int(content_length)
+            elif not kwargs.get("stream"):
+                response_bytes = len(response.content)
+
+        self.metrics.observe(
+            method=str(kwargs.get("method", "GET")),
+            endpoint=endpoint_template(str(kwargs.get("url", "")), self.base_url),
+            status_code=response.status_code if response is not None else None,
+            elapsed=elapsed,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+        )
+
+    def get(self, path: str, headers: dict[str, str] | None = None, stream: bool = False) -> requests.Response:
         """
         Send a GET request to the specified Kibana API path.
 
         Args:
             path (str): The API endpoint path, relative to the base URL.
+            headers (dict[str, str] | None): Optional extra request headers.
+            stream (bool): If True, the body is not downloaded until it is iterated.
 
         Returns:
             requests.Response: The response object from the GET request.
         """
-        return self.requester(method="GET", url=f"{self.base_url}{path}")
+        return self.requester(method="GET", url=f"{self.base_url}{path}", headers=headers, stream=stream)
 
     def post(self, path: str, body: dict[str, Any]) -> requests.Response:
         """
@@ -89,6 +414,40 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
         """
         return self.requester(method="POST", url=f"{self.base_url}{path}", json=body)
 
+    # pylint: disable=too-many-positional-arguments
+    def _cached_get(
+        self,
+        endpoint: str,
+        path: str,
+        parse: Callable[[requests.Response], Any],
+        variant: str = "",
+        stream: bool = False,
+    ) -> tuple[int, Any]:
+        """
+        Send a GET request through the metadata cache, if one is configured.
+
+        Args:
+            endpoint (str): The cache endpoint name, used to pick the time to live.
+            path (str): The API endpoint path, relative to the base URL.
+            parse (Callable[[requests.Response], Any]): Extracts the payload from a 200 response.
+            variant (str): Distinguishes payloads parsed differently from the same path.
+            stream (bool): If True, `parse` receives a streamed response whose body is read lazily.
+
+        Returns:
+            tuple[int, Any]: The status code and the parsed payload, None if the status code is not 200.
+        """
+
+        if self.cache is None:
+            with self.get(path, stream=stream) as response:
+                return response.status_code, parse(response) if response.status_code == 200 else None
+
+        return self.cache.get_or_fetch(
+            endpoint=endpoint,
+            key=f"{self.base_url}{path}#{variant}" if variant else f"{self.base_url}{path}",
+            fetch=lambda headers: self.get(path, headers=headers, stream=stream),
+            parse=parse,
+        )
+
     def get_spaces(self) -> list[dict[str, Any]] | None:
         """
         Retrieve the list of Kibana spaces.
@@ -101,16 +460,15 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
         """
 
         try:
-            response: requests.Response = self.space().all()
-            if response.status_code == 200:
-                spaces = response.json()
+            status_code, spaces = self._cached_get("spaces", "/api/spaces/space", lambda response: response.json())
+            if status_code == 200:
                 if self.logger:
                     self.logger.message("[kibapi.NotCertifiedKibana.get_spaces] - Connected to Kibana API")
                     self.logger.message("[kibapi.NotCertifiedKibana.get_spaces] - Available spaces:")
                     for space in spaces:
                         self.logger.message(f"- ID: {space['id']}, Name: {space['name']}")
                 return cast(list[dict[str, Any]] | None, spaces)
-            msg = f"[kibapi.NotCertifiedKibana.get_spaces] - Unexpected status code: {response.status_code}"
+            msg = f"[kibapi.NotCertifiedKibana.get_spaces] - Unexpected status code: {status_code}"
             if self.logger:
                 self.logger.error(msg)
             return None
@@ -132,10 +490,12 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
         """
 
         try:
-            response = self.get("/api/data_views")
-            if response.status_code == 200:
-                return cast(list[dict[str, Any]] | None, response.json().get("data_view", []))
-            msg = f"[kibapi.NotCertifiedKibana.get_dataviews] - Can't get data views - Code {response.status_code}"
+            status_code, data_views = self._cached_get(
+                "data_views", "/api/data_views", lambda response: response.json().get("data_view", [])
+            )
+            if status_code == 200:
+                return cast(list[dict[str, Any]] | None, data_views)
+            msg = f"[kibapi.NotCertifiedKibana.get_dataviews] - Can't get data views - Code {status_code}"
             if self.logger:
                 self.logger.error(msg)
             return None
@@ -145,13 +505,148 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
                 self.logger.error(msg)
             return None
 
-    def get_fields_list(self, space_id: str, data_view_id: str) -> list[dict[str, Any]] | None:
+    def space_exists(self, space_id: str) -> bool | None:
+        """
+        Check if a Kibana space exists, requesting only that space.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+
+        Returns:
+            bool | None: True if the space exists, False if it does not, None on error.
+        """
+
+        return self._object_exists("spaces", f"/api/spaces/space/{quote(space_id, safe='')}", "space_exists")
+
+    def data_view_exists(self, data_view_id: str, space_id: str | None = None) -> bool | None:
+        """
+        Check if a data view exists, requesting only that data view.
+
+        Args:
+            data_view_id (str): The ID of the data view.
+            space_id (str | None): The ID of the Kibana space owning the data view,
+                the default space if None.
+
+        Returns:
+            bool | None: True if the data view exists, False if it does not, None on error.
+        """
+
+        space_prefix = f"/s/{space_id}" if space_id else ""
+        path = f"{space_prefix}/api/data_views/data_view/{quote(data_view_id, safe='')}"
+        return self._object_exists("data_views", path, "data_view_exists")
+
+    def get_data_view(self, data_view_id: str, space_id: str | None = None) -> dict[str, Any] | None:
+        """
+        Retrieve a single data view, with its `timeFieldName` and `title`.
+
+        Args:
+            data_view_id (str): The ID of the data view.
+            space_id (str | None): The ID of the Kibana space owning the data view,
+                the default space if None.
+
+        Returns:
+            dict[str, Any] | None: The data view as a dictionary if successful, else None.
+        """
+
+        space_prefix = f"/s/{space_id}" if space_id else ""
+        path = f"{space_prefix}/api/data_views/data_view/{quote(data_view_id, safe='')}"
+
+        try:
+            status_code, data_view = self._cached_get(
+                "data_views", path, lambda response: response.json().get("data_view"), variant="data_view"
+            )
+            if status_code == 200 and isinstance(data_view, dict):
+                return data_view
+            msg = f"[kibapi.NotCertifiedKibana.get_data_view] - Can't get data view {data_view_id} - Code {status_code}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        except (requests.RequestException, ValueError) as e:
+            msg = f"[kibapi.NotCertifiedKibana.get_data_view] - Exception while getting data view {data_view_id}.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
+    def _object_exists(self, endpoint: str, path: str, caller: str) -> bool | None:
+        """
+        Check if the single-object endpoint at `path` answers with 200, caching positive answers.
+
+        Args:
+            endpoint (str): The cache endpoint name, used to pick the time to live.
+            path (str): The API endpoint path, relative to the base URL.
+            caller (str): Name of the public method, used in log messages.
+
+        Returns:
+            bool | None: True on 200, False on 404, None on error.
+        """
+
+        try:
+            status_code, _ = self._cached_get(endpoint, path, lambda _: True)
+            if status_code in (200, 404):
+                return status_code == 200
+            msg = f"[kibapi.NotCertifiedKibana.{caller}] - Unexpected status code: {status_code}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        except requests.RequestException as e:
+            msg = f"[kibapi.NotCertifiedKibana.{caller}] - Exception while checking {path}.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
+    def iter_dataviews(self, space_id: str | None = None, per_page: int = 100) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the data views page by page, using the saved objects `_find` API,
+        so the full list is never held in memory at once.
+
+        Args:
+            space_id (str | None): The ID of the Kibana space, the default space if None.
+            per_page (int): Number of data views requested per page.
+
+        Yields:
+            dict[str, Any]: Data views with their `id` and `title`.
+        """
+
+        space_prefix = f"/s/{space_id}" if space_id else ""
+        page = 1
+
+        while True:
+            path = (
+                f"{space_prefix}/api/saved_objects/_find?type=index-pattern"
+                f"&fields=title&per_page={per_page}&page={page}"
+            )
+            try:
+                response = self.get(path)
+            except requests.RequestException as e:
+                msg = f"[kibapi.NotCertifiedKibana.iter_dataviews] - Exception while getting dataviews.\n{e}"
+                if self.logger:
+                    self.logger.error(msg)
+                return
+
+            if response.status_code != 200:
+                msg = f"[kibapi.NotCertifiedKibana.iter_dataviews] - Unexpected status code: {response.status_code}"
+                if self.logger:
+                    self.logger.error(msg)
+                return
+
+            payload: dict[str, Any] = response.json()
+            saved_objects: list[dict[str, Any]] = payload.get("saved_objects", [])
+            for saved_object in saved_objects:
+                yield {"id": saved_object["id"], "title": saved_object.get("attributes", {}).get("title")}
+
+            if not saved_objects or page * per_page >= payload.get("total", 0):
+                return
+            page += 1
+
+    def get_fields_list(self, space_id: str, data_view_id: str, stream: bool = False) -> list[dict[str, Any]] | None:
         """
         Retrieve the list of fields for a specified space and data view.
 
         Args:
             space_id (str): The ID of the Kibana space.
             data_view_id (str): The ID or pattern of the data view.
+            stream (bool): If True, the response is parsed incrementally and only the
+                `DEFAULT_FIELD_ATTRIBUTES` of every field are kept.
             logger (Type[BaseLogger] | None): Optional logger for info and error messages.
 
         Returns:
@@ -160,19 +655,102 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
 
         try:
             url = f"/s/{space_id}/internal/data_views/fields?pattern={data_view_id}"
-            response = self.get(url)
-            if response.status_code == 200:
-                return cast(list[dict[str, Any]] | None, response.json().get("fields", []))
-            msg = f"[kibapi.NotCertifiedKibana.get_fields_list] - Unexpected status code: {response.status_code}"
+            if stream:
+                status_code, fields = self._cached_get(
+                    "fields",
+                    url,
+                    lambda response: list(iter_fields(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))),
+                    variant="stream",
+                    stream=True,
+                )
+            else:
+                status_code, fields = self._cached_get(
+                    "fields", url, lambda response: response.json().get("fields", [])
+                )
+            if status_code == 200:
+                return cast(list[dict[str, Any]] | None, fields)
+            msg = f"[kibapi.NotCertifiedKibana.get_fields_list] - Unexpected status code: {status_code}"
             if self.logger:
                 self.logger.error(msg)
             return None
-        except requests.RequestException as e:
+        # Streamed bodies that are not JSON raise a ValueError while parsed
+        except (requests.RequestException, ValueError) as e:
             msg = f"[kibapi.NotCertifiedKibana.get_fields_list] - Exception while getting fields list.\n{e}"
             if self.logger:
                 self.logger.error(msg)
             return None
 
+    def iter_fields_list(
+        self, space_id: str, data_view_id: str, attributes: Iterable[str] = DEFAULT_FIELD_ATTRIBUTES
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream the fields of a specified space and data view, parsing the response incrementally
+        and keeping only the given attributes of every field. Results are never cached.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID or pattern of the data view.
+            attributes (Iterable[str]): The attributes kept for every field.
+
+        Yields:
+            dict[str, Any]: The trimmed field dictionaries. Nothing is yielded on error.
+        """
+
+        try:
+            url = f"/s/{space_id}/internal/data_views/fields?pattern={data_view_id}"
+            with self.get(url, stream=True) as response:
+                if response.status_code != 200:
+                    msg = (
+                        f"[kibapi.NotCertifiedKibana.iter_fields_list] - Unexpected status code: {response.status_code}"
+                    )
+                    if self.logger:
+                        self.logger.error(msg)
+                    return
+
+                yield from iter_fields(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), attributes)
+        except (requests.RequestException, ValueError) as e:
+            msg = f"[kibapi.NotCertifiedKibana.iter_fields_list] - Exception while streaming fields list.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+
+    def get_fields_catalog(self, space_id: str, data_view_id: str) -> FieldCatalog | None:
+        """
+        Retrieve the fields of a specified space and data view as an indexed FieldCatalog.
+        The response is parsed incrementally straight into the catalog, which is built once
+        per fetch and cached as such when a cache is configured.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID or pattern of the data view.
+
+        Returns:
+            FieldCatalog | None: The fields catalog if successful, else None.
+        """
+
+        try:
+            url = f"/s/{space_id}/internal/data_views/fields?pattern={data_view_id}"
+            status_code, catalog = self._cached_get(
+                "fields",
+                url,
+                lambda response: FieldCatalog.from_fields(
+                    iter_fields(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+                ),
+                variant="catalog",
+                stream=True,
+            )
+            if status_code == 200:
+                return cast(FieldCatalog, catalog)
+            msg = f"[kibapi.NotCertifiedKibana.get_fields_catalog] - Unexpected status code: {status_code}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+        # Streamed bodies that are not JSON raise a ValueError while parsed
+        except (requests.RequestException, ValueError) as e:
+            msg = f"[kibapi.NotCertifiedKibana.get_fields_catalog] - Exception while getting fields list.\n{e}"
+            if self.logger:
+                self.logger.error(msg)
+            return None
+
     # pylint: disable=too-many-positional-arguments
     def get_field_possible_values(
         self,
@@ -181,6 +759,7 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
         field_dict: dict[str, Any],
         start_date: str | None = None,
         end_date: str | None = None,
+        time_field: str = DEFAULT_TIME_FIELD,
     ) -> list[Any]:
         """
         Retrieve suggested possible values for a given field within a space and data view,
@@ -192,6 +771,7 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
             field_dict (dict[str, Any]): Dictionary describing the field (name, type, etc.).
             start_date (str | None): ISO 8601 formatted start date for filtering (inclusive).
             end_date (str | None): ISO 8601 formatted end date for filtering (inclusive).
+            time_field (str): The field the date range applies to, the `timeFieldName` of the data view.
             logger (Type[BaseLogger] | None): Optional logger for info and error messages.
 
         Returns:
@@ -201,48 +781,14 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
         if not field_dict:
             return []
 
-        request_body: dict[str, Any] = {
-            "query": "",
-            "field": field_dict["name"],
-            "fieldMeta": {
-                "count": 1,
-                "name": field_dict["name"],
-                "type": field_dict["type"],
-                "esTypes": field_dict["esTypes"],
-                "scripted": False,
-                "searchable": field_dict["searchable"],
-                "aggregatable": field_dict["aggregatable"],
-                "readFromDocValues": field_dict["readFromDocValues"],
-                "shortDotsEnable": False,
-                "isMapped": True,
-            },
-            "filters": (
-                [
-                    {
-                        "range": {
-                            "@timestamp": {
-                                "format": "strict_date_optional_time",
-                                "gte": start_date,
-                                "lte": end_date,
-                            }
-                        }
-                    }
-                ]
-                if start_date and end_date
-                else []
-            ),
-            "method": "terms_enum",
-        }
-
         try:
-            api_url = f"/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
-            response = self.post(path=api_url, body=request_body)
-            if response.status_code == 200:
-                return cast(list[Any], response.json())
-
+            return self._fetch_field_possible_values(
+                space_id, data_view_id, field_dict, start_date, end_date, time_field
+            )
+        except requests.HTTPError as e:
             msg = (
                 "[kibapi.NotCertifiedKibana.get_field_possible_values] - "
-                f"Unexpected status code: {response.status_code}"
+                f"Unexpected status code: {e.response.status_code if e.response is not None else None}"
             )
             if self.logger:
                 self.logger.error(msg)
@@ -255,3 +801,100 @@ class NotCertifiedKibana(Kibana):  # type: ignore[misc]
             if self.logger:
                 self.logger.error(msg)
             return []
+
+    # pylint: disable=too-many-positional-arguments
+    def _fetch_field_possible_values(
+        self,
+        space_id: str,
+        data_view_id: str,
+        field_dict: dict[str, Any],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        time_field: str = DEFAULT_TIME_FIELD,
+    ) -> list[Any]:
+        """
+        Request the suggested possible values of a field, raising on any failure.
+
+        Raises:
+            requests.HTTPError: If Kibana answers with an unexpected status code.
+            requests.RequestException: If the request itself fails.
+        """
+
+        request_body: dict[str, Any] = build_suggestions_request_body(field_dict, start_date, end_date, time_field)
+
+        api_url = f"/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
+        response = self.post(path=api_url, body=request_body)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"Unexpected status code: {response.status_code}", response=response)
+
+        return cast(list[Any], response.json())
+
+    # pylint: disable=too-many-positional-arguments
+    def get_field_possible_values_many(
+        self,
+        space_id: str,
+        data_view_id: str,
+        field_dicts: list[dict[str, Any]],
+        start_date: str | None = None,
+        end_date: str | None = None,
+        max_workers: int = 8,
+        time_field: str = DEFAULT_TIME_FIELD,
+    ) -> dict[str, list[Any] | Exception]:
+        """
+        Retrieve the suggested possible values of many fields in parallel, using a thread pool
+        that shares the pooled session connections.
+
+        A failing field never aborts the batch: its exception is stored in place of its values.
+
+        Args:
+            space_id (str): The ID of the Kibana space.
+            data_view_id (str): The ID of the data view.
+            field_dicts (list[dict[str, Any]]): Dictionaries describing the fields (name, type, etc.).
+            start_date (str | None): ISO 8601 formatted start date for filtering (inclusive).
+            end_date (str | None): ISO 8601 formatted end date for filtering (inclusive).
+            max_workers (int): Maximum number of requests in flight at the same time.
+            time_field (str): The field the date range applies to, the `timeFieldName` of the data view.
+
+        Returns:
+            dict[str, list[Any] | Exception]: The suggested values of every field, or the exception
+                raised while fetching them, keyed by field name.
+        """
+
+        field_dicts = [field_dict for field_dict in field_dicts if field_dict]
+        results: dict[str, list[Any] | Exception] = {}
+        if not field_dicts:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(field_dicts)))) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_field_possible_values,
+                    space_id,
+                    data_view_id,
+                    field_dict,
+                    start_date,
+                    end_date,
+                    time_field,
+                ): field_dict["name"]
+                for field_dict in field_dicts
+            }
+
+            for future, field_name in futures.items():
+                try:
+                    results[field_name] = future.result()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    msg = (
+                        "[kibapi.NotCertifiedKibana.get_field_possible_values_many] - "
+                        f"Exception while getting possible values of {field_name}.\n{e}"
+                    )
+                    if self.logger:
+                        self.logger.error(msg)
+                    results[field_name] = e
+
+        return results
+
+
+def _close_response(future: "Future[requests.Response]") -> None:
+    """Close the response of a request that lost a hedging race."""
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,116 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+
+# Request timeout, in seconds, per endpoint template (see `kibapi.metrics.endpoint_template`)
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    "/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}": 5,
+    "/s/{space_id}/internal/data_views/fields": 30,
+}
+
+# Timeout of the endpoints without an explicit one
+DEFAULT_TIMEOUT: float = 10
+
+# Endpoints that are safe to send twice even if their method is not (e.g. read-only POST)
+IDEMPOTENT_ENDPOINTS: frozenset[str] = frozenset({"/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"})
+
+IDEMPOTENT_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries of idempotent requests, with exponential backoff and full jitter.
+
+    Attributes:
+        max_retries (int): Retries after the first attempt, 0 to disable them.
+        base_delay (float): Backoff of the first retry, in seconds, doubled on every retry.
+        max_delay (float): Upper bound of the backoff, in seconds.
+        retry_statuses (frozenset[int]): Status codes that are retried, like connection errors and timeouts.
+    """
+
+    max_retries: int = 2
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+
+    def backoff(self, retry: int) -> float:
+        """Returns a random delay, in seconds, before the given retry (starting from 0)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by the requests of a client.
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts or 5xx responses)
+    the circuit opens and requests fail fast with `CircuitOpenError`. After `reset_timeout`
+    seconds a single trial request is let through: the circuit closes if it succeeds and
+    opens again otherwise. A trial with no outcome recorded within `reset_timeout` seconds
+    is abandoned, and another one is let through.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30) -> None:
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a trial request.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+
+    @property
+    def state(self) -> str:
+        """The current state: closed, open or half_open."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Returns True if a request can be sent, reserving the trial request when half open."""
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (self._state == self.OPEN and now - self._opened_at >= self.reset_timeout) or (
+                self._state == self.HALF_OPEN and now - self._trial_started_at >= self.reset_timeout
+            ):
+                self._state = self.HALF_OPEN
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold or after a failed trial."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,125 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+# Attributes of `/internal/data_views/fields` entries that are kept by default when streaming
+DEFAULT_FIELD_ATTRIBUTES: tuple[str, ...] = (
+    "name",
+    "type",
+    "esTypes",
+    "searchable",
+    "aggregatable",
+    "readFromDocValues",
+    "subType",
+)
+
+# Consumed characters are dropped from the buffer once there are more than this many
+_COMPACT_THRESHOLD = 1 << 16
+
+_WHITESPACE_AND_COMMAS = re.compile(r"[\s,]*")
+_DELIMITERS = frozenset(" \t\r\n,]")
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Incrementally parse the array stored under `key` in a JSON object received in chunks,
+    yielding its items one at a time instead of materializing the whole document.
+
+    Only the first occurrence of `"key": [` is considered, so `key` must be a top-level key
+    appearing before any nested object containing the same key.
+
+    Args:
+        chunks (Iterable[bytes]): The UTF-8 encoded document, in chunks of any size.
+        key (str): The key of the array to iterate.
+
+    Yields:
+        Any: The decoded items of the array.
+
+    Raises:
+        ValueError: If the document ends before the array is complete, or is not valid JSON.
+    """
+
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    array_start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+
+    chunk_iterator = iter(chunks)
+    buffer = ""
+    position = 0
+    exhausted = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, exhausted
+        if exhausted:
+            return False
+        try:
+            chunk = next(chunk_iterator)
+        except StopIteration:
+            exhausted = True
+            buffer += utf8_decoder.decode(b"", final=True)
+            return False
+
+        if position > _COMPACT_THRESHOLD:
+            buffer = buffer[position:]
+            position = 0
+        buffer += utf8_decoder.decode(chunk)
+        return True
+
+    # Look for the beginning of the array
+    while True:
+        match = array_start.search(buffer, position)
+        if match:
+            position = match.end()
+            break
+        # Keep a tail long enough to match a key split between two chunks
+        position = max(position, len(buffer) - len(key) - 64)
+        if not read_more():
+            raise ValueError(f"Key {key!r} with an array value not found in the JSON document")
+
+    while True:
+        position = _WHITESPACE_AND_COMMAS.match(buffer, position).end()  # type: ignore[union-attr]
+
+        if position >= len(buffer):
+            if not read_more():
+                raise ValueError(f"Unexpected end of the JSON document inside {key!r}")
+            continue
+
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # The item is probably truncated at the end of the buffer, read more and retry
+            if not read_more():
+                raise ValueError(f"Invalid JSON document inside {key!r}.\n{e}") from e
+            continue
+
+        # A number not followed by a delimiter yet could continue in the next chunk
+        if isinstance(item, (int, float)) and not exhausted and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+            read_more()
+            continue
+
+        position = end
+        yield item
+
+
+def iter_fields(
+    chunks: Iterable[bytes], attributes: Iterable[str] = DEFAULT_FIELD_ATTRIBUTES
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream the fields of a `/internal/data_views/fields` response body, keeping only
+    the whitelisted attributes of every field.
+
+    Args:
+        chunks (Iterable[bytes]): The response body, in chunks of any size.
+        attributes (Iterable[str]): The attributes kept for every field.
+
+    Yields:
+        dict[str, Any]: The trimmed field dictionaries.
+    """
+
+    kept = tuple(attributes)
+    for field in iter_json_array(chunks, "fields"):
+        yield {attribute: field[attribute] for attribute in kept if attribute in field}
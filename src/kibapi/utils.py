@@ -1,8 +1,13 @@
 from collections import defaultdict
 from typing import Any
 
+from .field_catalog import FieldCatalog
 
-def group_fields(fields: list[dict[str, Any]]) -> list[list[str]]:
+# Field the date ranges of the suggestions apply to, unless the data view has another `timeFieldName`
+DEFAULT_TIME_FIELD = "@timestamp"
+
+
+def group_fields(fields: list[dict[str, Any]] | FieldCatalog) -> list[list[str]]:
     """Groups fields with their keyword subfields
     [[
         "stream",
@@ -12,7 +17,12 @@ def group_fields(fields: list[dict[str, Any]]) -> list[list[str]]:
         "tags",
         "tags.keyword"
     ]]
+
+    A FieldCatalog already holds its groups, so they are returned without regrouping.
     """
+    if isinstance(fields, FieldCatalog):
+        return fields.groups
+
     groups_dict: dict[str, list[str]] = defaultdict(list)
 
     for field in fields:
@@ -43,9 +53,66 @@ def group_fields(fields: list[dict[str, Any]]) -> list[list[str]]:
     return result
 
 
-def get_field_properties(fields: list[dict[str, Any]], target_field: str) -> dict[str, Any]:
-    """Returns the properties of a field given its name from a list of field definitions."""
+def get_field_properties(fields: list[dict[str, Any]] | FieldCatalog, target_field: str) -> dict[str, Any]:
+    """Returns the properties of a field given its name from a list of field definitions or a FieldCatalog."""
+    if isinstance(fields, FieldCatalog):
+        record = fields.get(target_field)
+        return record.to_dict() if record else {}
+
     try:
         return next((d for d in fields if d.get("name") == target_field))
     except StopIteration:
         return {}
+
+
+def build_suggestions_request_body(
+    field_dict: dict[str, Any],
+    start_date: str | None = None,
+    end_date: str | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> dict[str, Any]:
+    """
+    Builds the body of a Kibana suggestions request for the given field.
+
+    Args:
+        field_dict (dict[str, Any]): Dictionary describing the field (name, type, etc.).
+        start_date (str | None): ISO 8601 formatted start date for filtering (inclusive).
+        end_date (str | None): ISO 8601 formatted end date for filtering (inclusive).
+        time_field (str): The field the date range applies to, the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, Any]: The JSON body for `/internal/kibana/suggestions/values/{data_view_id}`.
+    """
+
+    return {
+        "query": "",
+        "field": field_dict["name"],
+        "fieldMeta": {
+            "count": 1,
+            "name": field_dict["name"],
+            "type": field_dict["type"],
+            "esTypes": field_dict["esTypes"],
+            "scripted": False,
+            "searchable": field_dict["searchable"],
+            "aggregatable": field_dict["aggregatable"],
+            "readFromDocValues": field_dict["readFromDocValues"],
+            "shortDotsEnable": False,
+            "isMapped": True,
+        },
+        "filters": (
+            [
+                {
+                    "range": {
+                        time_field: {
+                            "format": "strict_date_optional_time",
+                            "gte": start_date,
+                            "lte": end_date,
+                        }
+                    }
+                }
+            ]
+            if start_date and end_date
+            else []
+        ),
+        "method": "terms_enum",
+    }
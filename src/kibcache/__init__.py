@@ -0,0 +1,3 @@
+from .warm_cache import WarmCache, WarmCacheKey
+
+__all__ = ["WarmCache", "WarmCacheKey"]
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Iterable, NamedTuple, Type
+
+from kiblog import BaseLogger
+
+
+class WarmCacheKey(NamedTuple):
+    """
+    Key of a warm cache entry. Unused parts (e.g. `field` for a fields list) are empty strings.
+
+    Attributes:
+        kibana_url (str): The Kibana base URL.
+        space_id (str): The ID of the Kibana space.
+        data_view_id (str): The ID of the data view.
+        field (str): The field name.
+        window (str): The time window the entry was computed on, e.g. "2025-06-01/2025-06-10",
+            or a lookback refreshed in place, e.g. "P7D".
+    """
+
+    kibana_url: str
+    space_id: str
+    data_view_id: str
+    field: str = ""
+    window: str = ""
+
+
+class WarmCache:
+    """
+    Persistent SQLite store for field metadata and discovered field values, so a restarted
+    process can serve warm data immediately and refresh it in the background.
+
+    Values are stored as zlib-compressed JSON. The database carries a schema version and a
+    caller-provided fingerprint (e.g. a hash of the main fields configuration): when either
+    changes, every entry is dropped.
+    """
+
+    # Bumped when the stored values change format, e.g. 2 persists discovered values instead of tries
+    SCHEMA_VERSION = 2
+
+    # Kinds of the stored values
+    FIELDS = "fields"
+    VALUES = "values"
+    DISCOVERY = "discovery"
+
+    def __init__(self, path: str, fingerprint: str = "", logger: Type[BaseLogger] | None = None) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Path of the SQLite database file, ":memory:" for a volatile cache.
+            fingerprint (str): Invalidates every entry when it differs from the stored one.
+            logger (Type[BaseLogger] | None): Optional logger for info and error messages.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._initialize()
+
+    @staticmethod
+    def make_fingerprint(*parts: Any) -> str:
+        """Returns a short stable hash of the given JSON-serializable parts."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+    def _initialize(self) -> None:
+        """Create the tables and drop stale entries on schema or fingerprint changes."""
+
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "kind TEXT NOT NULL, kibana_url TEXT NOT NULL, space_id TEXT NOT NULL, "
+                "data_view_id TEXT NOT NULL, field TEXT NOT NULL, window TEXT NOT NULL, "
+                "value BLOB NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (kind, kibana_url, space_id, data_view_id, field, window))"
+            )
+
+            stored = dict(self._connection.execute("SELECT key, value FROM meta").fetchall())
+            expected = {"schema_version": str(self.SCHEMA_VERSION), "fingerprint": self.fingerprint}
+
+            if stored != expected:
+                if stored and self.logger:
+                    self.logger.message("[kibcache.WarmCache] - Version or fingerprint changed, dropping entries")
+                self._connection.execute("DELETE FROM entries")
+                self._connection.execute("DELETE FROM meta")
+                self._connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", expected.items())
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def get(self, kind: str, key: WarmCacheKey, max_age: float | None = None) -> Any | None:
+        """
+        Returns a cached value.
+
+        Args:
+            kind (str): The kind of value, e.g. "fields", "values" or "discovery".
+            key (WarmCacheKey): The entry key.
+            max_age (float | None): If given, entries older than this many seconds are ignored.
+
+        Returns:
+            Any | None: The cached value, None if missing, too old or unreadable.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, updated_at FROM entries WHERE kind = ? AND kibana_url = ? AND space_id = ? "
+                "AND data_view_id = ? AND field = ? AND window = ?",
+                (kind, *key),
+            ).fetchone()
+
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+
+        try:
+            return json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError) as e:
+            if self.logger:
+                self.logger.error(f"[kibcache.WarmCache.get] - Unreadable entry {kind} {key}.\n{e}")
+            return None
+
+    def updated_at(self, kind: str, key: WarmCacheKey) -> float | None:
+        """
+        Returns when an entry was last stored.
+
+        Args:
+            kind (str): The kind of value, e.g. "fields", "values" or "discovery".
+            key (WarmCacheKey): The entry key.
+
+        Returns:
+            float | None: The UNIX time of the last `set`, None if the entry is missing.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated_at FROM entries WHERE kind = ? AND kibana_url = ? AND space_id = ? "
+                "AND data_view_id = ? AND field = ? AND window = ?",
+                (kind, *key),
+            ).fetchone()
+        return None if row is None else float(row[0])
+
+    def set(self, kind: str, key: WarmCacheKey, value: Any) -> None:
+        """
+        Store a value, replacing any previous one.
+
+        Args:
+            kind (str): The kind of value, e.g. "fields", "values" or "discovery".
+            key (WarmCacheKey): The entry key.
+            value (Any): A JSON-serializable value.
+        """
+
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(kind, kibana_url, space_id, data_view_id, field, window, value, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, *key, blob, time.time()),
+            )
+
+    def prune(self, kind: str, max_age: float, keep_windows: Iterable[str] = ("",)) -> int:
+        """
+        Drop the entries of a kind stored more than max_age seconds ago, e.g. the values of
+        time windows that can't be requested anymore.
+
+        Args:
+            kind (str): The kind of value, e.g. "fields", "values" or "discovery".
+            max_age (float): Entries older than this many seconds are dropped.
+            keep_windows (Iterable[str]): Windows whose entries are kept whatever their age,
+                by default the entries with no window.
+
+        Returns:
+            int: The number of dropped entries.
+        """
+
+        keep = list(keep_windows)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM entries WHERE kind = ? AND updated_at < ? "
+                f"AND window NOT IN ({', '.join('?' * len(keep))})",
+                (kind, time.time() - max_age, *keep),
+            )
+        return cursor.rowcount
+
+    def delete(self, kind: str | None = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            kind (str | None): If given, only entries of this kind are dropped.
+        """
+
+        with self._lock, self._connection:
+            if kind is None:
+                self._connection.execute("DELETE FROM entries")
+            else:
+                self._connection.execute("DELETE FROM entries WHERE kind = ?", (kind,))
@@ -1,3 +1,57 @@
-from .fields import get_initial_part_of_fields
+from .async_fields import (
+    async_get_initial_part_of_fields,
+    async_get_initial_part_of_fields_many,
+    async_iter_field_value_pages,
+)
+from .braces import compress_values, expand_braces, render_braces
+from .fields import (
+    DEFAULT_TIME_FIELD,
+    get_initial_part_of_fields,
+    get_initial_part_of_fields_many,
+    iter_field_value_pages,
+    iter_field_value_pages_many,
+)
+from .incremental import get_initial_part_of_fields_incremental
+from .patterns import (
+    DEFAULT_PATTERN_RULES,
+    PatternRule,
+    ValuePatterns,
+    compact_field_values,
+    compile_rules,
+    normalize_values,
+)
+from .store import ValueStore
+from .strategy import DiscoveryStrategy, FieldValuesDiscovery, discover_field_values, discover_field_values_many
+from .summaries import SUMMARIZED_TYPES, FieldSummary, summarize_fields
+from .trie import FieldValueTrie, group_field_values
 
-__all__ = ["get_initial_part_of_fields"]
+__all__ = [
+    "DEFAULT_PATTERN_RULES",
+    "DEFAULT_TIME_FIELD",
+    "DiscoveryStrategy",
+    "FieldSummary",
+    "FieldValueTrie",
+    "FieldValuesDiscovery",
+    "PatternRule",
+    "SUMMARIZED_TYPES",
+    "ValuePatterns",
+    "ValueStore",
+    "async_get_initial_part_of_fields",
+    "async_get_initial_part_of_fields_many",
+    "async_iter_field_value_pages",
+    "compact_field_values",
+    "compile_rules",
+    "compress_values",
+    "discover_field_values",
+    "discover_field_values_many",
+    "expand_braces",
+    "get_initial_part_of_fields",
+    "get_initial_part_of_fields_incremental",
+    "get_initial_part_of_fields_many",
+    "group_field_values",
+    "iter_field_value_pages",
+    "iter_field_value_pages_many",
+    "normalize_values",
+    "render_braces",
+    "summarize_fields",
+]
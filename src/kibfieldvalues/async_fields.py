@@ -0,0 +1,193 @@
+# The async discovery intentionally mirrors the sync functions of fields.py
+# pylint: disable=duplicate-code
+import asyncio
+import time
+from typing import Any, AsyncIterator
+
+from elasticsearch import AsyncElasticsearch
+
+from .fields import (
+    COMPOSITE_FILTER_PATH,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_TARGET_PAGE_TIME,
+    DEFAULT_TIME_FIELD,
+    MAX_PAGE_SIZE,
+    MIN_PAGE_SIZE,
+    build_values_query,
+    composite_aggregation,
+    composite_page,
+    discovery_search_params,
+    next_page_size,
+)
+from .trie import FieldValueTrie
+
+
+async def async_discovery_search(
+    client: AsyncElasticsearch, index_name: str, body: dict[str, Any], filter_path: str | list[str]
+) -> dict[str, Any]:
+    """
+    Asyncio counterpart of `discovery_search`, with the same cache friendly search parameters.
+
+    Args:
+        client (AsyncElasticsearch): An instance of the async Elasticsearch client.
+        index_name (str): The index or index pattern to search.
+        body (dict[str, Any]): The search body, with `"size": 0`.
+        filter_path (str | list[str]): The response paths kept, e.g. "aggregations.*.buckets.key".
+
+    Returns:
+        dict[str, Any]: The aggregations of the response, missing aggregations and keys mean empty results.
+    """
+
+    response: Any = await client.search(index=index_name, body=body, **discovery_search_params(filter_path))
+    return response["aggregations"] if "aggregations" in response else {}
+
+
+# pylint: disable=too-many-positional-arguments
+async def async_iter_field_value_pages(
+    client: AsyncElasticsearch,
+    keyword_name: str,
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    target_page_time: float | None = DEFAULT_TARGET_PAGE_TIME,
+    min_page_size: int = MIN_PAGE_SIZE,
+    max_page_size: int = MAX_PAGE_SIZE,
+    query: dict[str, Any] | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> AsyncIterator[list[str]]:
+    """
+    Asyncio counterpart of `iter_field_value_pages`: yields the distinct values of a keyword field
+    page by page, with the same requests and adaptive page size.
+
+    Args:
+        client (AsyncElasticsearch): An instance of the async Elasticsearch client.
+        keyword_name (str): The name of the keyword field to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values requested in the first page.
+        target_page_time (float | None): Response time, in seconds, the page size is tuned to.
+            None for a fixed page size.
+        min_page_size (int): Lower bound of the adaptive page size.
+        max_page_size (int): Upper bound of the adaptive page size.
+        query (dict[str, Any] | None): Query restricting the documents, overriding start_date and end_date.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Yields:
+        list[str]: The values of every page, in the composite aggregation order.
+    """
+
+    if query is None:
+        query = build_values_query(start_date, end_date, time_field)
+    after_key: Any = None
+
+    while True:
+        request_body: dict[str, Any] = {
+            "size": 0,
+            "query": query,
+            "aggs": {"result_values": composite_aggregation(keyword_name, page_size, after_key)},
+        }
+
+        start_time = time.perf_counter()
+        aggregations = await async_discovery_search(client, index_name, request_body, COMPOSITE_FILTER_PATH)
+        elapsed = time.perf_counter() - start_time
+
+        page, after_key = composite_page(aggregations.get("result_values", {}))
+        yield page
+
+        if not after_key:
+            break
+        if target_page_time is not None:
+            page_size = next_page_size(page_size, elapsed, target_page_time, min_page_size, max_page_size)
+
+
+# pylint: disable=too-many-positional-arguments
+async def async_get_initial_part_of_fields(
+    client: AsyncElasticsearch,
+    keyword_name: str,
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    target_page_time: float | None = DEFAULT_TARGET_PAGE_TIME,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> list[str]:
+    """
+    Asyncio counterpart of `get_initial_part_of_fields`, paginating the composite aggregation
+    without blocking the event loop.
+
+    Args:
+        client (AsyncElasticsearch): An instance of the async Elasticsearch client.
+        keyword_name (str): The name of the keyword field to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values of the first composite page.
+        target_page_time (float | None): Response time, in seconds, the page size is tuned to.
+            None for a fixed page size.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        list[str]: The same list as `get_initial_part_of_fields`.
+    """
+
+    field_values = FieldValueTrie()
+    async for page in async_iter_field_value_pages(
+        client,
+        keyword_name,
+        index_name,
+        start_date,
+        end_date,
+        page_size,
+        target_page_time=target_page_time,
+        time_field=time_field,
+    ):
+        field_values.update(page)
+
+    return sorted(field_values.flatten())
+
+
+# pylint: disable=too-many-positional-arguments
+async def async_get_initial_part_of_fields_many(
+    client: AsyncElasticsearch,
+    keyword_names: list[str],
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    target_page_time: float | None = DEFAULT_TARGET_PAGE_TIME,
+    max_concurrency: int | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> dict[str, list[str]]:
+    """
+    Discovers the values of several keyword fields concurrently from one event loop: every field
+    is paginated on its own, so a field with many pages does not hold back the others.
+
+    Args:
+        client (AsyncElasticsearch): An instance of the async Elasticsearch client.
+        keyword_names (list[str]): The names of the keyword fields to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values of the first composite page of every field.
+        target_page_time (float | None): Response time, in seconds, the page size is tuned to.
+            None for a fixed page size.
+        max_concurrency (int | None): Maximum number of fields paginated at the same time, all if None.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, list[str]]: The same list as `get_initial_part_of_fields` for every field.
+    """
+
+    keyword_names = list(dict.fromkeys(keyword_names))
+    semaphore = asyncio.Semaphore(max_concurrency or max(1, len(keyword_names)))
+
+    async def discover(keyword_name: str) -> list[str]:
+        async with semaphore:
+            return await async_get_initial_part_of_fields(
+                client, keyword_name, index_name, start_date, end_date, page_size, target_page_time, time_field
+            )
+
+    results = await asyncio.gather(*(discover(keyword_name) for keyword_name in keyword_names))
+    return dict(zip(keyword_names, results))
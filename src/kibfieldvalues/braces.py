@@ -0,0 +1,178 @@
+from typing import Any, Iterable
+
+from .tags import FieldGroupTree, FieldsTag
+from .trie import SEPARATOR
+
+# Characters with a meaning in the brace form, escaped with a backslash inside values
+_SPECIAL = "\\{},"
+
+
+class _BraceNode:
+    """A component of the rendered values: whether a value ends here, and the next components."""
+
+    __slots__ = ("terminal", "children")
+
+    def __init__(self) -> None:
+        self.terminal = False
+        self.children: dict[str, _BraceNode] = {}
+
+
+def _escape(text: str) -> str:
+    """Escapes the brace form special characters of a component."""
+
+    if not any(char in _SPECIAL for char in text):
+        return text
+    return "".join(f"\\{char}" if char in _SPECIAL else char for char in text)
+
+
+def _group(alternatives: list[str]) -> str:
+    """Returns the alternatives as a brace group, or as is when there is only one."""
+    return alternatives[0] if len(alternatives) == 1 else "{" + ",".join(alternatives) + "}"
+
+
+def _top_level(alternatives: list[str]) -> str:
+    """Joins the top level alternatives, in a brace group when one of them is the empty value,
+    so that [""] is written "{}" and ["", "a"] "{,a}" instead of "" and ",a"."""
+
+    if "" in alternatives:
+        return "{" + ",".join(alternatives) + "}"
+    return ",".join(alternatives)
+
+
+def _render(key: str, node: _BraceNode, empty_prefix: bool = False) -> str:
+    """
+    Renders a component and every value below it, e.g. "payments-{api,worker-{eu,us}}".
+    With empty_prefix, the components before this one are all empty and, like in `flatten_dict`,
+    no separator is written after this one if it is empty too.
+    """
+
+    empty_prefix = empty_prefix and not key
+    separator = "" if empty_prefix else SEPARATOR
+    key = _escape(key)
+    children = [_render(child_key, child, empty_prefix) for child_key, child in node.children.items()]
+    if not children:
+        return key
+    if not node.terminal:
+        return f"{key}{separator}{_group(children)}"
+    # A value ends here and others continue, the empty alternative stands for the former
+    return key + "{," + ",".join(separator + child for child in children) + "}"
+
+
+def _from_tree(tree: Any, node: _BraceNode) -> None:
+    """Fills a node from a `FieldGroupTree` with `FieldsTag.END` leaves."""
+
+    for key, value in tree.items():
+        child = node.children.setdefault(key, _BraceNode())
+        if isinstance(value, dict):
+            _from_tree(value, child)
+        elif value == FieldsTag.END:
+            child.terminal = True
+
+
+def render_braces(tree: FieldGroupTree | FieldsTag) -> str:
+    """
+    Renders a grouping tree in a compact brace form, where shared prefixes are written once:
+    {"payments": {"api": END, "worker": {"eu": END, "us": END}}} becomes "payments-{api,worker-{eu,us}}".
+
+    Args:
+        tree (FieldGroupTree | FieldsTag): The tree, e.g. from `FieldValueTrie.tree`.
+
+    Returns:
+        str: The brace form, expanded back to `flatten_dict(tree)` by `expand_braces`.
+    """
+
+    root = _BraceNode()
+    if isinstance(tree, dict):
+        _from_tree(tree, root)
+    return _top_level([_render(key, child, empty_prefix=True) for key, child in root.children.items()])
+
+
+def compress_values(values: Iterable[str]) -> str:
+    """
+    Renders values in the brace form, sharing their common `-` separated prefixes.
+
+    Args:
+        values (Iterable[str]): The values, e.g. the grouped prefixes of `get_initial_part_of_fields`.
+
+    Returns:
+        str: The brace form, expanded back to the distinct values by `expand_braces`.
+    """
+
+    root = _BraceNode()
+    for value in values:
+        node = root
+        for part in value.split(SEPARATOR):
+            node = node.children.setdefault(part, _BraceNode())
+        node.terminal = True
+    return _top_level([_render(key, child) for key, child in root.children.items()])
+
+
+class _BraceParser:
+    """Recursive descent parser of the brace form."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.position = 0
+
+    def alternatives(self) -> list[str]:
+        """Parses comma separated sequences, up to a closing brace or the end."""
+
+        values = self.sequence()
+        while self.position < len(self.text) and self.text[self.position] == ",":
+            self.position += 1
+            values.extend(self.sequence())
+        return values
+
+    def sequence(self) -> list[str]:
+        """Parses literals and brace groups, up to a comma, a closing brace or the end."""
+
+        values = [""]
+        literal: list[str] = []
+        text = self.text
+
+        while self.position < len(text) and text[self.position] not in ",}":
+            char = text[self.position]
+            if char == "\\" and self.position + 1 < len(text):
+                literal.append(text[self.position + 1])
+                self.position += 2
+                continue
+            if char != "{":
+                literal.append(char)
+                self.position += 1
+                continue
+
+            prefix = "".join(literal)
+            literal = []
+            self.position += 1
+            group = self.alternatives()
+            if self.position >= len(text) or text[self.position] != "}":
+                raise ValueError(f"Unclosed brace group in {text!r}")
+            self.position += 1
+            values = [value + prefix + alternative for value in values for alternative in group]
+
+        suffix = "".join(literal)
+        return [value + suffix for value in values] if suffix else values
+
+
+def expand_braces(text: str) -> list[str]:
+    """
+    Expands the brace form of `render_braces` or `compress_values` back to the full values.
+
+    Args:
+        text (str): The brace form, e.g. "payments-{api,worker-{eu,us}}".
+
+    Returns:
+        list[str]: The values, e.g. ["payments-api", "payments-worker-eu", "payments-worker-us"].
+
+    Raises:
+        ValueError: If the braces are unbalanced.
+    """
+
+    if not text:
+        return []
+
+    parser = _BraceParser(text)
+    values = parser.alternatives()
+    if parser.position != len(text):
+        raise ValueError(f"Unexpected closing brace at {parser.position} in {text!r}")
+    return values
@@ -1,23 +1,37 @@
+import math
+import time
 from collections import defaultdict
-from enum import Enum, auto
-from typing import Any, TypeAlias
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterator
 
 from elasticsearch import Elasticsearch
 
+from .tags import FieldGroupTree, FieldsTag
+from .trie import FieldValueTrie
 
-class FieldsTag(Enum):
-    """
-    Enum to indicate the end of a branch in the recursive fields dictionary.
+# Number of values requested per composite aggregation page or terms partition
+DEFAULT_PAGE_SIZE = 10000
 
-    Attributes:
-        END: Marks the end of a branch in the field structure.
-    """
+# Bounds of the adaptive composite page size, the upper one is the default `search.max_buckets`
+MIN_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 65536
+
+# Field the date ranges apply to, unless the data view has another `timeFieldName`
+DEFAULT_TIME_FIELD = "@timestamp"
 
-    END = auto()
+# Response time, in seconds, the adaptive composite page size is tuned to
+DEFAULT_TARGET_PAGE_TIME = 1.0
 
+# Partitions too large for a page are split, up to this many partitions
+MAX_PARTITIONS = 1 << 16
 
-# Typing for the recursive function
-FieldGroupTree: TypeAlias = dict[str, "FieldGroupTree"] | list[str] | None
+# Session preference of the discovery searches: repeated discoveries are routed to the same
+# shard copies, whose request caches are already warm
+DISCOVERY_PREFERENCE = "kibfieldvalues"
+
+# Only the bucket keys (and what pagination needs) are transferred
+COMPOSITE_FILTER_PATH = ["aggregations.*.buckets.key", "aggregations.*.after_key"]
+TERMS_FILTER_PATH = ["aggregations.*.buckets.key", "aggregations.*.sum_other_doc_count"]
 
 
 def recursive_field_group(elements: set[str] | list[str], level: int = 0) -> FieldGroupTree:
@@ -125,83 +139,402 @@ def flatten_dict(keys_dict: dict[str, Any], prefix: str = "") -> list[str]:
     return return_list
 
 
-def get_initial_part_of_fields(
+def build_values_query(
+    start_date: str | None = None, end_date: str | None = None, time_field: str = DEFAULT_TIME_FIELD
+) -> dict[str, Any]:
+    """
+    Returns the query of the field values searches, restricted to the time range if both bounds are given.
+
+    Args:
+        start_date (str | None): Lower bound of the time field, in a `strict_date_optional_time` format.
+        end_date (str | None): Upper bound of the time field, in a `strict_date_optional_time` format.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, Any]: The Elasticsearch query.
+    """
+
+    if not (start_date and end_date):
+        return {"match_all": {}}
+
+    return {
+        "bool": {
+            "filter": [
+                # pylint: disable=duplicate-code
+                {
+                    "range": {
+                        time_field: {
+                            "format": "strict_date_optional_time",
+                            "gte": start_date,
+                            "lte": end_date,
+                        }
+                    }
+                }
+            ]
+        }
+    }
+
+
+def discovery_search_params(filter_path: str | list[str]) -> dict[str, Any]:
+    """Returns the search parameters of `discovery_search`, shared with the async client."""
+    return {
+        "request_cache": True,
+        "preference": DISCOVERY_PREFERENCE,
+        "pre_filter_shard_size": 1,
+        "filter_path": filter_path,
+    }
+
+
+def composite_aggregation(keyword_name: str, page_size: int, after_key: Any = None) -> dict[str, Any]:
+    """Returns the composite aggregation of a page of the values of a keyword field."""
+    return {
+        "composite": {
+            "size": page_size,
+            "sources": [{"single_result": {"terms": {"field": keyword_name}}}],
+            **({"after": after_key} if after_key else {}),
+        }
+    }
+
+
+def composite_page(result_values: Any) -> tuple[list[str], Any]:
+    """Returns the values of a `composite_aggregation` result, and the `after_key` of the next page (None if last)."""
+    values = [bucket["key"]["single_result"] for bucket in result_values.get("buckets", [])]
+    return values, result_values.get("after_key")
+
+
+def discovery_search(
+    client: Elasticsearch, index_name: str, body: dict[str, Any], filter_path: str | list[str]
+) -> dict[str, Any]:
+    """
+    Runs a field values search, cache and network friendly: it opts into the shard request cache
+    with a stable preference, always runs the can-match phase so shards with no document in the
+    time range are skipped, and trims the response to the given paths.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        index_name (str): The index or index pattern to search.
+        body (dict[str, Any]): The search body, with `"size": 0`.
+        filter_path (str | list[str]): The response paths kept, e.g. "aggregations.*.buckets.key".
+
+    Returns:
+        dict[str, Any]: The aggregations of the response. Paths with no data are removed by
+            `filter_path`, so missing aggregations and keys mean empty results.
+    """
+
+    response: Any = client.search(index=index_name, body=body, **discovery_search_params(filter_path))
+    return response["aggregations"] if "aggregations" in response else {}
+
+
+def next_page_size(page_size: int, elapsed: float, target_page_time: float, min_size: int, max_size: int) -> int:
+    """Scale the page size towards the target response time, at most doubling or halving it per page."""
+
+    if elapsed <= 0:
+        return min(page_size * 2, max_size)
+    scaled = page_size * target_page_time / elapsed
+    return int(max(min_size, min(max_size, page_size * 2, max(page_size / 2, scaled))))
+
+
+# pylint: disable=too-many-positional-arguments
+def iter_field_value_pages(
     client: Elasticsearch,
     keyword_name: str,
     index_name: str,
     start_date: str | None = None,
     end_date: str | None = None,
-) -> list[str]:
+    page_size: int = DEFAULT_PAGE_SIZE,
+    target_page_time: float | None = DEFAULT_TARGET_PAGE_TIME,
+    min_page_size: int = MIN_PAGE_SIZE,
+    max_page_size: int = MAX_PAGE_SIZE,
+    query: dict[str, Any] | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> Iterator[list[str]]:
     """
-    Retrieves all unique initial values present in the specified keyword field across
-    the target Elasticsearch indices.
-    For example it can get the possible values of kubernetes.pod.name
+    Yields the distinct values of a keyword field page by page, as they arrive, paginating a
+    composite aggregation with `after_key`.
+
+    Only one page of the responses is alive at a time, the values kept are up to the consumer
+    (e.g. `FieldValueTrie.update`, which holds every distinct value). The page size adapts to the
+    response time: it grows while pages come back faster than `target_page_time` and shrinks otherwise.
+
     Args:
         client (Elasticsearch): An instance of the Elasticsearch client.
         keyword_name (str): The name of the keyword field to aggregate values from.
-    Returns:
-        list[str]: A list of unique initial values found for the specified field,
-            processed and grouped.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values requested in the first page.
+        target_page_time (float | None): Response time, in seconds, the page size is tuned to.
+            None for a fixed page size.
+        min_page_size (int): Lower bound of the adaptive page size.
+        max_page_size (int): Upper bound of the adaptive page size.
+        query (dict[str, Any] | None): Query restricting the documents, overriding start_date and end_date.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Yields:
+        list[str]: The values of every page, in the composite aggregation order.
     """
 
-    all_field_names: set[str] = set()
+    if query is None:
+        query = build_values_query(start_date, end_date, time_field)
     after_key: Any = None
 
     while True:
-        use_date = start_date and end_date
+        request_body: dict[str, Any] = {
+            "size": 0,
+            "query": query,
+            "aggs": {"result_values": composite_aggregation(keyword_name, page_size, after_key)},
+        }
+
+        start_time = time.perf_counter()
+        aggregations = discovery_search(client, index_name, request_body, COMPOSITE_FILTER_PATH)
+        elapsed = time.perf_counter() - start_time
+
+        page, after_key = composite_page(aggregations.get("result_values", {}))
+        yield page
+
+        if not after_key:
+            break
+        if target_page_time is not None:
+            page_size = next_page_size(page_size, elapsed, target_page_time, min_page_size, max_page_size)
+
+
+# pylint: disable=too-many-positional-arguments
+def iter_field_value_pages_many(
+    client: Elasticsearch,
+    keyword_names: list[str],
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    query: dict[str, Any] | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> Iterator[dict[str, list[str]]]:
+    """
+    Yields the distinct values of several keyword fields page by page, with one search per page
+    holding a composite aggregation per field. Only the aggregations that still have an `after_key`
+    are requested again, so the number of searches is the number of pages of the largest field.
+
+    The buckets of every aggregation of a search count towards `search.max_buckets`, so the page
+    size of each field is capped to its share of `MAX_PAGE_SIZE`.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_names (list[str]): The names of the keyword fields to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values requested per field and page, at most
+            `MAX_PAGE_SIZE` divided by the number of fields still paginated.
+        query (dict[str, Any] | None): Query restricting the documents, overriding start_date and end_date.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Yields:
+        dict[str, list[str]]: The values of the page of every field still paginated.
+    """
+
+    if query is None:
+        query = build_values_query(start_date, end_date, time_field)
+
+    # Aggregations are named by position, field names may contain characters invalid in names
+    keyword_names = list(dict.fromkeys(keyword_names))
+    after_keys: dict[int, Any] = {position: None for position in range(len(keyword_names))}
 
+    while after_keys:
+        field_page_size = max(1, min(page_size, MAX_PAGE_SIZE // len(after_keys)))
         request_body: dict[str, Any] = {
             "size": 0,
-            "query": (
-                {
-                    "bool": {
-                        "filter": (
-                            # pylint: disable=duplicate-code
-                            [
-                                {
-                                    "range": {
-                                        "@timestamp": {
-                                            "format": "strict_date_optional_time",
-                                            "gte": start_date,
-                                            "lte": end_date,
-                                        }
-                                    }
-                                }
-                            ]
-                            if use_date
-                            else []
-                        )
-                    }
-                }
-                if use_date
-                else {"match_all": {}}
-            ),
+            "query": query,
+            "aggs": {
+                f"result_values_{position}": composite_aggregation(keyword_names[position], field_page_size, after_key)
+                for position, after_key in after_keys.items()
+            },
+        }
+        aggregations = discovery_search(client, index_name, request_body, COMPOSITE_FILTER_PATH)
+
+        pages: dict[str, list[str]] = {}
+        for position in list(after_keys):
+            pages[keyword_names[position]], after_keys[position] = composite_page(
+                aggregations.get(f"result_values_{position}", {})
+            )
+            if not after_keys[position]:
+                del after_keys[position]
+        yield pages
+
+
+def estimate_cardinality(client: Elasticsearch, keyword_name: str, index_name: str, query: dict[str, Any]) -> int:
+    """
+    Returns the approximate number of distinct values of a field, using a `cardinality` aggregation.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_name (str): The name of the keyword field.
+        index_name (str): The index or index pattern to search.
+        query (dict[str, Any]): The query restricting the documents.
+
+    Returns:
+        int: The estimated number of distinct values.
+    """
+
+    request_body: dict[str, Any] = {
+        "size": 0,
+        "query": query,
+        "aggs": {"values_count": {"cardinality": {"field": keyword_name}}},
+    }
+    aggregations = discovery_search(client, index_name, request_body, "aggregations.*.value")
+    return int(aggregations.get("values_count", {}).get("value", 0))
+
+
+# pylint: disable=too-many-positional-arguments
+def _scan_partitions(
+    client: Elasticsearch,
+    keyword_name: str,
+    index_name: str,
+    query: dict[str, Any],
+    concurrency: int,
+    num_partitions: int | None,
+    partition_size: int,
+) -> Iterator[list[str]]:
+    """
+    Yields the values of the field partition by partition, scanning `terms` aggregation partitions
+    (`include.partition`/`num_partitions`) concurrently.
+
+    A partition with more values than `partition_size` is scanned again as two partitions of a
+    twice finer partitioning (values in partition `p` of `n` are the ones in partitions `p` and
+    `p + n` of `2n`), so values are never lost nor yielded twice.
+    """
+
+    if num_partitions is None:
+        # The cardinality is approximate, leave some headroom in every partition
+        estimate = estimate_cardinality(client, keyword_name, index_name, query)
+        num_partitions = max(1, math.ceil(estimate * 1.25 / partition_size))
+
+    def scan(partition: int, partitions: int) -> tuple[list[str] | None, int, int]:
+        request_body: dict[str, Any] = {
+            "size": 0,
+            "query": query,
             "aggs": {
                 "result_values": {
-                    "composite": {
-                        # This is usually enough, and if it is not the request will
-                        # be repeated automatically
-                        "size": 10000,
-                        "sources": [{"single_result": {"terms": {"field": keyword_name}}}],
-                        **({"after": after_key} if after_key else {}),
+                    "terms": {
+                        "field": keyword_name,
+                        "size": partition_size,
+                        "include": {"partition": partition, "num_partitions": partitions},
                     }
                 }
             },
         }
+        aggregations = discovery_search(client, index_name, request_body, TERMS_FILTER_PATH)
+        result_values: Any = aggregations.get("result_values", {})
+
+        if result_values.get("sum_other_doc_count", 0) > 0:
+            return None, partition, partitions
+        return [bucket["key"] for bucket in result_values.get("buckets", [])], partition, partitions
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {executor.submit(scan, partition, num_partitions) for partition in range(num_partitions)}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                values, partition, partitions = future.result()
+                if values is not None:
+                    yield values
+                    continue
+                if partitions * 2 > MAX_PARTITIONS:
+                    raise RuntimeError(f"Partition {partition}/{partitions} of {keyword_name} can't be split further")
+                pending.add(executor.submit(scan, partition, partitions * 2))
+                pending.add(executor.submit(scan, partition + partitions, partitions * 2))
+
+
+# pylint: disable=too-many-positional-arguments
+def get_initial_part_of_fields(
+    client: Elasticsearch,
+    keyword_name: str,
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    concurrency: int = 1,
+    num_partitions: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    target_page_time: float | None = DEFAULT_TARGET_PAGE_TIME,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> list[str]:
+    """
+    Retrieves all unique initial values present in the specified keyword field across
+    the target Elasticsearch indices.
+    For example it can get the possible values of kubernetes.pod.name
 
-        response: Any = client.search(index=index_name, body=request_body)
-        buckets: Any = response["aggregations"]["result_values"]["buckets"]
+    With `concurrency` 1 the values are paginated sequentially with a composite aggregation.
+    Otherwise the keyspace is split in `terms` aggregation partitions scanned concurrently by
+    `concurrency` workers, which saves round-trips on high-cardinality fields.
 
-        for bucket in buckets:
-            single_result: str = bucket["key"]["single_result"]
-            all_field_names.add(single_result)
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_name (str): The name of the keyword field to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        concurrency (int): Number of partitions scanned at the same time, 1 for a sequential scan.
+        num_partitions (int | None): Number of partitions of the parallel scan, estimated from the
+            field cardinality and page_size if None.
+        page_size (int): Number of values per terms partition, or of the first composite page.
+        target_page_time (float | None): Response time, in seconds, the composite page size is tuned to.
+            None for a fixed page size.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+    Returns:
+        list[str]: A sorted list of unique initial values found for the specified field,
+            processed and grouped.
+    """
 
-        after_key = response["aggregations"]["result_values"].get("after_key")
-        if not after_key:
-            break
+    query = build_values_query(start_date, end_date, time_field)
+    pages: Iterator[list[str]] = (
+        _scan_partitions(client, keyword_name, index_name, query, concurrency, num_partitions, page_size)
+        if concurrency > 1
+        else iter_field_value_pages(
+            client, keyword_name, index_name, page_size=page_size, target_page_time=target_page_time, query=query
+        )
+    )
 
-    grouped_fields: FieldGroupTree = recursive_field_group(all_field_names)
-    grouped_without_node_ends: Any = clean_empty_nodes(grouped_fields)
-    result: list[str] = flatten_dict(grouped_without_node_ends)
+    # Values are grouped while paginating, each one is tokenized only once
+    field_values = FieldValueTrie()
+    for page in pages:
+        field_values.update(page)
 
-    return result
+    # Partitions complete in any order, sort for a result independent of the scan mode
+    return sorted(field_values.flatten())
+
+
+# pylint: disable=too-many-positional-arguments
+def get_initial_part_of_fields_many(
+    client: Elasticsearch,
+    keyword_names: list[str],
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> dict[str, list[str]]:
+    """
+    Batched `get_initial_part_of_fields`: the values of every field are paginated together, one
+    search per page of the largest field instead of one search per page of every field.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_names (list[str]): The names of the keyword fields to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        page_size (int): Number of values requested per field and page.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, list[str]]: The same list as `get_initial_part_of_fields` for every field.
+    """
+
+    field_values: dict[str, FieldValueTrie] = {keyword_name: FieldValueTrie() for keyword_name in keyword_names}
+    for pages in iter_field_value_pages_many(
+        client, keyword_names, index_name, start_date, end_date, page_size, time_field=time_field
+    ):
+        for keyword_name, page in pages.items():
+            field_values[keyword_name].update(page)
+
+    return {keyword_name: sorted(trie.flatten()) for keyword_name, trie in field_values.items()}
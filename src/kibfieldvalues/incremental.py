@@ -0,0 +1,159 @@
+import time
+from typing import Any, Type
+
+from elasticsearch import Elasticsearch
+
+from kibcache import WarmCache, WarmCacheKey
+from kiblog import BaseLogger
+
+from .fields import DEFAULT_PAGE_SIZE, DEFAULT_TIME_FIELD, discovery_search, iter_field_value_pages
+from .store import ValueStore
+from .trie import group_field_values
+
+# Seconds between two full scans of the index, which drop the values of expired documents
+DEFAULT_FULL_REBUILD_INTERVAL = 24 * 3600
+
+# Milliseconds re-scanned before the watermark, for documents indexed late with an older timestamp
+DEFAULT_WATERMARK_OVERLAP = 5 * 60 * 1000
+
+
+def build_watermark_query(
+    since: int | None = None, until: int | None = None, time_field: str = DEFAULT_TIME_FIELD
+) -> dict[str, Any]:
+    """
+    Returns the query of the documents with a time field in a range of epoch milliseconds.
+
+    Args:
+        since (int | None): Lower bound, None for no lower bound.
+        until (int | None): Upper bound, None for no upper bound.
+        time_field (str): The time field, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, Any]: The Elasticsearch query.
+    """
+
+    bounds: dict[str, Any] = {}
+    if since is not None:
+        bounds["gte"] = since
+    if until is not None:
+        bounds["lte"] = until
+    if not bounds:
+        return {"match_all": {}}
+    return {"bool": {"filter": [{"range": {time_field: {"format": "epoch_millis", **bounds}}}]}}
+
+
+def get_latest_timestamp(
+    client: Elasticsearch, index_name: str, since: int | None = None, time_field: str = DEFAULT_TIME_FIELD
+) -> int | None:
+    """
+    Returns the highest value of the time field in the index, using a `max` aggregation.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        index_name (str): The index or index pattern to search.
+        since (int | None): If given, only documents from this epoch milliseconds timestamp are considered.
+        time_field (str): The time field, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        int | None: The timestamp in epoch milliseconds, None if no document matches.
+    """
+
+    request_body: dict[str, Any] = {
+        "size": 0,
+        "query": build_watermark_query(since, time_field=time_field),
+        "aggs": {"latest_timestamp": {"max": {"field": time_field}}},
+    }
+    aggregations = discovery_search(client, index_name, request_body, "aggregations.*.value")
+    value = aggregations.get("latest_timestamp", {}).get("value")
+    return None if value is None else int(value)
+
+
+# pylint: disable=too-many-positional-arguments
+def get_initial_part_of_fields_incremental(
+    client: Elasticsearch,
+    keyword_name: str,
+    index_name: str,
+    warm_cache: WarmCache,
+    key: WarmCacheKey | None = None,
+    full_rebuild_interval: float = DEFAULT_FULL_REBUILD_INTERVAL,
+    overlap: int = DEFAULT_WATERMARK_OVERLAP,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    logger: Type[BaseLogger] | None = None,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> list[str]:
+    """
+    Incremental `get_initial_part_of_fields`: the distinct values and the highest timestamp
+    scanned (the watermark) are persisted per (index, field), and each call only aggregates the
+    documents newer than the watermark, merging their new values into a packed `ValueStore`.
+
+    Values of expired documents are only dropped by full scans, done on the first call and then
+    every `full_rebuild_interval` seconds. While no document has the time field, there is no
+    watermark and every call scans the whole index.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_name (str): The name of the keyword field to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        warm_cache (WarmCache): Where the values and the watermark are persisted.
+        key (WarmCacheKey | None): Key of the persisted state, derived from index_name and keyword_name if None.
+        full_rebuild_interval (float): Seconds after which the index is fully scanned again.
+        overlap (int): Milliseconds scanned again before the watermark, for documents indexed late.
+        page_size (int): Number of values of the first composite page.
+        logger (Type[BaseLogger] | None): Optional logger for info messages.
+        time_field (str): The time field the watermark is read from, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        list[str]: A sorted list of unique initial values found for the specified field,
+            processed and grouped.
+    """
+
+    if key is None:
+        key = WarmCacheKey("", "", index_name, keyword_name)
+
+    state: dict[str, Any] | None = warm_cache.get(WarmCache.DISCOVERY, key)
+
+    if state is None or time.time() - state["rebuilt_at"] >= full_rebuild_interval:
+        full_rebuild = True
+        field_values = ValueStore()
+        watermark: int | None = None
+        rebuilt_at = time.time()
+    else:
+        full_rebuild = False
+        field_values = ValueStore(state["values"])
+        watermark = state["watermark"]
+        rebuilt_at = state["rebuilt_at"]
+
+    since: int | None = None if watermark is None else watermark - overlap
+
+    # The upper bound is taken first, documents indexed during the scan are left to the next call
+    latest: int | None = get_latest_timestamp(client, index_name, since, time_field)
+    known = len(field_values)
+
+    query: dict[str, Any] | None = None
+    if latest is not None:
+        query = build_watermark_query(since, latest, time_field)
+    elif watermark is None:
+        # No document has the time field yet, e.g. an index without one: every scan is unbounded
+        query = build_watermark_query()
+
+    if query is not None:
+        new_values: list[str] = []
+        for page in iter_field_value_pages(client, keyword_name, index_name, page_size=page_size, query=query):
+            # The overlap returns values already discovered, only the new ones are kept
+            new_values.extend(value for value in page if value not in field_values)
+        field_values = field_values.union(new_values)
+        watermark = latest
+
+    if logger:
+        mode: str = "Full scan" if full_rebuild else "Incremental scan"
+        logger.message(
+            f"[kibfieldvalues.get_initial_part_of_fields_incremental] - {mode} of {keyword_name} "
+            f"added {len(field_values) - known} values, watermark {watermark}"
+        )
+
+    warm_cache.set(
+        WarmCache.DISCOVERY,
+        key,
+        {"watermark": watermark, "rebuilt_at": rebuilt_at, "values": list(field_values)},
+    )
+    return sorted(group_field_values(field_values))
@@ -0,0 +1,181 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Collection, Iterable, NamedTuple
+
+from .braces import compress_values
+from .trie import SEPARATOR
+
+
+class PatternRule(NamedTuple):
+    """
+    A kind of high-cardinality component collapsed into a placeholder.
+
+    Attributes:
+        name (str): The rule name, e.g. "uuid".
+        pattern (str): Regular expression matching whole `-` separated components.
+    """
+
+    name: str
+    pattern: str
+
+
+# Kubernetes name suffixes are drawn from consonants and digits, words (with vowels) are not mistaken for them
+_K8S_ALPHABET = "[bcdfghjklmnpqrstvwxz2-9]"
+
+DEFAULT_PATTERN_RULES: tuple[PatternRule, ...] = (
+    PatternRule("uuid", r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"),
+    PatternRule("number", r"\d+"),
+    PatternRule("hex", r"(?=[a-f]*\d)[0-9a-f]{6,}"),
+    PatternRule("replica_set_hash", rf"{_K8S_ALPHABET}{{8,10}}"),
+    PatternRule("pod_suffix", rf"{_K8S_ALPHABET}{{5}}"),
+)
+
+
+def compile_rules(rules: Iterable[PatternRule] = DEFAULT_PATTERN_RULES) -> re.Pattern[str]:
+    """
+    Compiles a rule set into a single regular expression, so every value is scanned only once.
+
+    Args:
+        rules (Iterable[PatternRule]): The rules, earlier ones win when several match.
+
+    Returns:
+        re.Pattern[str]: A pattern matching any rule on whole components.
+    """
+
+    separator = re.escape(SEPARATOR)
+    alternatives = "|".join(f"(?:{rule.pattern})" for rule in rules)
+    return re.compile(f"(?<![^{separator}])(?:{alternatives})(?![^{separator}])")
+
+
+@dataclass
+class ValuePatterns:
+    """
+    Values collapsed into templates, e.g. "checkout-*-*" for the pods of a deployment.
+
+    Attributes:
+        templates (dict[str, list[str]]): The raw values of every template, in order of first occurrence.
+            Values alone in their template are their own template.
+        placeholder (str): The placeholder of the collapsed components.
+    """
+
+    templates: dict[str, list[str]] = field(default_factory=dict)
+    placeholder: str = "*"
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """The number of raw values of every template."""
+        return {template: len(values) for template, values in self.templates.items()}
+
+    def compact(self) -> list[str]:
+        """
+        Returns the compact representation, e.g. for a prompt.
+
+        Returns:
+            list[str]: The templates, with their number of values when they stand for several,
+                e.g. ["checkout-*-* (42 values)", "frontend"].
+        """
+        return [
+            template if len(values) == 1 else f"{template} ({len(values)} values)"
+            for template, values in self.templates.items()
+        ]
+
+    def compress(self) -> tuple[str, dict[str, int]]:
+        """
+        Returns the templates in the brace form, e.g. for a prompt, with their counts kept apart
+        so the brace form stays expandable.
+
+        Returns:
+            tuple[str, dict[str, int]]: The brace form of the templates, e.g. "checkout-*-*,job-*,frontend",
+                and the number of values of the templates standing for several, e.g. {"checkout-*-*": 42}.
+        """
+        counts = {template: len(values) for template, values in self.templates.items() if len(values) > 1}
+        return compress_values(self.templates), counts
+
+    def expand(self, template: str) -> list[str]:
+        """
+        Maps a template, or an entry of `compact`, back to its raw values.
+
+        Args:
+            template (str): The template.
+
+        Returns:
+            list[str]: The raw values, empty for an unknown template.
+        """
+
+        if template not in self.templates:
+            template = template.rsplit(" (", 1)[0]
+        return list(self.templates.get(template, []))
+
+
+def _has_literal(template: str, placeholder: str) -> bool:
+    """Whether a template keeps at least one component of its values, e.g. "job-*" but not "*" or "*-*"."""
+    return any(part and part != placeholder for part in template.split(SEPARATOR))
+
+
+def normalize_values(
+    values: Iterable[str],
+    rules: Iterable[PatternRule] | re.Pattern[str] = DEFAULT_PATTERN_RULES,
+    placeholder: str = "*",
+    min_count: int = 2,
+) -> ValuePatterns:
+    """
+    Collapses the high-cardinality components of a batch of values (UUIDs, hashes, numeric
+    suffixes, ...) into placeholders, grouping the values sharing the same template.
+
+    The rule set is compiled into one regular expression, every distinct value is scanned once.
+    Templates need a component left as is: values made only of matched components (status codes,
+    short words like "https") would become a bare placeholder, they stand for themselves.
+
+    Args:
+        values (Iterable[str]): The values, e.g. pod names.
+        rules (Iterable[PatternRule] | re.Pattern[str]): The rule set, or a pattern from `compile_rules`.
+        placeholder (str): Replacement of the matched components.
+        min_count (int): Templates of fewer values are not kept, their values stand for themselves.
+
+    Returns:
+        ValuePatterns: The templates and the mapping back to the raw values.
+    """
+
+    pattern = rules if isinstance(rules, re.Pattern) else compile_rules(rules)
+    substitute = pattern.sub
+
+    grouped: dict[str, list[str]] = {}
+    for value in dict.fromkeys(values):
+        grouped.setdefault(substitute(placeholder, value), []).append(value)
+
+    templates: dict[str, list[str]] = {}
+    for template, members in grouped.items():
+        if len(members) >= min_count and _has_literal(template, placeholder):
+            templates[template] = members
+            continue
+        for member in members:
+            templates.setdefault(member, []).append(member)
+
+    return ValuePatterns(templates, placeholder)
+
+
+def compact_field_values(field_values: dict[str, Any], summarized: Collection[str] = ()) -> dict[str, Any]:
+    """
+    Compacts the values of several fields for a prompt: their high-cardinality values are collapsed
+    into templates by `normalize_values`, and written in the brace form with their shared prefixes
+    once, e.g. "payments-{api-*,worker-{eu,us}}".
+
+    Args:
+        field_values (dict[str, Any]): The values of every field, by field name.
+        summarized (Collection[str]): The fields holding a `FieldSummary.describe()` instead of values,
+            kept as is since the brace form would escape their commas.
+
+    Returns:
+        dict[str, Any]: The compacted values of every field, e.g. {"pod": {"values": "payments-{api-*,worker}",
+            "counts": {"payments-api-*": 42}}}, the template counts kept apart so the brace form stays
+            expandable. Fields that are summarized or don't hold a list of strings are kept as is.
+    """
+
+    compacted: dict[str, Any] = {}
+    for name, values in field_values.items():
+        if name in summarized or not (isinstance(values, list) and all(isinstance(value, str) for value in values)):
+            compacted[name] = values
+            continue
+        brace_form, counts = normalize_values(values).compress()
+        compacted[name] = {"values": brace_form, "counts": counts}
+    return compacted
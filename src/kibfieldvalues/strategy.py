@@ -0,0 +1,295 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from elasticsearch import Elasticsearch
+
+from .fields import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_TIME_FIELD,
+    MAX_PAGE_SIZE,
+    TERMS_FILTER_PATH,
+    build_values_query,
+    discovery_search,
+    iter_field_value_pages,
+    iter_field_value_pages_many,
+)
+from .trie import FieldValueTrie
+
+# Fields with at most this many distinct values are read with a single terms aggregation
+DEFAULT_TERMS_MAX_CARDINALITY = 1000
+
+# Fields with at most this many distinct values are fully enumerated with composite paging
+DEFAULT_COMPOSITE_MAX_CARDINALITY = 1_000_000
+
+# Number of values read from fields above the composite threshold
+DEFAULT_MAX_VALUES = 10000
+
+# `random_sampler` only accepts probabilities up to this value (or exactly 1)
+MAX_SAMPLING_PROBABILITY = 0.5
+
+SAMPLED_TERMS_FILTER_PATH = [*TERMS_FILTER_PATH, "aggregations.*.sample.buckets.key"]
+
+
+class DiscoveryStrategy(Enum):
+    """
+    How the values of a field are enumerated, chosen from its estimated cardinality.
+
+    Attributes:
+        TERMS: A single `terms` aggregation, for low cardinality fields.
+        COMPOSITE: Exhaustive `composite` aggregation paging, for medium cardinality fields.
+        SAMPLED: A `terms` aggregation below a `random_sampler`, for very high cardinality fields.
+        CAPPED: A `terms` aggregation of the most frequent values, for very high cardinality fields.
+    """
+
+    TERMS = "terms"
+    COMPOSITE = "composite"
+    SAMPLED = "sampled"
+    CAPPED = "capped"
+
+
+@dataclass
+class FieldValuesDiscovery:
+    """
+    Grouped values of a field, with how they were discovered.
+
+    Attributes:
+        values (list[str]): The sorted grouped values, like `get_initial_part_of_fields`.
+        strategy (DiscoveryStrategy): The strategy used to enumerate the values.
+        estimate (int): The estimated number of distinct values of the field.
+        complete (bool): Whether every distinct value was read.
+    """
+
+    values: list[str]
+    strategy: DiscoveryStrategy
+    estimate: int
+    complete: bool
+
+
+def choose_strategy(
+    estimate: int,
+    terms_max_cardinality: int = DEFAULT_TERMS_MAX_CARDINALITY,
+    composite_max_cardinality: int = DEFAULT_COMPOSITE_MAX_CARDINALITY,
+    sample: bool = True,
+) -> DiscoveryStrategy:
+    """
+    Returns the strategy for a field with the given estimated cardinality.
+
+    Args:
+        estimate (int): The estimated number of distinct values.
+        terms_max_cardinality (int): Highest cardinality read with a single terms aggregation.
+        composite_max_cardinality (int): Highest cardinality fully enumerated with composite paging.
+        sample (bool): Whether very high cardinality fields are sampled, rather than capped.
+
+    Returns:
+        DiscoveryStrategy: The chosen strategy.
+    """
+
+    if estimate <= terms_max_cardinality:
+        return DiscoveryStrategy.TERMS
+    if estimate <= composite_max_cardinality:
+        return DiscoveryStrategy.COMPOSITE
+    return DiscoveryStrategy.SAMPLED if sample else DiscoveryStrategy.CAPPED
+
+
+def _terms_aggregation(keyword_name: str, size: int, probability: float | None) -> dict[str, Any]:
+    """Returns a terms aggregation, below a random_sampler if a sampling probability is given."""
+
+    terms: dict[str, Any] = {"terms": {"field": keyword_name, "size": size}}
+    if probability is None:
+        return terms
+    return {"random_sampler": {"probability": probability}, "aggs": {"sample": terms}}
+
+
+def _terms_values(result_values: Any, sampled: bool) -> tuple[list[str], bool]:
+    """Returns the values of a `_terms_aggregation` result, and whether they are complete."""
+
+    if sampled:
+        result_values = result_values.get("sample", {})
+    complete = not sampled and result_values.get("sum_other_doc_count", 0) == 0
+    return [bucket["key"] for bucket in result_values.get("buckets", [])], complete
+
+
+# pylint: disable=too-many-positional-arguments,too-many-locals
+def discover_field_values_many(
+    client: Elasticsearch,
+    keyword_names: list[str],
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    terms_max_cardinality: int = DEFAULT_TERMS_MAX_CARDINALITY,
+    composite_max_cardinality: int = DEFAULT_COMPOSITE_MAX_CARDINALITY,
+    max_values: int = DEFAULT_MAX_VALUES,
+    sample: bool = True,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> dict[str, FieldValuesDiscovery]:
+    """
+    Batched `discover_field_values`: the cardinality of every field is estimated in one search,
+    the terms (and sampled) reads of every field are sent in one search, and the composite
+    paging of the remaining fields is batched with `iter_field_value_pages_many`. A single
+    composite field is paginated with `iter_field_value_pages` instead, with an adaptive page size.
+
+    The buckets of every aggregation of a search count towards `search.max_buckets`, so the size
+    of each terms read is capped to its share of `MAX_PAGE_SIZE`.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_names (list[str]): The names of the keyword fields to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        terms_max_cardinality (int): Highest cardinality read with a single terms aggregation.
+        composite_max_cardinality (int): Highest cardinality fully enumerated with composite paging.
+        max_values (int): Number of values read from fields above composite_max_cardinality.
+        sample (bool): Whether very high cardinality fields are sampled with `random_sampler`
+            (Elasticsearch 8.2+), rather than capped to their most frequent values.
+        page_size (int): Number of values requested per field and composite page, or of the first
+            page of a single composite field.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, FieldValuesDiscovery]: The grouped values of every field, with the strategy used
+            and the cardinality estimate.
+    """
+
+    keyword_names = list(dict.fromkeys(keyword_names))
+    if not keyword_names:
+        return {}
+
+    query = build_values_query(start_date, end_date, time_field)
+    aggregations = discovery_search(
+        client,
+        index_name,
+        {
+            "size": 0,
+            "query": query,
+            "aggs": {
+                f"values_count_{position}": {"cardinality": {"field": keyword_name}}
+                for position, keyword_name in enumerate(keyword_names)
+            },
+        },
+        "aggregations.*.value",
+    )
+    estimates: dict[str, int] = {
+        keyword_name: int(aggregations.get(f"values_count_{position}", {}).get("value", 0))
+        for position, keyword_name in enumerate(keyword_names)
+    }
+    strategies: dict[str, DiscoveryStrategy] = {
+        keyword_name: choose_strategy(estimate, terms_max_cardinality, composite_max_cardinality, sample)
+        for keyword_name, estimate in estimates.items()
+    }
+
+    field_values: dict[str, FieldValueTrie] = {keyword_name: FieldValueTrie() for keyword_name in keyword_names}
+    completes: dict[str, bool] = {keyword_name: True for keyword_name in keyword_names}
+
+    terms_fields: dict[int, str] = {
+        position: keyword_name
+        for position, keyword_name in enumerate(keyword_names)
+        if strategies[keyword_name] is not DiscoveryStrategy.COMPOSITE
+    }
+    if terms_fields:
+        terms_aggregations: dict[str, Any] = {}
+        max_size = max(1, MAX_PAGE_SIZE // len(terms_fields))
+        for position, keyword_name in terms_fields.items():
+            estimate, strategy = estimates[keyword_name], strategies[keyword_name]
+            # The estimate is approximate, leave some headroom so low cardinality fields stay complete
+            size = max(1, int(estimate * 1.25)) if strategy is DiscoveryStrategy.TERMS else max_values
+            size = min(size, max_size)
+            probability = (
+                min(MAX_SAMPLING_PROBABILITY, max_values / max(estimate, 1))
+                if strategy is DiscoveryStrategy.SAMPLED
+                else None
+            )
+            terms_aggregations[f"result_values_{position}"] = _terms_aggregation(keyword_name, size, probability)
+
+        aggregations = discovery_search(
+            client, index_name, {"size": 0, "query": query, "aggs": terms_aggregations}, SAMPLED_TERMS_FILTER_PATH
+        )
+        for position, keyword_name in terms_fields.items():
+            values, complete = _terms_values(
+                aggregations.get(f"result_values_{position}", {}),
+                sampled=strategies[keyword_name] is DiscoveryStrategy.SAMPLED,
+            )
+
+            # The estimate was too low for a single terms aggregation, enumerate every value instead
+            if strategies[keyword_name] is DiscoveryStrategy.TERMS and not complete:
+                strategies[keyword_name] = DiscoveryStrategy.COMPOSITE
+                continue
+            field_values[keyword_name].update(values)
+            completes[keyword_name] = complete
+
+    composite_fields: list[str] = [
+        keyword_name for keyword_name in keyword_names if strategies[keyword_name] is DiscoveryStrategy.COMPOSITE
+    ]
+    if len(composite_fields) == 1:
+        for page in iter_field_value_pages(client, composite_fields[0], index_name, page_size=page_size, query=query):
+            field_values[composite_fields[0]].update(page)
+    elif composite_fields:
+        for pages in iter_field_value_pages_many(
+            client, composite_fields, index_name, page_size=page_size, query=query
+        ):
+            for keyword_name, page in pages.items():
+                field_values[keyword_name].update(page)
+
+    return {
+        keyword_name: FieldValuesDiscovery(
+            sorted(field_values[keyword_name].flatten()),
+            strategies[keyword_name],
+            estimates[keyword_name],
+            completes[keyword_name],
+        )
+        for keyword_name in keyword_names
+    }
+
+
+# pylint: disable=too-many-positional-arguments
+def discover_field_values(
+    client: Elasticsearch,
+    keyword_name: str,
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    terms_max_cardinality: int = DEFAULT_TERMS_MAX_CARDINALITY,
+    composite_max_cardinality: int = DEFAULT_COMPOSITE_MAX_CARDINALITY,
+    max_values: int = DEFAULT_MAX_VALUES,
+    sample: bool = True,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> FieldValuesDiscovery:
+    """
+    Cardinality-aware `get_initial_part_of_fields`: a cheap `cardinality` aggregation runs first,
+    and the values are enumerated with the strategy fitting the estimate, so very high cardinality
+    fields are sampled or capped instead of fully scanned.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        keyword_name (str): The name of the keyword field to aggregate values from.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        terms_max_cardinality (int): Highest cardinality read with a single terms aggregation.
+        composite_max_cardinality (int): Highest cardinality fully enumerated with composite paging.
+        max_values (int): Number of values read from fields above composite_max_cardinality.
+        sample (bool): Whether very high cardinality fields are sampled with `random_sampler`
+            (Elasticsearch 8.2+), rather than capped to their most frequent values.
+        page_size (int): Number of values of the first composite page, then adapted to the response time.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        FieldValuesDiscovery: The grouped values, with the strategy used and the cardinality estimate.
+    """
+
+    return discover_field_values_many(
+        client,
+        [keyword_name],
+        index_name,
+        start_date,
+        end_date,
+        terms_max_cardinality,
+        composite_max_cardinality,
+        max_values,
+        sample,
+        page_size,
+        time_field,
+    )[keyword_name]
@@ -0,0 +1,168 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from elasticsearch import Elasticsearch
+
+from .fields import DEFAULT_TIME_FIELD, build_values_query, discovery_search
+
+# Kibana field types described by a summary instead of an enumeration of their values
+NUMBER_TYPE = "number"
+DATE_TYPE = "date"
+IP_TYPE = "ip"
+SUMMARIZED_TYPES = frozenset({NUMBER_TYPE, DATE_TYPE, IP_TYPE})
+
+DEFAULT_PERCENTS: tuple[float, ...] = (1, 50, 99)
+
+# Number of most frequent addresses given as examples of an IP field
+DEFAULT_IP_EXAMPLES = 5
+
+
+@dataclass
+class FieldSummary:  # pylint: disable=too-many-instance-attributes
+    """
+    Description of the values of a numeric, date or IP field.
+
+    Attributes:
+        field_type (str): The Kibana field type, "number", "date" or "ip".
+        count (int): The number of values.
+        minimum (float | str | None): The lowest value, ISO 8601 for dates.
+        maximum (float | str | None): The highest value, ISO 8601 for dates.
+        average (float | None): The mean value of a number field.
+        percentiles (dict[str, float]): The percentiles of a number field, e.g. {"50.0": 12.0}.
+        distinct (int | None): The approximate number of distinct addresses of an IP field.
+        examples (list[str]): The most frequent addresses of an IP field.
+    """
+
+    field_type: str
+    count: int
+    minimum: float | str | None = None
+    maximum: float | str | None = None
+    average: float | None = None
+    percentiles: dict[str, float] = field(default_factory=dict)
+    distinct: int | None = None
+    examples: list[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """
+        Returns a short description of the values, e.g. for a prompt.
+
+        Returns:
+            str: e.g. "number from 0 to 1200, avg 12.5, p50 10 (5321 values)".
+        """
+
+        if not self.count:
+            return f"{self.field_type} with no values"
+
+        if self.field_type == IP_TYPE:
+            return f"ip, about {self.distinct} distinct addresses, e.g. {', '.join(self.examples)}"
+
+        parts = [f"{self.field_type} from {_format(self.minimum)} to {_format(self.maximum)}"]
+        if self.average is not None:
+            parts.append(f"avg {_format(self.average)}")
+        parts.extend(f"p{_format(float(percent))} {_format(value)}" for percent, value in self.percentiles.items())
+        return f"{', '.join(parts)} ({self.count} values)"
+
+
+def _format(value: float | str | None) -> str:
+    """Formats a number without useless decimals, strings as is."""
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _summary_aggregations(field_name: str, field_type: str, percents: tuple[float, ...]) -> dict[str, Any]:
+    """Returns the aggregations summarizing a field, named after their kind."""
+
+    if field_type == IP_TYPE:
+        return {
+            "count": {"value_count": {"field": field_name}},
+            "distinct": {"cardinality": {"field": field_name}},
+            "examples": {"terms": {"field": field_name, "size": DEFAULT_IP_EXAMPLES}},
+        }
+
+    aggregations: dict[str, Any] = {"stats": {"stats": {"field": field_name}}}
+    if field_type == NUMBER_TYPE and percents:
+        aggregations["percentiles"] = {"percentiles": {"field": field_name, "percents": list(percents)}}
+    return aggregations
+
+
+def _summary(field_type: str, results: dict[str, Any]) -> FieldSummary:
+    """Builds the summary of a field from its aggregation results, missing when `filter_path` trimmed them."""
+
+    if field_type == IP_TYPE:
+        return FieldSummary(
+            field_type=field_type,
+            count=int(results.get("count", {}).get("value", 0)),
+            distinct=int(results.get("distinct", {}).get("value", 0)),
+            examples=[bucket["key"] for bucket in results.get("examples", {}).get("buckets", [])],
+        )
+
+    stats: dict[str, Any] = results.get("stats", {})
+    is_date = field_type == DATE_TYPE
+    return FieldSummary(
+        field_type=field_type,
+        count=int(stats.get("count", 0)),
+        minimum=stats.get("min_as_string") if is_date else stats.get("min"),
+        maximum=stats.get("max_as_string") if is_date else stats.get("max"),
+        average=None if is_date else stats.get("avg"),
+        percentiles={
+            percent: value
+            for percent, value in results.get("percentiles", {}).get("values", {}).items()
+            if value is not None
+        },
+    )
+
+
+# pylint: disable=too-many-positional-arguments
+def summarize_fields(
+    client: Elasticsearch,
+    field_types: dict[str, str],
+    index_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    percents: tuple[float, ...] = DEFAULT_PERCENTS,
+    time_field: str = DEFAULT_TIME_FIELD,
+) -> dict[str, FieldSummary]:
+    """
+    Describes numeric, date and IP fields as ranges, with `stats` and `percentiles` aggregations
+    (value counts, cardinality and most frequent addresses for IP fields), every field in one search.
+
+    Args:
+        client (Elasticsearch): An instance of the Elasticsearch client.
+        field_types (dict[str, str]): The Kibana type ("number", "date" or "ip") of every field to summarize.
+        index_name (str): The index or index pattern to search.
+        start_date (str | None): If given with end_date, only documents in this time range are considered.
+        end_date (str | None): If given with start_date, only documents in this time range are considered.
+        percents (tuple[float, ...]): The percentiles of the number fields.
+        time_field (str): The field the time range applies to, e.g. the `timeFieldName` of the data view.
+
+    Returns:
+        dict[str, FieldSummary]: The summary of every field.
+
+    Raises:
+        ValueError: If a field type can't be summarized.
+    """
+
+    unsupported = {name: field_type for name, field_type in field_types.items() if field_type not in SUMMARIZED_TYPES}
+    if unsupported:
+        raise ValueError(f"Fields of these types can't be summarized: {unsupported}")
+    if not field_types:
+        return {}
+
+    # Aggregations are named by position, field names may contain characters invalid in names
+    field_aggregations: list[tuple[str, dict[str, Any]]] = [
+        (name, _summary_aggregations(name, field_type, percents)) for name, field_type in field_types.items()
+    ]
+    request_body: dict[str, Any] = {
+        "size": 0,
+        "query": build_values_query(start_date, end_date, time_field),
+        "aggs": {
+            f"{kind}_{position}": aggregation
+            for position, (_, aggregations) in enumerate(field_aggregations)
+            for kind, aggregation in aggregations.items()
+        },
+    }
+    results = discovery_search(client, index_name, request_body, "aggregations")
+
+    return {
+        name: _summary(field_types[name], {kind: results.get(f"{kind}_{position}", {}) for kind in aggregations})
+        for position, (name, aggregations) in enumerate(field_aggregations)
+    }
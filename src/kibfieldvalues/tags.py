@@ -0,0 +1,17 @@
+from enum import Enum, auto
+from typing import TypeAlias
+
+
+class FieldsTag(Enum):
+    """
+    Enum to indicate the end of a branch in the recursive fields dictionary.
+
+    Attributes:
+        END: Marks the end of a branch in the field structure.
+    """
+
+    END = auto()
+
+
+# Typing for the recursive function
+FieldGroupTree: TypeAlias = dict[str, "FieldGroupTree"] | list[str] | None
@@ -0,0 +1,262 @@
+from typing import Any, Iterable, Iterator, Union
+
+from .tags import FieldGroupTree, FieldsTag
+
+# Separator of the hierarchical components of a field value
+SEPARATOR = "-"
+
+# JSON-serializable form of a trie node: [terminal, value, children], leaves are plain values
+TrieNodeState = list[Any]
+TrieChildState = Union[str, TrieNodeState]
+
+
+class _TrieNode:
+    """
+    A component shared by several field values, or by several occurrences of the same value.
+
+    Components reached by a single occurrence of a value are not nodes: the parent maps them
+    directly to the value (a leaf), which is only split when another value reaches it, so unique
+    suffixes (pod hashes, ...) are never tokenized. A node with `value` set is a leaf of a value
+    seen several times. Any other node has at least two distinct values below it.
+    """
+
+    __slots__ = ("terminal", "children", "value")
+
+    def __init__(self, value: str | None = None) -> None:
+        # Whether a value ends exactly at this component
+        self.terminal = False
+        self.children: dict[str, _TrieNode | str] = {}
+        self.value = value
+
+    @classmethod
+    def split(cls, value: str, depth: int) -> "_TrieNode":
+        """Returns a node holding a single value, whose next component is at the given depth."""
+
+        node = cls()
+        node.push(value, depth, repeated=False)
+        return node
+
+    def push(self, value: str, depth: int, repeated: bool) -> None:
+        """Move a leaf value one component down, below this node."""
+
+        parts = value.split(SEPARATOR, depth + 1)
+        if depth >= len(parts):
+            self.terminal = True
+            return
+        self.children[parts[depth]] = _TrieNode(value) if repeated else value
+
+    def has_repeated_child(self) -> bool:
+        """Whether at least one child groups more than one value."""
+        return any(isinstance(child, _TrieNode) for child in self.children.values())
+
+    def to_state(self) -> TrieNodeState:
+        """Returns the node and its subtree as JSON-serializable lists."""
+        children = {key: child if isinstance(child, str) else child.to_state() for key, child in self.children.items()}
+        return [self.terminal, self.value, children]
+
+    @classmethod
+    def from_state(cls, state: TrieNodeState) -> "_TrieNode":
+        """Rebuilds a node and its subtree from `to_state`."""
+
+        terminal, value, children = state
+        node = cls(value)
+        node.terminal = bool(terminal)
+        node.children = {
+            key: child if isinstance(child, str) else cls.from_state(child) for key, child in children.items()
+        }
+        return node
+
+    def expanded_children(self) -> list[tuple[str, "_TrieNode"]]:
+        """Returns the children kept in the grouping, i.e. grouping several distinct values with a repeated child."""
+        return [
+            (key, child)
+            for key, child in self.children.items()
+            if isinstance(child, _TrieNode) and child.value is None and child.has_repeated_child()
+        ]
+
+
+def _join(path: list[str]) -> str:
+    """Joins the components of a path like `flatten_dict`, which skips them while its prefix is empty."""
+
+    start = 0
+    while start < len(path) - 1 and not path[start]:
+        start += 1
+    return SEPARATOR.join(path[start:])
+
+
+class FieldValueTrie:
+    """
+    Prefix trie of field values split on `-`, producing the same grouping as
+    `flatten_dict(clean_empty_nodes(recursive_field_group(values)))` in a single build and walk.
+
+    Every value is tokenized at most once, only as deep as it shares a prefix with another value,
+    and every trie node counts the values sharing its prefix, so the grouping is decided without
+    regrouping the values at each level.
+    Values can be added incrementally, e.g. page by page while paginating an aggregation.
+    Children keep the order in which they were first seen, like `recursive_field_group`.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self._root = _TrieNode()
+        self._size = 0
+        self.update(values)
+
+    def __len__(self) -> int:
+        """The number of values added, with repetitions."""
+        return self._size
+
+    def __contains__(self, value: object) -> bool:
+        """Whether the value was added at least once."""
+
+        if not isinstance(value, str):
+            return False
+
+        node = self._root
+        parts = value.split(SEPARATOR)
+        last = len(parts) - 1
+
+        for depth, part in enumerate(parts):
+            child = node.children.get(part)
+            if child is None:
+                return False
+            if isinstance(child, str):
+                return child == value
+            if child.value is not None:
+                return child.value == value
+            if depth == last:
+                return child.terminal
+            node = child
+        return False
+
+    def to_state(self) -> dict[str, Any]:
+        """
+        Returns the trie as JSON-serializable data, e.g. to persist it between discoveries.
+
+        Returns:
+            dict[str, Any]: The state, to be restored with `FieldValueTrie.from_state`.
+        """
+        return {"size": self._size, "root": self._root.to_state()}
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "FieldValueTrie":
+        """
+        Rebuilds a trie from `to_state`, new values can be added to it as usual.
+
+        Args:
+            state (dict[str, Any]): The state returned by `to_state`.
+
+        Returns:
+            FieldValueTrie: The restored trie.
+        """
+
+        trie = cls()
+        trie._root = _TrieNode.from_state(state["root"])
+        trie._size = int(state["size"])
+        return trie
+
+    def add(self, value: str, count: int = 1) -> None:
+        """
+        Add a value.
+
+        Args:
+            value (str): The field value, e.g. "payments-api-7f9c".
+            count (int): How many times the value is added.
+        """
+
+        self._size += count
+        node = self._root
+        parts = value.split(SEPARATOR)
+        last = len(parts) - 1
+
+        for depth, part in enumerate(parts):
+            children = node.children
+            child = children.get(part)
+
+            if child is None:
+                children[part] = value if count == 1 else _TrieNode(value)
+                return
+
+            if isinstance(child, str):
+                if child == value:
+                    children[part] = _TrieNode(value)
+                    return
+                child = children[part] = _TrieNode.split(child, depth + 1)
+            elif child.value is not None:
+                if child.value == value:
+                    return
+                child.push(child.value, depth + 1, repeated=True)
+                child.value = None
+
+            if depth == last:
+                child.terminal = True
+                return
+            node = child
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add every value of an iterable."""
+        for value in values:
+            self.add(value)
+
+    def _walk(self) -> Iterator[tuple[list[str], _TrieNode]]:
+        """Yields the path and node of the expanded components with no expanded child, depth first."""
+
+        if not self._root.has_repeated_child():
+            return
+
+        stack: list[tuple[list[str], _TrieNode]] = [
+            ([key], child) for key, child in reversed(self._root.expanded_children())
+        ]
+        while stack:
+            path, node = stack.pop()
+            expanded = node.expanded_children()
+            if not expanded:
+                yield path, node
+                continue
+            stack.extend(([*path, key], child) for key, child in reversed(expanded))
+
+    def flatten(self) -> list[str]:
+        """
+        Returns the grouped prefixes of the values. Like `flatten_dict`, leading empty components
+        are dropped, e.g. the group of "-x-1" and "-x-2" is "x", not "-x".
+
+        Returns:
+            list[str]: The same list as `flatten_dict(clean_empty_nodes(recursive_field_group(values)))`.
+        """
+        return [_join(path) for path, _ in self._walk()]
+
+    def tree(self) -> FieldGroupTree | FieldsTag:
+        """
+        Returns the grouping as a nested dictionary.
+
+        Returns:
+            FieldGroupTree | FieldsTag: The same value as `clean_empty_nodes(recursive_field_group(values))`,
+                with `FieldsTag.END` leaves.
+        """
+
+        if not self._size:
+            return []
+        if not self._root.has_repeated_child():
+            return None
+
+        result: dict[str, Any] = {}
+        for path, _ in self._walk():
+            node = result
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = FieldsTag.END
+        return result or FieldsTag.END
+
+
+def group_field_values(values: Iterable[str]) -> list[str]:
+    """
+    Group field values by their common `-` separated prefixes, e.g. pod names by deployment.
+
+    Args:
+        values (Iterable[str]): The distinct values of a keyword field.
+
+    Returns:
+        list[str]: The grouped prefixes, like `flatten_dict(clean_empty_nodes(recursive_field_group(values)))`.
+    """
+    return FieldValueTrie(values).flatten()
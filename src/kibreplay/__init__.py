@@ -0,0 +1,19 @@
+from .elastic import recording_node_class, replay_node_class
+from .kibana import RecordingAdapter, ReplayAdapter, mount
+from .latency import LatencyModel, constant_latency, lognormal_latency, no_latency, recorded_latency
+from .store import Fixture, FixtureStore
+
+__all__ = [
+    "Fixture",
+    "FixtureStore",
+    "LatencyModel",
+    "RecordingAdapter",
+    "ReplayAdapter",
+    "constant_latency",
+    "lognormal_latency",
+    "mount",
+    "no_latency",
+    "recorded_latency",
+    "recording_node_class",
+    "replay_node_class",
+]
@@ -0,0 +1,110 @@
+import time
+from typing import NamedTuple
+
+from elastic_transport import ApiResponseMeta, BaseNode
+from elastic_transport import ConnectionError as TransportConnectionError
+from elastic_transport import HttpHeaders, NodeConfig, Urllib3HttpNode
+from elastic_transport.client_utils import DEFAULT, DefaultType
+
+from .latency import LatencyModel, no_latency
+from .store import FixtureStore
+
+
+class NodeResponse(NamedTuple):
+    """
+    Response of a node to the transport, shaped like the one of the `elastic_transport` nodes,
+    whose type is only defined in a private module.
+
+    Attributes:
+        meta (ApiResponseMeta): The status, headers and duration of the response.
+        body (bytes): The raw response body.
+    """
+
+    meta: ApiResponseMeta
+    body: bytes
+
+
+# Elasticsearch clients refuse responses without this header
+_PRODUCT_HEADER = ("X-Elastic-Product", "Elasticsearch")
+
+
+def recording_node_class(store: FixtureStore) -> type[BaseNode]:
+    """
+    Returns an `elastic_transport` node class sending requests for real and recording
+    every response, to pass as `Elasticsearch(..., node_class=...)`.
+
+    Args:
+        store (FixtureStore): Where the responses are recorded.
+    """
+
+    class RecordingNode(Urllib3HttpNode):
+        """Urllib3 node recording every response in the fixture store."""
+
+        # pylint: disable-next=too-many-positional-arguments
+        def perform_request(  # type: ignore[override]
+            self,
+            method: str,
+            target: str,
+            body: bytes | None = None,
+            headers: HttpHeaders | None = None,
+            request_timeout: DefaultType | float | None = DEFAULT,
+        ) -> NodeResponse:
+            meta, raw_body = super().perform_request(method, target, body, headers, request_timeout)
+            store.put(
+                method=method,
+                target=target,
+                request_body=body,
+                status=meta.status,
+                headers=dict(meta.headers),
+                body=raw_body,
+                duration=meta.duration,
+            )
+            return NodeResponse(meta, raw_body)
+
+    return RecordingNode
+
+
+def replay_node_class(store: FixtureStore, latency: LatencyModel = no_latency) -> type[BaseNode]:
+    """
+    Returns an `elastic_transport` node class answering from recorded fixtures, to pass as
+    `Elasticsearch(..., node_class=...)`. Requests that were never recorded fail with
+    `elastic_transport.ConnectionError`.
+
+    Args:
+        store (FixtureStore): The recorded responses.
+        latency (LatencyModel): Synthetic latency added to every replayed request.
+    """
+
+    class ReplayNode(BaseNode):
+        """Node replaying the fixture store without any network access."""
+
+        def __init__(self, config: NodeConfig) -> None:
+            super().__init__(config)
+            self.store = store
+            self.latency = latency
+
+        # pylint: disable-next=too-many-positional-arguments
+        def perform_request(  # type: ignore[override]
+            self,
+            method: str,
+            target: str,
+            body: bytes | None = None,
+            headers: HttpHeaders | None = None,
+            request_timeout: DefaultType | float | None = DEFAULT,
+        ) -> NodeResponse:
+            fixture = self.store.get(method, target, body)
+            if fixture is None:
+                raise TransportConnectionError(f"No recorded response for {method} {target}")
+
+            delay = self.latency(fixture.duration)
+            if delay > 0:
+                time.sleep(delay)
+
+            headers = HttpHeaders(fixture.headers)
+            headers.setdefault(*_PRODUCT_HEADER)
+            meta = ApiResponseMeta(
+                status=fixture.status, http_version="1.1", headers=headers, duration=delay, node=self.config
+            )
+            return NodeResponse(meta, fixture.body)
+
+    return ReplayNode
@@ -0,0 +1,107 @@
+import io
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from .latency import LatencyModel, no_latency
+from .store import FixtureStore
+
+
+def request_target(url: str) -> str:
+    """Returns the path and query string of a URL."""
+    parts = urlsplit(url)
+    return f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter sending requests for real and recording every response.
+
+    Mount it on the session of a client (e.g. `NotCertifiedKibana.session`) with `mount`.
+    """
+
+    def __init__(self, store: FixtureStore, **kwargs: Any) -> None:
+        """
+        Args:
+            store (FixtureStore): Where the responses are recorded.
+            **kwargs: Arguments of `HTTPAdapter`, such as pool_maxsize.
+        """
+        self.store = store
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        start_time = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+
+        # Reading the content keeps it available to streaming callers too
+        content = response.content
+        self.store.put(
+            method=request.method or "GET",
+            target=request_target(request.url or ""),
+            request_body=request.body,
+            status=response.status_code,
+            headers=dict(response.headers),
+            body=content,
+            duration=time.perf_counter() - start_time,
+        )
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter answering from recorded fixtures, without any network access.
+
+    Requests that were never recorded fail with `requests.ConnectionError`, like an unreachable host.
+    """
+
+    def __init__(self, store: FixtureStore, latency: LatencyModel = no_latency) -> None:
+        """
+        Args:
+            store (FixtureStore): The recorded responses.
+            latency (LatencyModel): Synthetic latency added to every replayed request.
+        """
+        self.store = store
+        self.latency = latency
+        super().__init__()
+
+    def send(self, request: requests.PreparedRequest, *_: Any, **__: Any) -> requests.Response:
+        method = request.method or "GET"
+        target = request_target(request.url or "")
+
+        fixture = self.store.get(method, target, request.body)
+        if fixture is None:
+            raise requests.ConnectionError(f"No recorded response for {method} {target}", request=request)
+
+        delay = self.latency(fixture.duration)
+        if delay > 0:
+            time.sleep(delay)
+
+        raw = HTTPResponse(
+            body=io.BytesIO(fixture.body),
+            headers={**fixture.headers, "Content-Length": str(len(fixture.body))},
+            status=fixture.status,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def mount(session: requests.Session, adapter: HTTPAdapter, prefix: str = "") -> None:
+    """
+    Route the requests of a session through a recording or replay adapter.
+
+    Args:
+        session (requests.Session): The session, e.g. `NotCertifiedKibana.session`.
+        adapter (HTTPAdapter): A `RecordingAdapter` or `ReplayAdapter`.
+        prefix (str): Only URLs starting with this prefix are routed, every URL if empty.
+    """
+
+    if prefix:
+        session.mount(prefix, adapter)
+    else:
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
@@ -0,0 +1,46 @@
+import math
+import random
+from typing import Callable
+
+# Returns the synthetic latency, in seconds, of a replayed request given its recorded duration
+LatencyModel = Callable[[float], float]
+
+
+def no_latency(_: float) -> float:
+    """Replay every request immediately."""
+    return 0.0
+
+
+def recorded_latency(scale: float = 1.0) -> LatencyModel:
+    """
+    Replay every request with its recorded duration.
+
+    Args:
+        scale (float): Multiplier of the recorded durations.
+    """
+    return lambda recorded: recorded * scale
+
+
+def constant_latency(seconds: float) -> LatencyModel:
+    """Replay every request with the same latency, in seconds."""
+    return lambda _: seconds
+
+
+def lognormal_latency(median: float, p99: float, seed: int | None = None) -> LatencyModel:
+    """
+    Replay requests with a log-normal latency, the usual shape of service latencies
+    with a long tail.
+
+    Args:
+        median (float): The median latency, in seconds.
+        p99 (float): The 99th percentile latency, in seconds, greater than the median.
+        seed (int | None): Seed of the random generator, for repeatable runs.
+    """
+
+    if p99 <= median:
+        raise ValueError("p99 must be greater than the median")
+
+    rng = random.Random(seed)
+    mu = math.log(median)
+    sigma = (math.log(p99) - mu) / 2.3263  # z-score of the 99th percentile
+    return lambda _: rng.lognormvariate(mu, sigma)
@@ -0,0 +1,172 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+# Headers describing the wire encoding, dropped because fixtures store decoded bodies
+_TRANSPORT_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "connection"})
+
+
+@dataclass
+class Fixture:
+    """
+    A recorded HTTP exchange.
+
+    Attributes:
+        method (str): The HTTP method.
+        target (str): The request path with its query string, without scheme and host.
+        status (int): The response status code.
+        headers (dict[str, str]): The response headers, without the transport ones.
+        body (bytes): The decoded response body.
+        duration (float): The recorded request duration, in seconds.
+        request_body (Any): The decoded request body, kept to make fixtures readable.
+    """
+
+    method: str
+    target: str
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    duration: float = 0.0
+    request_body: Any = None
+
+
+def normalize_body(body: bytes | str | None) -> Any:
+    """
+    Decode a request body so equivalent bodies (key order, whitespace, compression) match.
+
+    Returns:
+        Any: The decoded JSON value, the text if it is not JSON, None if empty.
+    """
+
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        if body[:2] == b"\x1f\x8b":
+            body = gzip.decompress(body)
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+class FixtureStore:
+    """
+    Directory of recorded HTTP exchanges, one JSON file per request.
+
+    Requests are identified by their method, target and normalized body, so replaying the
+    same calls returns the recorded responses whatever the host they were recorded from.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a fixture directory, creating it if needed.
+
+        Args:
+            path (str): The directory holding the fixtures.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._fixtures: dict[str, Fixture] = {}
+
+    @staticmethod
+    def key(method: str, target: str, body: bytes | str | None = None) -> str:
+        """Returns the identifier of a request, used as fixture file name."""
+        normalized = json.dumps([method.upper(), target, normalize_body(body)], sort_keys=True)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:24]
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, method: str, target: str, body: bytes | str | None = None) -> Fixture | None:
+        """
+        Returns the recorded exchange of a request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request path with its query string.
+            body (bytes | str | None): The request body.
+
+        Returns:
+            Fixture | None: The recorded exchange, None if the request was never recorded.
+        """
+
+        key = self.key(method, target, body)
+        with self._lock:
+            fixture = self._fixtures.get(key)
+        if fixture is not None:
+            return fixture
+
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as file:
+                data: dict[str, Any] = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        if data.pop("body_encoding", "utf-8") == "base64":
+            data["body"] = base64.b64decode(data["body"])
+        else:
+            data["body"] = data["body"].encode("utf-8")
+        fixture = Fixture(**data)
+
+        with self._lock:
+            self._fixtures[key] = fixture
+        return fixture
+
+    # pylint: disable=too-many-positional-arguments
+    def put(
+        self,
+        method: str,
+        target: str,
+        request_body: bytes | str | None,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        duration: float = 0.0,
+    ) -> Fixture:
+        """
+        Record an exchange, replacing any previous recording of the same request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request path with its query string.
+            request_body (bytes | str | None): The request body.
+            status (int): The response status code.
+            headers (dict[str, str]): The response headers.
+            body (bytes): The decoded response body.
+            duration (float): The request duration, in seconds.
+
+        Returns:
+            Fixture: The recorded exchange.
+        """
+
+        fixture = Fixture(
+            method=method.upper(),
+            target=target,
+            status=status,
+            headers={name: value for name, value in headers.items() if name.lower() not in _TRANSPORT_HEADERS},
+            body=body,
+            duration=duration,
+            request_body=normalize_body(request_body),
+        )
+        key = self.key(method, target, request_body)
+
+        data: dict[str, Any] = asdict(fixture)
+        try:
+            data["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            data["body"] = base64.b64encode(body).decode("ascii")
+            data["body_encoding"] = "base64"
+
+        with self._lock:
+            self._fixtures[key] = fixture
+            with open(self._file(key), "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=2, sort_keys=True)
+        return fixture
@@ -1,4 +1,11 @@
-from .builders import build_template, generic_template_renderer
+from .builders import build_template, generic_template_renderer, get_template_environment, set_bytecode_cache_dir
 from .kibcat_filter import FilterOperators, KibCatFilter
 
-__all__ = ["generic_template_renderer", "build_template", "FilterOperators", "KibCatFilter"]
+__all__ = [
+    "generic_template_renderer",
+    "build_template",
+    "get_template_environment",
+    "set_bytecode_cache_dir",
+    "FilterOperators",
+    "KibCatFilter",
+]
@@ -1,9 +1,10 @@
 import inspect
 import json
 import os
+import threading
 from typing import Any, Type
 
-from jinja2 import Template
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateSyntaxError
 
 from kiblog import BaseLogger
 from kibtypes import ParsedKibanaURL
@@ -18,6 +19,63 @@ FILTER_IS_TEMPLATE_NAME = "filter_is.json.jinja2"
 FILTER_IS_ONE_OF_TEMPLATE_NAME = "filter_is_one_of.json.jinja2"
 FILTER_EXISTS_NAME = "filter_exists.json.jinja2"
 
+# Number of compiled templates kept by the environment of every templates directory
+TEMPLATE_CACHE_SIZE = 400
+
+# Process-wide environments, by templates directory
+_ENVIRONMENTS: dict[str, Environment] = {}
+_ENVIRONMENTS_LOCK = threading.Lock()
+_BYTECODE_CACHE: BytecodeCache | None = None
+
+
+def set_bytecode_cache_dir(directory: str | None) -> None:
+    """
+    Enables an on-disk cache of the compiled templates bytecode, so a restarted process
+    loads the templates without compiling them again.
+
+    Args:
+        directory (str | None): The cache directory, created if missing. None disables the cache.
+    """
+
+    global _BYTECODE_CACHE  # pylint: disable=global-statement
+
+    with _ENVIRONMENTS_LOCK:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _BYTECODE_CACHE = FileSystemBytecodeCache(directory) if directory else None
+        # Environments take their bytecode cache when created
+        _ENVIRONMENTS.clear()
+
+
+def get_template_environment(templates_path: str) -> Environment:
+    """
+    Returns the process-wide Jinja2 environment of a templates directory, creating it on first use.
+
+    The environment keeps the compiled templates, and recompiles a template when the
+    modification time of its file changes.
+
+    Args:
+        templates_path (str): Path to the templates directory.
+
+    Returns:
+        Environment: The environment, loading the templates of the directory.
+    """
+
+    key = os.path.abspath(templates_path)
+    environment = _ENVIRONMENTS.get(key)
+    if environment is not None:
+        return environment
+
+    with _ENVIRONMENTS_LOCK:
+        if key not in _ENVIRONMENTS:
+            _ENVIRONMENTS[key] = Environment(
+                loader=FileSystemLoader(key),
+                auto_reload=True,
+                cache_size=TEMPLATE_CACHE_SIZE,
+                bytecode_cache=_BYTECODE_CACHE,
+            )
+        return _ENVIRONMENTS[key]
+
 
 def generic_template_renderer(
     templates_path: str,
@@ -26,7 +84,8 @@ def generic_template_renderer(
     **kwargs: Any,
 ) -> str:
     """
-    Renders a Jinja2 template with given arguments.
+    Renders a Jinja2 template with given arguments. Templates are compiled once per process,
+    and again only when their file changes.
 
     Args:
         templates_path (str): Path to the templates directory.
@@ -42,30 +101,23 @@ def generic_template_renderer(
     if logger:
         logger.message(msg)
 
-    template_file_path: str = os.path.join(templates_path, template_name)
-    template_str: str | None = None
-
     try:
-        with open(template_file_path, encoding="utf-8") as file:
-            template_str = file.read()
-    except Exception as e:
+        template = get_template_environment(templates_path).get_template(template_name)
+    except TemplateSyntaxError as e:
         msg = (
-            f"[kibtemplate.generic_template_renderer] - Rendering {template_name} - Failed to read template file.\n{e}"
+            f"[kibtemplate.generic_template_renderer] - Rendering {template_name} - "
+            f"Failed to compile Jinja2 template.\n{e}"
         )
         if logger:
             logger.error(msg)
-        raise IOError(msg) from e
-
-    try:
-        template = Template(template_str)
+        raise RuntimeError(msg) from e
     except Exception as e:
         msg = (
-            f"[kibtemplate.generic_template_renderer] - Rendering {template_name} - "
-            "Failed to compile Jinja2 template.\n{e}"
+            f"[kibtemplate.generic_template_renderer] - Rendering {template_name} - Failed to read template file.\n{e}"
         )
         if logger:
             logger.error(msg)
-        raise RuntimeError(msg) from e
+        raise IOError(msg) from e
 
     if logger:
         msg = (
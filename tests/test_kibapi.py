@@ -0,0 +1,474 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any, Iterator
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pytest
+import requests
+
+from kibapi import (
+    AsyncNotCertifiedKibana,
+    FieldCatalog,
+    MetadataCache,
+    NotCertifiedKibana,
+    RequestMetrics,
+    get_field_properties,
+    group_fields,
+)
+from kibapi.metrics import endpoint_template
+from kibapi.resilience import CircuitBreaker, RetryPolicy
+from kibapi.streaming import iter_fields, iter_json_array
+from kibapi.utils import build_suggestions_request_body
+from kiblog import BaseLogger
+
+SPACES: list[dict[str, Any]] = [{"id": "default", "name": "Default"}, {"id": "ops", "name": "Ops"}]
+DATA_VIEWS: list[dict[str, Any]] = [{"id": "logs*", "title": "logs*", "timeFieldName": "event.created"}]
+
+
+class StubKibanaHandler(BaseHTTPRequestHandler):
+    """Minimal Kibana stub answering the endpoints used by NotCertifiedKibana."""
+
+    protocol_version = "HTTP/1.1"
+    connections: set[int] = set()
+    requests_count = 0
+    not_modified_count = 0
+    suggestions_count: dict[str, int] = {}
+
+    def _send_json(self, payload: Any, status: int = 200, etag: str | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8") if status != 304 else b""
+        self.send_response(status)
+        for header, value in (("Content-Type", "application/json"), ("Content-Length", str(len(body)))):
+            self.send_header(header, value)
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_html(self) -> None:
+        body = b"<html><body>Kibana server is not ready yet</body></html>"
+        self.send_response(200)
+        for header, value in (("Content-Type", "text/html"), ("Content-Length", str(len(body)))):
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        StubKibanaHandler.connections.add(id(self.connection))
+        StubKibanaHandler.requests_count += 1
+
+        # The "html" space answers like a proxy error page, with a 200 and a non-JSON body
+        if self.path.startswith("/s/html/"):
+            self._send_html()
+        elif self.path.startswith("/api/spaces/space/"):
+            space_id = self.path.rsplit("/", 1)[-1]
+            space = next((space for space in SPACES if space["id"] == space_id), None)
+            self._send_json(space or {"error": "not found"}, status=200 if space else 404)
+        elif "/api/data_views/data_view/" in self.path:
+            view_id = unquote(self.path.rsplit("/", 1)[-1])
+            view = next((view for view in DATA_VIEWS if view["id"] == view_id), None)
+            self._send_json({"data_view": view} if view else {"error": "not found"}, status=200 if view else 404)
+        elif "/api/saved_objects/_find" in self.path:
+            query = parse_qs(urlparse(self.path).query)
+            page, per_page = int(query["page"][0]), int(query["per_page"][0])
+            views = [{"id": f"view-{i}", "attributes": {"title": f"view-{i}*"}} for i in range(5)]
+            self._send_json({"total": 5, "saved_objects": views[(page - 1) * per_page : page * per_page]})
+        elif "/internal/data_views/fields" in self.path:
+            if self.headers.get("If-None-Match") == '"fields-v1"':
+                StubKibanaHandler.not_modified_count += 1
+                self._send_json(None, status=304)
+            else:
+                self._send_json({"fields": [make_field("message")]}, etag='"fields-v1"')
+        elif self.path.startswith("/api/spaces/space"):
+            if self.headers.get("If-None-Match") == '"spaces-v1"':
+                StubKibanaHandler.not_modified_count += 1
+                self._send_json(None, status=304)
+            else:
+                self._send_json(SPACES, etag='"spaces-v1"')
+        elif self.path.startswith("/api/data_views"):
+            self._send_json({"data_view": DATA_VIEWS})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        StubKibanaHandler.requests_count += 1
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        field = body["field"]
+        attempt = StubKibanaHandler.suggestions_count[field] = StubKibanaHandler.suggestions_count.get(field, 0) + 1
+
+        # "flaky" fails with 503 on the first attempt, "slow" hangs on the first attempt
+        if field == "flaky" and attempt == 1:
+            self._send_json({"error": "unavailable"}, status=503)
+            return
+        if field == "slow" and attempt == 1:
+            time.sleep(1)
+
+        if self.path.startswith("/s/html/"):
+            self._send_html()
+        elif "/internal/kibana/suggestions/values/" in self.path and field != "broken":
+            self._send_json([f"{field}-{i}" for i in range(3)])
+        else:
+            self._send_json({"error": "internal"}, status=500)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        return
+
+
+@pytest.fixture(name="kibana_url")
+def fixture_kibana_url() -> Iterator[str]:
+    """Start the stub Kibana server on a free port and yield its base URL."""
+
+    StubKibanaHandler.connections = set()
+    StubKibanaHandler.requests_count = 0
+    StubKibanaHandler.not_modified_count = 0
+    StubKibanaHandler.suggestions_count = {}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubKibanaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_pooled_connection(kibana_url: str) -> None:
+    """Verify that sequential calls share one kept-alive connection."""
+
+    with NotCertifiedKibana(base_url=kibana_url, username="user", password="pass") as kibana:
+        for _ in range(5):
+            assert kibana.get_spaces() == SPACES
+            assert kibana.get_dataviews() == DATA_VIEWS
+
+    assert StubKibanaHandler.requests_count == 10
+    assert len(StubKibanaHandler.connections) == 1
+
+
+def test_session_headers() -> None:
+    """Verify that keep-alive and compression settings are applied to the session."""
+
+    kibana = NotCertifiedKibana(base_url="http://localhost", keep_alive=False, compression=False)
+
+    assert kibana.session.headers["Connection"] == "close"
+    assert kibana.session.headers["Accept-Encoding"] == "identity"
+
+
+def test_metadata_cache(kibana_url: str) -> None:
+    """Verify that cached endpoints are served locally and revalidated with the ETag."""
+
+    cache = MetadataCache(ttls={"spaces": 0}, background_refresh=False)
+    kibana = NotCertifiedKibana(base_url=kibana_url, cache=cache)
+
+    for _ in range(3):
+        assert kibana.get_dataviews() == DATA_VIEWS
+        assert kibana.get_spaces() == SPACES
+
+    # Data views are fetched once, spaces expire immediately and are revalidated with a 304
+    assert StubKibanaHandler.requests_count == 4
+    assert StubKibanaHandler.not_modified_count == 2
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["not_modified"] == 2
+
+
+def test_metadata_cache_background_parse_error() -> None:
+    """Verify that a background revalidation whose body can't be parsed is logged and can be retried."""
+
+    errors: list[str] = []
+    fetches: list[requests.Response] = []
+
+    class RecordingLogger(BaseLogger):
+        """Keeps the error messages."""
+
+        @staticmethod
+        def error(message: str) -> None:
+            errors.append(message)
+
+    def fetch(_: dict[str, str]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'["space"]' if not fetches else b"<html>not ready</html>"  # pylint: disable=protected-access
+        fetches.append(response)
+        return response
+
+    cache = MetadataCache(ttls={"spaces": 0}, stale_ttl=60, logger=RecordingLogger)
+
+    def parse(response: requests.Response) -> Any:
+        return json.loads(response.content)
+
+    assert cache.get_or_fetch("spaces", "spaces", fetch, parse) == (200, ["space"])
+    for _ in range(2):
+        assert cache.get_or_fetch("spaces", "spaces", fetch, parse) == (200, ["space"])
+        for _ in range(100):
+            if not cache._refreshing:  # pylint: disable=protected-access
+                break
+            time.sleep(0.01)
+
+    # Both stale hits started a revalidation, the failed one no longer marks the key as refreshing
+    assert len(fetches) == 3
+    assert len(errors) == 2 and "Background revalidation of spaces failed" in errors[0]
+
+
+def test_streamed_revalidations_release_connections(kibana_url: str) -> None:
+    """Verify that 304 revalidations of a streamed endpoint give their connection back to the pool."""
+
+    cache = MetadataCache(ttls={"fields": 0}, background_refresh=False)
+    kibana = NotCertifiedKibana(base_url=kibana_url, cache=cache, pool_connections=1, pool_maxsize=1)
+
+    # With pool_block, a leaked connection makes the next request wait for the pool forever
+    result: list[Any] = []
+    worker = threading.Thread(
+        target=lambda: result.extend(kibana.get_fields_catalog("default", "logs*") for _ in range(5)), daemon=True
+    )
+    worker.start()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert [catalog.names if catalog else None for catalog in result] == [["message"]] * 5
+    assert StubKibanaHandler.not_modified_count == 4
+
+
+def test_fields_non_json_body(kibana_url: str) -> None:
+    """Verify that a 200 fields response with an HTML body is an error, streamed or not."""
+
+    kibana = NotCertifiedKibana(base_url=kibana_url)
+
+    assert kibana.get_fields_catalog("html", "logs*") is None
+    assert kibana.get_fields_list("html", "logs*", stream=True) is None
+    assert kibana.get_fields_list("html", "logs*") is None
+    assert not list(kibana.iter_fields_list("html", "logs*"))
+
+
+def test_existence_checks(kibana_url: str) -> None:
+    """Verify the single-object existence checks and the paginated data views iteration."""
+
+    kibana = NotCertifiedKibana(base_url=kibana_url)
+
+    assert kibana.space_exists("ops") is True
+    assert kibana.space_exists("missing") is False
+    assert kibana.data_view_exists("logs*", space_id="default") is True
+    assert kibana.data_view_exists("missing*") is False
+
+    assert [view["id"] for view in kibana.iter_dataviews(per_page=2)] == [f"view-{i}" for i in range(5)]
+    assert StubKibanaHandler.requests_count == 4 + 3
+
+
+def test_get_data_view(kibana_url: str) -> None:
+    """Verify that a data view is read with its time field, apart from the cached existence check."""
+
+    kibana = NotCertifiedKibana(base_url=kibana_url, cache=MetadataCache(background_refresh=False))
+
+    assert kibana.data_view_exists("logs*", space_id="default") is True
+    data_view = kibana.get_data_view("logs*", space_id="default")
+    assert data_view is not None and data_view["timeFieldName"] == "event.created"
+    assert kibana.get_data_view("missing*") is None
+    assert kibana.get_data_view("logs*", space_id="html") is None
+
+    body = build_suggestions_request_body(make_field("host"), "now-1d", "now", data_view["timeFieldName"])
+    assert body["filters"] == [
+        {"range": {"event.created": {"format": "strict_date_optional_time", "gte": "now-1d", "lte": "now"}}}
+    ]
+
+
+def make_field(name: str) -> dict[str, Any]:
+    """Returns a minimal field definition accepted by the suggestions endpoint."""
+    return {
+        "name": name,
+        "type": "string",
+        "esTypes": ["text"],
+        "searchable": True,
+        "aggregatable": False,
+        "readFromDocValues": False,
+    }
+
+
+def test_field_possible_values_many(kibana_url: str) -> None:
+    """Verify that a batch returns every field and that one failure does not abort it."""
+
+    kibana = NotCertifiedKibana(base_url=kibana_url)
+    fields = [make_field("service"), make_field("broken"), make_field("host")]
+
+    result = kibana.get_field_possible_values_many("default", "logs*", fields, max_workers=3)
+
+    assert result["service"] == ["service-0", "service-1", "service-2"]
+    assert result["host"] == ["host-0", "host-1", "host-2"]
+    assert isinstance(result["broken"], Exception)
+    assert kibana.get_field_possible_values("default", "logs*", make_field("broken")) == []
+
+
+def test_request_metrics(kibana_url: str) -> None:
+    """Verify that requests are aggregated per endpoint template and exported."""
+
+    metrics = RequestMetrics(buckets=(0.5, 60.0))
+    kibana = NotCertifiedKibana(base_url=kibana_url, metrics=metrics)
+
+    kibana.get_field_possible_values_many("default", "logs*", [make_field("service"), make_field("broken")])
+    kibana.get_field_possible_values("ops", "other*", make_field("host"))
+    kibana.get_spaces()
+
+    snapshot = metrics.as_dict()
+    suggestions = snapshot["POST /s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"]
+    assert suggestions["count"] == 3
+    assert suggestions["status_classes"] == {"2xx": 2, "5xx": 1}
+    assert suggestions["request_bytes"] > 0 and suggestions["response_bytes"] > 0
+    assert suggestions["latency_buckets"]["+Inf"] == 3
+    assert snapshot["GET /api/spaces/space"]["count"] == 1
+
+    text = metrics.to_prometheus()
+    assert "# TYPE kibapi_request_duration_seconds histogram" in text
+    assert 'kibapi_requests_total{method="GET",endpoint="/api/spaces/space",status="2xx"} 1' in text
+    assert 'le="+Inf"} 3' in text
+
+    assert endpoint_template(f"{kibana_url}/s/ops/internal/data_views/fields?pattern=x", kibana_url) == (
+        "/s/{space_id}/internal/data_views/fields"
+    )
+    assert endpoint_template("/api/data_views/data_view/logs*") == "/api/data_views/data_view/{data_view_id}"
+
+
+def test_retries_hedging_and_circuit_breaker(kibana_url: str) -> None:
+    """Verify retries with backoff, hedged requests and the circuit breaker fail-fast."""
+
+    suggestions = "/s/{space_id}/internal/kibana/suggestions/values/{data_view_id}"
+    kibana = NotCertifiedKibana(
+        base_url=kibana_url,
+        retry_policy=RetryPolicy(base_delay=0.01),
+        hedged_endpoints=[suggestions],
+        hedge_delay=0.05,
+    )
+
+    assert kibana.get_field_possible_values("default", "logs*", make_field("flaky")) == [
+        "flaky-0",
+        "flaky-1",
+        "flaky-2",
+    ]
+    assert StubKibanaHandler.suggestions_count["flaky"] == 2
+
+    start_time = time.perf_counter()
+    assert kibana.get_field_possible_values("default", "logs*", make_field("slow")) == ["slow-0", "slow-1", "slow-2"]
+    assert time.perf_counter() - start_time < 0.5
+    assert StubKibanaHandler.suggestions_count["slow"] == 2
+    kibana.close()
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    failing = NotCertifiedKibana(base_url=kibana_url, circuit_breaker=breaker)
+    for _ in range(2):
+        assert failing.get_field_possible_values("default", "logs*", make_field("broken")) == []
+    assert breaker.state == CircuitBreaker.OPEN
+
+    sent = StubKibanaHandler.requests_count
+    assert failing.get_spaces() is None
+    assert StubKibanaHandler.requests_count == sent
+
+
+def test_circuit_breaker_half_open_trial_is_released(kibana_url: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Verify that a trial request failing with any exception, or never completing, does not block the circuit."""
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    kibana = NotCertifiedKibana(base_url=kibana_url, circuit_breaker=breaker)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    def broken_send(*_: Any) -> Any:
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr(kibana, "_send", broken_send)
+    with pytest.raises(ValueError):
+        kibana.requester(method="GET", url=f"{kibana_url}/api/spaces/space")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # A reserved trial whose outcome is never recorded expires after reset_timeout
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+def test_async_client(kibana_url: str) -> None:
+    """Verify that the async client returns the same data as the sync one when gathered."""
+
+    async def fetch() -> list[Any]:
+        async with AsyncNotCertifiedKibana(base_url=kibana_url, username="user", password="pass") as kibana:
+            return list(await asyncio.gather(kibana.get_spaces(), kibana.get_dataviews()))
+
+    assert asyncio.run(fetch()) == [SPACES, DATA_VIEWS]
+
+
+def test_async_client_non_json_body(kibana_url: str) -> None:
+    """Verify that the async client reports a 200 response whose body is not the expected JSON as an error."""
+
+    field = make_field("stream.keyword")
+
+    async def fetch() -> list[Any]:
+        async with AsyncNotCertifiedKibana(base_url=kibana_url) as kibana:
+            fields = await kibana.get_fields_list("html", "logs*")
+            values = await kibana.get_field_possible_values("html", "logs*", field)
+            batch = await kibana.get_field_possible_values_many("html", "logs*", [field])
+
+            async def empty_body(*_: Any, **__: Any) -> tuple[int, Any]:
+                return 200, None
+
+            kibana.requester = empty_body  # type: ignore[method-assign]
+            return [fields, await kibana.get_dataviews(), await kibana.get_spaces(), values, batch]
+
+    fields, dataviews, spaces, values, batch = asyncio.run(fetch())
+    assert [fields, dataviews, spaces, values] == [None, None, None, []]
+    assert isinstance(batch["stream.keyword"], RuntimeError)
+
+
+def test_field_catalog() -> None:
+    """Verify that FieldCatalog lookups and groups match the list-of-dicts helpers."""
+
+    fields = [
+        make_field("stream"),
+        {**make_field("stream.keyword"), "type": "string", "subType": {"multi": {"parent": "stream"}}},
+        {**make_field("bytes"), "type": "number", "aggregatable": True},
+        make_field("message"),
+    ]
+    catalog = FieldCatalog.from_fields(fields)
+
+    assert len(catalog) == 4
+    assert "bytes" in catalog and "missing" not in catalog
+    assert catalog.groups == group_fields(fields) == group_fields(catalog)
+    assert catalog.group_of("stream.keyword") == ["stream", "stream.keyword"]
+    assert catalog.group_of("missing") == ["missing"]
+    assert catalog.names_by_type("number") == ["bytes"]
+    assert catalog.aggregatable_names() == ["bytes"]
+
+    for field in fields:
+        assert get_field_properties(catalog, field["name"]) == get_field_properties(fields, field["name"])
+    assert get_field_properties(catalog, "missing") == {}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+def test_iter_fields_streaming(chunk_size: int) -> None:
+    """Verify that the streaming parser matches json.loads whatever the chunk boundaries."""
+
+    document = {
+        "indices": ["logs-ß-1"],
+        "fields": [
+            {**make_field('quoted "name" ✓'), "count": 12345, "extra": {"fields": [1, 2]}},
+            {**make_field("stream.keyword"), "subType": {"multi": {"parent": "stream"}}},
+            12.5,
+            None,
+        ],
+        "tail": True,
+    }
+    raw = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+
+    assert list(iter_json_array(chunks, "fields")) == document["fields"]
+    assert list(islice(iter_fields(chunks, attributes=("name", "subType")), 2))[1] == {
+        "name": "stream.keyword",
+        "subType": {"multi": {"parent": "stream"}},
+    }
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks[: len(chunks) // 2], "fields"))
@@ -0,0 +1,78 @@
+import time
+from pathlib import Path
+
+from kibcache import WarmCache, WarmCacheKey
+
+KEY = WarmCacheKey("http://kibana", "default", "logs-*")
+
+
+def test_warm_cache_roundtrip_and_persistence(tmp_path: Path) -> None:
+    """Verify that entries are stored by kind and key, and survive reopening the database."""
+
+    path = str(tmp_path / "warm.sqlite")
+    fields = [{"name": "stream", "type": "string"}, {"name": "stream.keyword", "type": "string"}]
+    values = {"stream": ["stdout", "stderr"]}
+    values_key = KEY._replace(field="stream|stream.keyword")
+
+    cache = WarmCache(path)
+    assert cache.get(WarmCache.FIELDS, KEY) is None
+    cache.set(WarmCache.FIELDS, KEY, fields)
+    cache.set(WarmCache.VALUES, values_key, values)
+    cache.close()
+
+    reopened = WarmCache(path)
+    assert reopened.get(WarmCache.FIELDS, KEY) == fields
+    assert reopened.get(WarmCache.VALUES, values_key) == values
+    assert reopened.get(WarmCache.VALUES, KEY) is None
+
+    reopened.delete(WarmCache.VALUES)
+    assert reopened.get(WarmCache.VALUES, values_key) is None
+    assert reopened.get(WarmCache.FIELDS, KEY) == fields
+    reopened.close()
+
+
+def test_warm_cache_max_age_and_fingerprint(tmp_path: Path) -> None:
+    """Verify that old entries are ignored on demand, and that a new fingerprint drops every entry."""
+
+    path = str(tmp_path / "warm.sqlite")
+
+    cache = WarmCache(path, fingerprint=WarmCache.make_fingerprint({"stream": "output"}))
+    assert cache.updated_at(WarmCache.FIELDS, KEY) is None
+    before = time.time()
+    cache.set(WarmCache.FIELDS, KEY, ["stream"])
+    assert before <= (cache.updated_at(WarmCache.FIELDS, KEY) or 0) <= time.time()
+    time.sleep(0.02)
+    assert cache.get(WarmCache.FIELDS, KEY, max_age=0.01) is None
+    assert cache.get(WarmCache.FIELDS, KEY, max_age=60) == ["stream"]
+    cache.close()
+
+    same = WarmCache(path, fingerprint=WarmCache.make_fingerprint({"stream": "output"}))
+    assert same.get(WarmCache.FIELDS, KEY) == ["stream"]
+    same.close()
+
+    changed = WarmCache(path, fingerprint=WarmCache.make_fingerprint({"level": "severity"}))
+    assert changed.get(WarmCache.FIELDS, KEY) is None
+    changed.close()
+
+
+def test_warm_cache_prune_expired_windows() -> None:
+    """Verify that pruning drops the old entries of a kind, except the ones of the kept windows."""
+
+    cache = WarmCache(":memory:")
+    expired = KEY._replace(field="stream", window="2025-06-01T00:00:00.000Z/2025-06-08T00:00:00.000Z")
+    lookback = KEY._replace(field="stream", window="P7D")
+    all_time = KEY._replace(field="stream")
+    for key in (expired, lookback, all_time):
+        cache.set(WarmCache.VALUES, key, ["stdout"])
+        cache.set(WarmCache.DISCOVERY, key, {"watermark": 0})
+
+    assert cache.prune(WarmCache.VALUES, max_age=60) == 0
+    time.sleep(0.02)
+    current = KEY._replace(field="stream", window="2025-06-01T01:00:00.000Z/2025-06-08T01:00:00.000Z")
+    cache.set(WarmCache.VALUES, current, ["stdout"])
+
+    assert cache.prune(WarmCache.VALUES, max_age=0.01, keep_windows=("", "P7D")) == 1
+    assert cache.get(WarmCache.VALUES, expired) is None
+    assert all(cache.get(WarmCache.VALUES, key) for key in (lookback, all_time, current))
+    assert cache.get(WarmCache.DISCOVERY, expired) == {"watermark": 0}
+    cache.close()
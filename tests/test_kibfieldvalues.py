@@ -0,0 +1,702 @@
+import asyncio
+import json
+import math
+import random
+import zlib
+from typing import Any, cast
+
+import pytest
+from elasticsearch import AsyncElasticsearch, Elasticsearch
+
+from kibcache import WarmCache
+from kibfieldvalues import (
+    DiscoveryStrategy,
+    FieldValueTrie,
+    ValueStore,
+    async_get_initial_part_of_fields,
+    async_get_initial_part_of_fields_many,
+    compact_field_values,
+    compress_values,
+    discover_field_values,
+    discover_field_values_many,
+    expand_braces,
+    get_initial_part_of_fields,
+    get_initial_part_of_fields_incremental,
+    get_initial_part_of_fields_many,
+    group_field_values,
+    iter_field_value_pages,
+    normalize_values,
+    render_braces,
+    summarize_fields,
+)
+from kibfieldvalues.fields import MAX_PAGE_SIZE, clean_empty_nodes, flatten_dict, recursive_field_group
+from kibfieldvalues.patterns import PatternRule
+from kibfieldvalues.summaries import FieldSummary
+from kibfieldvalues.tags import FieldsTag
+
+
+def reference_grouping(values: list[str]) -> tuple[Any, list[str]]:
+    """Returns the tree and the flattened grouping of the recursive implementation."""
+    tree: Any = clean_empty_nodes(recursive_field_group(values))
+    return tree, flatten_dict(tree)
+
+
+def random_values(rng: random.Random, count: int, leading_empty: bool = False) -> list[str]:
+    """Pod-like names with shared prefixes, varying depth, duplicates and empty components."""
+
+    components = [["payments", "search", "auth", "a"], ["api", "worker", "", "eu"], ["x1", "x2", "7f9c"], ["0", "1"]]
+    if leading_empty:
+        components = [[*level, ""] for level in components]
+    values: list[str] = []
+    for _ in range(count):
+        depth = rng.randint(1, len(components))
+        values.append("-".join(rng.choice(components[level]) for level in range(depth)))
+    return values
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        ["single"],
+        ["a", "b", "c"],
+        ["a-x", "a-x"],
+        ["a-x", "a-y"],
+        ["a-x-1", "a-x-2", "a-y-1", "b"],
+        ["payments-api-1", "payments-api-2", "payments-worker-eu-1", "payments-worker-eu-2", "search-1"],
+        ["a", "a-b", "a-b-c", "a-b-d"],
+        ["-a", "-b", "x--1", "x--2"],
+        ["", "b-x", "-x", "b-", "-x-", "-x-"],
+        ["--x-1", "--x-2", "--y"],
+    ],
+)
+def test_trie_matches_recursive_grouping(values: list[str]) -> None:
+    """Verify the trie against the recursive implementation on edge cases."""
+
+    tree, flattened = reference_grouping(values)
+    trie = FieldValueTrie(values)
+    assert trie.flatten() == flattened
+    assert trie.tree() == tree
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_trie_matches_recursive_grouping_randomized(seed: int) -> None:
+    """Verify the trie against the recursive implementation on random inputs, incrementally built."""
+
+    rng = random.Random(seed)
+    values = random_values(rng, rng.randint(1, 300), leading_empty=seed % 2 == 1)
+
+    trie = FieldValueTrie()
+    for start in range(0, len(values), 50):
+        trie.update(values[start : start + 50])
+
+    tree, flattened = reference_grouping(values)
+    assert trie.flatten() == flattened
+    assert trie.tree() == tree
+    assert group_field_values(values) == flattened
+    assert len(trie) == len(values)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_trie_state_round_trip(seed: int) -> None:
+    """Verify that a restored trie groups, answers membership and grows like the original."""
+
+    rng = random.Random(seed)
+    values = random_values(rng, 200)
+    more = random_values(rng, 100)
+
+    restored = FieldValueTrie.from_state(json.loads(json.dumps(FieldValueTrie(values).to_state())))
+    assert len(restored) == len(values)
+    assert all(value in restored for value in values)
+    assert "missing-value" not in restored
+
+    restored.update(more)
+    assert restored.flatten() == group_field_values(values + more)
+
+
+def trim_empty(data: Any) -> Any:
+    """Drops empty lists and objects, recursively, like `filter_path` does with paths that match nothing."""
+
+    if isinstance(data, dict):
+        trimmed = {key: trim_empty(value) for key, value in data.items()}
+        return {key: value for key, value in trimmed.items() if value not in ({}, [])}
+    if isinstance(data, list):
+        return [trim_empty(value) for value in data]
+    return data
+
+
+class FakeElasticsearch:
+    """
+    Answers the composite, terms, random_sampler and cardinality aggregations from a list of values,
+    or from a list per field, every aggregation of a search body included.
+    """
+
+    def __init__(self, values: list[str], estimate: int | None = None, by_field: dict[str, list[str]] | None = None):
+        self.values = sorted(set(values))
+        self.by_field = {field: sorted(set(field_values)) for field, field_values in (by_field or {}).items()}
+        self.estimate = estimate
+        self.bodies: list[dict[str, Any]] = []
+        self.params: list[dict[str, Any]] = []
+
+    # pylint: disable-next=unused-argument
+    def search(self, index: str, body: dict[str, Any], **params: Any) -> dict[str, Any]:
+        self.bodies.append(body)
+        self.params.append(params)
+        response = {"aggregations": {name: self._aggregate(aggregation) for name, aggregation in body["aggs"].items()}}
+        return trim_empty(response) if "filter_path" in params else response
+
+    def _aggregate(self, aggregation: dict[str, Any], sampled: bool = False) -> dict[str, Any]:
+        if "random_sampler" in aggregation:
+            name, sample = next(iter(aggregation["aggs"].items()))
+            return {"doc_count": 1, name: self._aggregate(sample, sampled=True)}
+
+        kind = next(iter(aggregation))
+        field = (
+            aggregation[kind]["sources"][0]["single_result"]["terms"]["field"]
+            if kind == "composite"
+            else aggregation[kind]["field"]
+        )
+        values = self.by_field.get(field, self.values)
+        if sampled:
+            # Every other value is sampled
+            values = values[::2]
+
+        if kind == "cardinality":
+            return {"value": len(values) if self.estimate is None else self.estimate}
+
+        if kind == "composite":
+            after = aggregation["composite"].get("after", {}).get("single_result", "")
+            page = [value for value in values if value > after][: aggregation["composite"]["size"]]
+            keys = [{"key": {"single_result": value}} for value in page]
+            return {"buckets": keys, **({"after_key": keys[-1]["key"]} if page else {})}
+
+        include = aggregation["terms"].get("include", {"partition": 0, "num_partitions": 1})
+        size = aggregation["terms"]["size"]
+        part = [
+            value for value in values if zlib.crc32(value.encode()) % include["num_partitions"] == include["partition"]
+        ]
+        return {"buckets": [{"key": value} for value in part[:size]], "sum_other_doc_count": max(0, len(part) - size)}
+
+
+@pytest.mark.parametrize("num_partitions", [None, 1, 3])
+def test_partitioned_scan_matches_sequential_scan(num_partitions: int | None) -> None:
+    """Verify that the concurrent partitioned scan returns the same values as the composite pagination."""
+
+    values = random_values(random.Random(7), 2000)
+    client = cast(Elasticsearch, FakeElasticsearch(values))
+
+    sequential = get_initial_part_of_fields(client, "pod.keyword", "logs*", page_size=50)
+    parallel = get_initial_part_of_fields(
+        client, "pod.keyword", "logs*", concurrency=4, num_partitions=num_partitions, page_size=50
+    )
+
+    assert sequential == sorted(group_field_values(set(values)))
+    assert parallel == sequential
+
+
+def test_field_value_pages_adapt_page_size() -> None:
+    """Verify that pages are streamed with a page size growing while responses are fast, and fixed on demand."""
+
+    values = [f"pod-{i:05d}" for i in range(5000)]
+    fake = FakeElasticsearch(values)
+    client = cast(Elasticsearch, fake)
+
+    trie = FieldValueTrie()
+    for page in iter_field_value_pages(client, "pod.keyword", "logs*", page_size=100, min_page_size=100):
+        trie.update(page)
+    sizes = [body["aggs"]["result_values"]["composite"]["size"] for body in fake.bodies]
+    assert sizes[:4] == [100, 200, 400, 800]
+    assert len(trie) == 5000
+
+    fake.bodies.clear()
+    pages = list(iter_field_value_pages(client, "pod.keyword", "logs*", page_size=1000, target_page_time=None))
+    assert [len(page) for page in pages] == [1000] * 5 + [0]
+    assert {body["aggs"]["result_values"]["composite"]["size"] for body in fake.bodies} == {1000}
+
+
+@pytest.mark.parametrize(
+    "count, estimate, sample, strategy, complete",
+    [
+        (500, None, True, DiscoveryStrategy.TERMS, True),
+        (500, 100, True, DiscoveryStrategy.COMPOSITE, True),
+        (3000, None, True, DiscoveryStrategy.COMPOSITE, True),
+        (3000, 20000, True, DiscoveryStrategy.SAMPLED, False),
+        (3000, 20000, False, DiscoveryStrategy.CAPPED, False),
+    ],
+)
+def test_discovery_strategy_follows_cardinality(
+    count: int, estimate: int | None, sample: bool, strategy: DiscoveryStrategy, complete: bool
+) -> None:
+    """Verify the strategy chosen from the cardinality estimate, and that complete strategies return every group."""
+
+    values = [f"team{i % 50}-api-{i}" for i in range(count)]
+    fake = FakeElasticsearch(values, estimate=estimate)
+
+    discovery = discover_field_values(
+        cast(Elasticsearch, fake),
+        "pod.keyword",
+        "logs*",
+        terms_max_cardinality=1000,
+        composite_max_cardinality=10000,
+        max_values=100,
+        sample=sample,
+    )
+
+    assert (discovery.strategy, discovery.complete) == (strategy, complete)
+    assert discovery.estimate == (count if estimate is None else estimate)
+    if complete:
+        assert discovery.values == sorted(group_field_values(values))
+    else:
+        assert 0 < len(discovery.values) <= 50
+
+
+class TimestampedElasticsearch:
+    """Answers time field max aggregations and composite aggregations over timestamped values."""
+
+    def __init__(self, time_field: str = "@timestamp") -> None:
+        self.time_field = time_field
+        self.documents: list[tuple[int | None, str]] = []
+        self.scanned: list[int] = []
+
+    def search(self, index: str, body: dict[str, Any], **_: Any) -> dict[str, Any]:  # pylint: disable=unused-argument
+        documents = self.documents
+        if "bool" in body["query"]:
+            # Like a range query, documents without the time field never match
+            bounds = body["query"]["bool"]["filter"][0]["range"][self.time_field]
+            documents = [
+                (timestamp, value)
+                for timestamp, value in documents
+                if timestamp is not None and bounds.get("gte", timestamp) <= timestamp <= bounds.get("lte", timestamp)
+            ]
+
+        name, aggregation = next(iter(body["aggs"].items()))
+        if "max" in aggregation:
+            assert aggregation["max"]["field"] == self.time_field
+            timestamps = [timestamp for timestamp, _ in documents if timestamp is not None]
+            return {"aggregations": {name: {"value": max(timestamps, default=None)}}}
+
+        self.scanned.append(len(documents))
+        keys = [{"key": {"single_result": value}} for value in sorted({value for _, value in documents})]
+        return {"aggregations": {name: {"buckets": keys}}}
+
+
+def test_incremental_discovery_only_scans_new_documents() -> None:
+    """Verify that values are merged from the documents newer than the watermark, and rebuilt periodically."""
+
+    fake = TimestampedElasticsearch()
+    client = cast(Elasticsearch, fake)
+    warm_cache = WarmCache(":memory:")
+    fake.documents = [(1000 + i, f"payments-api-{i}") for i in range(100)]
+
+    def discover(full_rebuild_interval: float = 3600) -> list[str]:
+        return get_initial_part_of_fields_incremental(
+            client, "pod.keyword", "logs*", warm_cache, full_rebuild_interval=full_rebuild_interval, overlap=10
+        )
+
+    assert discover() == ["payments"]
+    assert fake.scanned == [100]
+
+    fake.documents += [(5000, "search-worker-1"), (5001, "search-worker-2"), (5002, "payments-api-0")]
+    assert discover() == ["payments", "search"]
+    # Only the overlap before the watermark and the new documents are aggregated
+    assert fake.scanned[-1] == 14
+
+    # Expired documents only disappear with a full rebuild
+    fake.documents = fake.documents[100:]
+    assert discover() == ["payments", "search"]
+    assert discover(full_rebuild_interval=0) == ["search"]
+    assert fake.scanned[-1] == 3
+
+
+def test_incremental_discovery_without_timestamps() -> None:
+    """Verify that an index without @timestamp is fully scanned, until documents with one arrive."""
+
+    fake = TimestampedElasticsearch()
+    client = cast(Elasticsearch, fake)
+    warm_cache = WarmCache(":memory:")
+    fake.documents = [(None, f"payments-api-{i}") for i in range(20)]
+
+    def discover() -> list[str]:
+        return get_initial_part_of_fields_incremental(client, "pod.keyword", "logs*", warm_cache, overlap=10)
+
+    assert discover() == ["payments"]
+    assert fake.scanned == [20]
+
+    fake.documents += [(None, "search-worker-1"), (None, "search-worker-2")]
+    assert discover() == ["payments", "search"]
+    assert fake.scanned[-1] == 22
+
+    # The first timestamped documents start the watermark, then only newer documents are scanned
+    fake.documents += [(1000, "auth-api-1"), (1001, "auth-api-2")]
+    assert discover() == ["auth", "payments", "search"]
+    fake.documents.append((2000, "auth-worker-1"))
+    assert discover() == ["auth", "payments", "search"]
+    assert fake.scanned[-1] == 3
+
+
+def test_multi_field_discovery_batches_searches() -> None:
+    """Verify that several fields are paginated together, with the same values as one field at a time."""
+
+    by_field = {
+        "pod.keyword": [f"team{i % 7}-api-{i}" for i in range(900)],
+        "host.keyword": [f"node-{i}" for i in range(120)],
+        "empty.keyword": [],
+    }
+    fake = FakeElasticsearch([], by_field=by_field)
+    client = cast(Elasticsearch, fake)
+
+    batched = get_initial_part_of_fields_many(client, list(by_field), "logs*", page_size=50)
+    pages = [len(body["aggs"]) for body in fake.bodies]
+    # Searches stop carrying the aggregations of the fields already fully paginated
+    assert len(pages) == math.ceil(900 / 50) + 1
+    assert pages[0] == 3 and pages[-1] == 1
+
+    for field in by_field:
+        assert batched[field] == get_initial_part_of_fields(client, field, "logs*", page_size=50)
+
+    fake.bodies.clear()
+    discoveries = discover_field_values_many(
+        client, list(by_field), "logs*", terms_max_cardinality=200, composite_max_cardinality=10000, page_size=50
+    )
+    assert {field: discovery.strategy for field, discovery in discoveries.items()} == {
+        "pod.keyword": DiscoveryStrategy.COMPOSITE,
+        "host.keyword": DiscoveryStrategy.TERMS,
+        "empty.keyword": DiscoveryStrategy.TERMS,
+    }
+    assert {field: discovery.values for field, discovery in discoveries.items()} == batched
+    # One search for the estimates and one for the terms reads, then the pages of the only
+    # composite field, whose size grows while responses are fast
+    sizes = [body["aggs"]["result_values"]["composite"]["size"] for body in fake.bodies[2:]]
+    assert sizes[0] == 50 and sizes[1] > 50
+    assert len(sizes) < len(pages)
+
+
+def test_batched_discovery_respects_max_buckets() -> None:
+    """Verify that the batched searches never request more buckets than `search.max_buckets`."""
+
+    by_field = {f"field{i}.keyword": [f"team{j % 7}-api-{i}-{j}" for j in range(30000)] for i in range(3)}
+    fake = FakeElasticsearch([], by_field=by_field)
+    client = cast(Elasticsearch, fake)
+
+    def requested_buckets(body: dict[str, Any]) -> int:
+        return sum(
+            aggregation["composite"]["size"] if "composite" in aggregation else aggregation["terms"]["size"]
+            for aggregation in body["aggs"].values()
+            if "cardinality" not in aggregation
+        )
+
+    batched = get_initial_part_of_fields_many(client, list(by_field), "logs*", page_size=MAX_PAGE_SIZE)
+    assert all(requested_buckets(body) <= MAX_PAGE_SIZE for body in fake.bodies)
+    assert batched == {field: sorted(group_field_values(values)) for field, values in by_field.items()}
+
+    fake.bodies.clear()
+    # The terms reads are capped below their estimate, so they fall back to composite paging
+    discoveries = discover_field_values_many(
+        client, list(by_field), "logs*", terms_max_cardinality=50000, page_size=MAX_PAGE_SIZE
+    )
+    assert all(requested_buckets(body) <= MAX_PAGE_SIZE for body in fake.bodies)
+    assert {field: discovery.values for field, discovery in discoveries.items()} == batched
+    assert {discovery.strategy for discovery in discoveries.values()} == {DiscoveryStrategy.COMPOSITE}
+
+
+def test_time_range_applies_to_the_time_field() -> None:
+    """Verify that the discovery searches restrict the documents on the given time field."""
+
+    fake = FakeElasticsearch([], by_field={"pod.keyword": ["api-1", "api-2"], "host.keyword": ["node-1"]})
+    client = cast(Elasticsearch, fake)
+    start_date, end_date = "2025-06-01T00:00:00.000Z", "2025-06-02T00:00:00.000Z"
+
+    get_initial_part_of_fields(client, "pod.keyword", "logs*", start_date, end_date, time_field="event.created")
+    get_initial_part_of_fields_many(
+        client, ["pod.keyword", "host.keyword"], "logs*", start_date, end_date, time_field="event.created"
+    )
+    discover_field_values(client, "pod.keyword", "logs*", start_date, end_date, time_field="event.created")
+    assert fake.bodies
+    assert all(list(body["query"]["bool"]["filter"][0]["range"]) == ["event.created"] for body in fake.bodies)
+
+    timestamped = TimestampedElasticsearch("event.created")
+    timestamped.documents = [(1000, "payments-api-1"), (1001, "payments-api-2"), (None, "payments-worker-1")]
+    warm_cache = WarmCache(":memory:")
+    for _ in range(2):
+        assert get_initial_part_of_fields_incremental(
+            cast(Elasticsearch, timestamped), "pod.keyword", "logs*", warm_cache, time_field="event.created"
+        ) == ["payments"]
+    # Both scans are bounded on the time field, the document without one is never read
+    assert timestamped.scanned == [2, 2]
+
+
+def test_discovery_searches_are_cache_friendly() -> None:
+    """Verify that discovery searches use the request cache, shard pre-filtering and trimmed responses."""
+
+    fake = FakeElasticsearch([], by_field={"pod.keyword": ["api-1", "api-2"], "empty.keyword": []})
+    client = cast(Elasticsearch, fake)
+
+    assert get_initial_part_of_fields_many(client, ["pod.keyword", "empty.keyword"], "logs*") == {
+        "pod.keyword": [],
+        "empty.keyword": [],
+    }
+    assert discover_field_values(client, "empty.keyword", "logs*").values == []
+    assert get_initial_part_of_fields(client, "pod.keyword", "logs*", concurrency=2) == []
+
+    for params in fake.params:
+        assert params["request_cache"] is True
+        assert params["pre_filter_shard_size"] == 1
+        assert params["preference"]
+        filter_path = params["filter_path"]
+        assert all(
+            path.startswith("aggregations.")
+            for path in (filter_path if isinstance(filter_path, list) else [filter_path])
+        )
+
+
+def test_normalize_values_collapses_high_cardinality_components() -> None:
+    """Verify the templates, their counts and the mapping back to the raw values."""
+
+    values = [
+        "checkout-7f9c8d6b5-x7k2p",
+        "checkout-7f9c8d6b5-q2w9z",
+        "checkout-5d4b8c9f7-m4n8t",
+        "job-123",
+        "job-124",
+        "job-124",
+        "req-3fa85f64-5717-4562-b3fc-2c963f66afa6",
+        "frontend",
+        "api-v2",
+    ]
+    patterns = normalize_values(values)
+
+    assert patterns.counts == {
+        "checkout-*-*": 3,
+        "job-*": 2,
+        "req-3fa85f64-5717-4562-b3fc-2c963f66afa6": 1,
+        "frontend": 1,
+        "api-v2": 1,
+    }
+    assert patterns.compact()[:2] == ["checkout-*-* (3 values)", "job-* (2 values)"]
+    assert patterns.expand("checkout-*-* (3 values)") == values[:3]
+
+    brace_form, counts = patterns.compress()
+    assert sorted(expand_braces(brace_form)) == sorted(patterns.templates)
+    assert counts == {"checkout-*-*": 3, "job-*": 2}
+    assert all(patterns.expand(template) for template in expand_braces(brace_form))
+    assert sorted(value for members in patterns.templates.values() for value in members) == sorted(set(values))
+
+    custom = normalize_values(["eu-west-1", "us-west-1", "eu-east-2"], rules=[PatternRule("region", "eu|us")])
+    assert custom.counts == {"*-west-1": 2, "eu-east-2": 1}
+
+
+def test_normalize_values_keeps_fully_variable_values() -> None:
+    """Verify that status codes and short words are not collapsed into a bare placeholder."""
+
+    values = ["200", "404", "500", "https", "http", "GET", "10-20", "30-40", "code-200", "code-404"]
+    patterns = normalize_values(values)
+
+    assert patterns.counts == {**{value: 1 for value in values[:8]}, "code-*": 2}
+    brace_form, counts = patterns.compress()
+    assert sorted(expand_braces(brace_form)) == sorted([*values[:8], "code-*"])
+    assert counts == {"code-*": 2}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_brace_form_round_trip(seed: int) -> None:
+    """Verify that the brace form of a grouping tree, or of raw values, expands back losslessly."""
+
+    rng = random.Random(seed)
+    values = random_values(rng, 200)
+    tree, flattened = reference_grouping(values)
+
+    assert expand_braces(render_braces(tree)) == flattened
+    for leading_tree, leading_flattened in (
+        reference_grouping(random_values(rng, count, leading_empty=True)) for count in (5, 20, 200)
+    ):
+        assert expand_braces(render_braces(leading_tree)) == leading_flattened
+    assert sorted(expand_braces(compress_values(values))) == sorted(set(values))
+
+    special = ["a{b}-1", "a{b}-2", "x,y", "back\\slash", "a{b}"]
+    assert sorted(expand_braces(compress_values(special))) == sorted(special)
+
+    # The empty value is a legitimate keyword value, alone or next to others
+    for with_empty in ([""], ["", "a"], ["", "a", "a-b", "-c"], ["", *values]):
+        assert sorted(expand_braces(compress_values(with_empty))) == sorted(set(with_empty))
+    empty_tree: dict[str, Any] = {"": FieldsTag.END}
+    assert expand_braces(render_braces(empty_tree)) == flatten_dict(empty_tree) == [""]
+    shared_tree: dict[str, Any] = {"": {"x": FieldsTag.END, "": {"y": FieldsTag.END}}, "x": FieldsTag.END}
+    assert expand_braces(render_braces(shared_tree)) == flatten_dict(shared_tree) == ["x", "y", "x"]
+
+
+def test_compact_field_values_keeps_summaries() -> None:
+    """Verify that summarized fields reach the prompts unescaped, while the value lists are compacted."""
+
+    number = FieldSummary("number", 5321, 0, 1200, 12.5, {"50.0": 10.0}).describe()
+    address = FieldSummary("ip", 10, distinct=2, examples=["10.0.0.1", "10.0.0.2"]).describe()
+    field_values: dict[str, Any] = {
+        "bytes": [number],
+        "client.ip": [address],
+        "stream.keyword": ["a,b", "a-c"],
+        "status": [200, 404],
+    }
+
+    compacted = compact_field_values(field_values, summarized=["bytes", "client.ip"])
+
+    assert compacted["bytes"] == [number] == ["number from 0 to 1200, avg 12.5, p50 10 (5321 values)"]
+    assert compacted["client.ip"] == [address] == ["ip, about 2 distinct addresses, e.g. 10.0.0.1, 10.0.0.2"]
+    assert compacted["stream.keyword"] == {"values": "a\\,b,a-c", "counts": {}}
+    assert compacted["status"] == [200, 404]
+    assert compact_field_values(field_values)["bytes"]["values"] != number
+
+
+def test_brace_form_is_compact() -> None:
+    """Verify the rendering of shared prefixes and that malformed input is rejected."""
+
+    values = ["payments-api", "payments-worker-eu", "payments-worker-us", "search"]
+    assert compress_values(values) == "payments-{api,worker-{eu,us}},search"
+    assert compress_values(["a", "a-b"]) == "a{,-b}"
+    assert expand_braces("") == []
+    assert compress_values([""]) == "{}"
+    assert compress_values(["", "a"]) == "{,a}"
+
+    with pytest.raises(ValueError):
+        expand_braces("a-{b,c")
+    with pytest.raises(ValueError):
+        expand_braces("a-b}")
+
+
+class StatsElasticsearch:
+    """Answers the `stats`, `percentiles`, `value_count`, `cardinality` and `terms` aggregations of fixed values."""
+
+    def __init__(self, by_field: dict[str, list[Any]]) -> None:
+        self.by_field = by_field
+        self.bodies: list[dict[str, Any]] = []
+
+    def _aggregate(self, aggregation: dict[str, Any]) -> dict[str, Any]:
+        kind, params = next(iter(aggregation.items()))
+        values = self.by_field[params["field"]]
+        if kind == "stats":
+            numbers = [float(value) for value in values]
+            return {
+                "count": len(numbers),
+                "min": min(numbers),
+                "max": max(numbers),
+                "avg": sum(numbers) / len(numbers),
+                "min_as_string": str(min(values)),
+                "max_as_string": str(max(values)),
+            }
+        if kind == "percentiles":
+            ordered = sorted(values)
+            return {
+                "values": {
+                    f"{float(percent)}": float(ordered[min(len(ordered) - 1, int(percent / 100 * len(ordered)))])
+                    for percent in params["percents"]
+                }
+            }
+        if kind == "value_count":
+            return {"value": len(values)}
+        if kind == "cardinality":
+            return {"value": len(set(values))}
+        counts = {value: values.count(value) for value in values}
+        ordered_keys = sorted(counts, key=lambda key: -counts[key])[: params["size"]]
+        return {"buckets": [{"key": key, "doc_count": counts[key]} for key in ordered_keys]}
+
+    def search(self, index: str, body: dict[str, Any], **_: Any) -> dict[str, Any]:  # pylint: disable=unused-argument
+        self.bodies.append(body)
+        return {"aggregations": {name: self._aggregate(aggregation) for name, aggregation in body["aggs"].items()}}
+
+
+def test_summarize_fields_in_one_search() -> None:
+    """Verify that numeric, date and IP fields are described as ranges with a single search."""
+
+    fake = StatsElasticsearch(
+        {
+            "duration": list(range(1, 101)),
+            "event.created": [1_700_000_000_000, 1_700_086_400_000],
+            "source.ip": ["10.0.0.1"] * 3 + ["10.0.0.2"],
+        }
+    )
+    summaries = summarize_fields(
+        cast(Elasticsearch, fake),
+        {"duration": "number", "event.created": "date", "source.ip": "ip"},
+        "logs*",
+        "2025-06-01T00:00:00.000Z",
+        "2025-06-02T00:00:00.000Z",
+    )
+
+    assert len(fake.bodies) == 1
+    assert summaries["duration"].describe() == "number from 1 to 100, avg 50.5, p1 2, p50 51, p99 100 (100 values)"
+    assert summaries["event.created"].describe() == ("date from 1700000000000 to 1700086400000 (2 values)")
+    assert summaries["source.ip"].describe() == "ip, about 2 distinct addresses, e.g. 10.0.0.1, 10.0.0.2"
+
+    with pytest.raises(ValueError):
+        summarize_fields(cast(Elasticsearch, fake), {"message": "string"}, "logs*")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_value_store_matches_sorted_set(seed: int) -> None:
+    """Verify lookups and prefix iteration of the packed store against a sorted set of the same values."""
+
+    rng = random.Random(seed)
+    values = random_values(rng, 300) + ["é-ünïcode", "", "zz-💾"]
+    store = ValueStore(values)
+    expected = sorted(set(values))
+
+    assert list(store) == expected
+    assert len(store) == len(expected)
+    assert store[-1] == expected[-1]
+    assert all(value in store and store.index(value) == expected.index(value) for value in expected)
+    assert "missing-value" not in store and 42 not in store
+    for prefix in ["", "payments-", "payments-api", "a", "é", "zz", "zz-💾", "zzz", "\U0010ffff"]:
+        assert list(store.with_prefix(prefix)) == [value for value in expected if value.startswith(prefix)]
+
+    assert store.union(["new-value", expected[0]]) == ValueStore([*values, "new-value"])
+    assert store.union([]) is store
+
+    # Merged page by page, like the pages of an incremental discovery
+    merged = ValueStore()
+    for start in range(0, len(values), 40):
+        merged = merged.union(values[start : start + 40])
+    assert merged == store and list(merged) == expected
+    with pytest.raises(ValueError):
+        store.index("missing-value")
+    with pytest.raises(IndexError):
+        _ = store[len(store)]
+
+
+class AsyncFakeElasticsearch:
+    """Async wrapper of `FakeElasticsearch`, recording how many searches are in flight at the same time."""
+
+    def __init__(self, fake: FakeElasticsearch) -> None:
+        self.fake = fake
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search(self, index: str, body: dict[str, Any], **params: Any) -> dict[str, Any]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return self.fake.search(index, body, **params)
+
+
+def test_async_discovery_matches_sync_discovery() -> None:
+    """Verify that the async discovery returns the same grouping as the sync one, paginating fields concurrently."""
+
+    by_field = {
+        "pod.keyword": random_values(random.Random(3), 1500),
+        "host.keyword": [f"node-{i % 40}-{i}" for i in range(300)],
+    }
+    fake = FakeElasticsearch([], by_field=by_field)
+    client = AsyncFakeElasticsearch(fake)
+    async_client = cast(AsyncElasticsearch, client)
+
+    single = asyncio.run(async_get_initial_part_of_fields(async_client, "pod.keyword", "logs*", page_size=50))
+    assert single == get_initial_part_of_fields(cast(Elasticsearch, fake), "pod.keyword", "logs*", page_size=50)
+    assert all(params["request_cache"] for params in fake.params)
+
+    many = asyncio.run(
+        async_get_initial_part_of_fields_many(
+            async_client, ["pod.keyword", "host.keyword", "pod.keyword"], "logs*", page_size=50, target_page_time=None
+        )
+    )
+    assert many == {
+        name: get_initial_part_of_fields(cast(Elasticsearch, fake), name, "logs*", page_size=50) for name in by_field
+    }
+    assert client.max_in_flight == 2
@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+import requests
+from elasticsearch import Elasticsearch
+
+from kibapi import NotCertifiedKibana
+from kibfieldvalues import get_initial_part_of_fields
+from kibreplay import (
+    FixtureStore,
+    RecordingAdapter,
+    ReplayAdapter,
+    constant_latency,
+    lognormal_latency,
+    mount,
+    recording_node_class,
+    replay_node_class,
+)
+
+PODS = ["api-1", "api-2", "worker-1"]
+
+
+class BackendHandler(BaseHTTPRequestHandler):
+    """Answers a Kibana spaces request and paginated Elasticsearch composite aggregations."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        self._send_json([{"id": "default", "name": "Default"}])
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        composite = body["aggs"]["result_values"]["composite"]
+        start = composite.get("after", {}).get("single_result")
+        page = [pod for pod in PODS if start is None or pod > start][:2]
+
+        result: dict[str, Any] = {"buckets": [{"key": {"single_result": pod}, "doc_count": 1} for pod in page]}
+        if page:
+            result["after_key"] = {"single_result": page[-1]}
+        self._send_json({"hits": {"hits": []}, "aggregations": {"result_values": result}})
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        return
+
+
+@pytest.fixture(name="backend_url")
+def fixture_backend_url() -> Iterator[str]:
+    """Start the stub backend on a free port and yield its base URL."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BackendHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_record_and_replay_kibana(backend_url: str, tmp_path: Path) -> None:
+    """Verify that Kibana responses recorded from a live backend are replayed offline."""
+
+    store = FixtureStore(str(tmp_path))
+
+    recorder = NotCertifiedKibana(base_url=backend_url)
+    mount(recorder.session, RecordingAdapter(store))
+    spaces = recorder.get_spaces()
+    assert spaces == [{"id": "default", "name": "Default"}]
+
+    replayer = NotCertifiedKibana(base_url="http://kibana.replay")
+    mount(replayer.session, ReplayAdapter(FixtureStore(str(tmp_path)), latency=constant_latency(0.05)))
+
+    start_time = time.perf_counter()
+    assert replayer.get_spaces() == spaces
+    assert time.perf_counter() - start_time >= 0.05
+
+    with pytest.raises(requests.ConnectionError):
+        replayer.get("/api/status")
+
+
+def test_record_and_replay_elasticsearch(backend_url: str, tmp_path: Path) -> None:
+    """Verify that paginated Elasticsearch searches recorded from a live backend are replayed offline."""
+
+    store = FixtureStore(str(tmp_path))
+
+    recorder = Elasticsearch(backend_url, node_class=recording_node_class(store))
+    recorded = get_initial_part_of_fields(recorder, "kubernetes.pod.name", "logs*")
+    assert len(list(tmp_path.iterdir())) == 3
+
+    latency = lognormal_latency(median=0.001, p99=0.01, seed=1)
+    replayer = Elasticsearch(
+        "http://elastic.replay:9200", node_class=replay_node_class(FixtureStore(str(tmp_path)), latency)
+    )
+    assert get_initial_part_of_fields(replayer, "kubernetes.pod.name", "logs*") == recorded
@@ -1,4 +1,16 @@
-from kibtemplate import FilterOperators, KibCatFilter, build_template
+import os
+from pathlib import Path
+
+import pytest
+
+from kibtemplate import (
+    FilterOperators,
+    KibCatFilter,
+    build_template,
+    generic_template_renderer,
+    get_template_environment,
+    set_bytecode_cache_dir,
+)
 from kibtypes import ParsedKibanaURL
 
 # Params for building template
@@ -76,3 +88,35 @@ def test_build_template() -> None:
 
     # Search query
     assert output["_a"]["query"]["query"] == SEARCH_QUERY.replace("\\", "")
+
+
+def test_templates_are_compiled_once_and_reloaded_on_change(tmp_path: Path) -> None:
+    """Verify that compiled templates are reused, recompiled when their file changes, and cached as bytecode."""
+
+    template_file = tmp_path / "greeting.jinja2"
+    template_file.write_text("Hello {{ name }}", encoding="utf-8")
+
+    assert generic_template_renderer(str(tmp_path), "greeting.jinja2", name="cat") == "Hello cat"
+    environment = get_template_environment(str(tmp_path))
+    template = environment.get_template("greeting.jinja2")
+    assert environment.get_template("greeting.jinja2") is template
+
+    # Bump the modification time, the file may be rewritten within the filesystem timestamp resolution
+    template_file.write_text("Bye {{ name }}", encoding="utf-8")
+    modified = os.path.getmtime(template_file) + 10
+    os.utime(template_file, (modified, modified))
+    assert generic_template_renderer(str(tmp_path), "greeting.jinja2", name="cat") == "Bye cat"
+
+    bytecode_dir = tmp_path / "bytecode"
+    set_bytecode_cache_dir(str(bytecode_dir))
+    try:
+        assert generic_template_renderer(str(tmp_path), "greeting.jinja2", name="cat") == "Bye cat"
+        assert any(bytecode_dir.iterdir())
+    finally:
+        set_bytecode_cache_dir(None)
+
+    with pytest.raises(IOError):
+        generic_template_renderer(str(tmp_path), "missing.jinja2")
+    (tmp_path / "broken.jinja2").write_text("{% if %}", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        generic_template_renderer(str(tmp_path), "broken.jinja2")